@@ -4,11 +4,14 @@ Alerts API endpoints.
 from datetime import datetime, timedelta
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.database.connection import get_database
 from app.api.v1.auth import get_current_user
 from app.models.user import UserResponse
+from app.services.alert_service import alert_service
 import json
+import orjson
 
 router = APIRouter()
 
@@ -152,6 +155,22 @@ async def get_alerts(
         logfire.error(f"Error in get_alerts: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/overview/stream")
+async def stream_alerts_overview(
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Stream the alerts overview as server-sent events, one event per section."""
+    async def events():
+        async for section, value in alert_service.stream_overview():
+            data = orjson.dumps(value, default=lambda model: model.model_dump(mode="json"))
+            yield b"event: " + section.encode() + b"\ndata: " + data + b"\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 @router.post("", response_model=dict)
 async def create_alert(
     alert: Alert,
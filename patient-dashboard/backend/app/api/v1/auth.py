@@ -35,6 +35,11 @@ async def get_current_user(
     token: Optional[str] = Depends(oauth2_scheme)
 ) -> UserResponse:
     """Get current authenticated user from JWT token (Clerk or internal)."""
+    # Reuse the user already resolved for this request (e.g. by AuditedRoute)
+    cached_user = request.scope.get("state", {}).get("cached_user")
+    if cached_user is not None:
+        return cached_user
+    
     # Check for Bearer token in Authorization header
     auth_header = request.headers.get("Authorization")
     if auth_header and auth_header.startswith("Bearer "):
@@ -75,6 +80,7 @@ async def get_current_user(
             session_id=clerk_claims.sid
         )
         
+        request.scope.setdefault("state", {})["cached_user"] = user
         return user
     except HTTPException:
         # If Clerk verification fails, try internal JWT
@@ -91,6 +97,7 @@ async def get_current_user(
         if not user:
             raise AuthenticationException("User not found")
         
+        request.scope.setdefault("state", {})["cached_user"] = user
         return user
     except Exception as e:
         raise HTTPException(
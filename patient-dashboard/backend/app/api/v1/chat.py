@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisco
 from datetime import datetime
 import logging
 import logfire
-import json
+import orjson
 
 from app.services.ai_chat_service import AIChatService
 from app.api.v1.auth import get_current_user
@@ -205,6 +205,11 @@ async def get_chat_suggestions(
         raise HTTPException(status_code=500, detail="Failed to get suggestions")
 
 
+async def _send_json(websocket: WebSocket, data: Dict[str, Any]):
+    """Send a JSON text frame, encoded with orjson rather than json.dumps."""
+    await websocket.send_text(orjson.dumps(data).decode())
+
+
 # WebSocket connection manager
 class ConnectionManager:
     """Manages WebSocket connections for real-time chat."""
@@ -227,13 +232,13 @@ class ConnectionManager:
     async def send_message(self, user_id: str, message: Dict[str, Any]):
         """Send message to specific user."""
         if user_id in self.active_connections:
-            await self.active_connections[user_id].send_json(message)
+            await _send_json(self.active_connections[user_id], message)
     
     async def broadcast(self, message: Dict[str, Any], exclude_user: Optional[str] = None):
         """Broadcast message to all connected users."""
         for user_id, connection in self.active_connections.items():
             if user_id != exclude_user:
-                await connection.send_json(message)
+                await _send_json(connection, message)
 
 
 manager = ConnectionManager()
@@ -271,7 +276,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
         await manager.connect(websocket, user_id)
         
         # Send connection confirmation
-        await websocket.send_json({
+        await _send_json(websocket, {
             "type": "connection",
             "status": "connected",
             "user_id": user_id,
@@ -280,7 +285,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
         
         # Handle messages
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
             
             if data.get("type") == "chat_message":
                 # Process chat message
@@ -292,7 +297,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
                 )
                 
                 # Send response
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "chat_response",
                     "data": result,
                     "timestamp": datetime.utcnow().isoformat()
@@ -304,7 +309,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
                 
             elif data.get("type") == "ping":
                 # Respond to ping
-                await websocket.send_json({
+                await _send_json(websocket, {
                     "type": "pong",
                     "timestamp": datetime.utcnow().isoformat()
                 })
@@ -3,7 +3,7 @@ HIPAA compliance reporting endpoints.
 """
 from datetime import datetime, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from app.core.dependencies import get_current_user, require_role
 from app.models.user import User, UserRole
 from app.services.hipaa_audit_report import hipaa_audit_report
@@ -136,6 +136,7 @@ async def get_compliance_summary(
 async def export_audit_logs(
     start_date: datetime,
     end_date: datetime,
+    response: Response,
     format: str = Query("json", enum=["json", "csv"], description="Export format"),
     current_user: User = Depends(get_current_user)
 ):
@@ -159,11 +160,14 @@ async def export_audit_logs(
         end_date=end_date
     )
     
+    record_count = len(report.get("access_logs", []))
+    response.headers["X-Record-Count"] = str(record_count)
+    
     logfire.info(
         "Audit logs exported",
         user_id=current_user.id,
         format=format,
-        records=len(report.get("access_logs", []))
+        records=record_count
     )
     
     if format == "csv":
@@ -4,7 +4,7 @@ Handles CRUD operations for patient management.
 """
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from pydantic import BaseModel, Field
 
 from app.models.patient import (
@@ -29,6 +29,7 @@ patient_service = PatientService()
 @router.post("/", response_model=PatientResponse)
 async def create_patient(
     patient_data: PatientCreate,
+    response: Response,
     current_user: UserResponse = Depends(get_current_user)
 ):
     """Create a new patient record."""
@@ -42,6 +43,8 @@ async def create_patient(
         
         # Create patient
         patient = await patient_service.create_patient(patient_data, current_user.id)
+        # Lets middleware read the new ID without parsing the body
+        response.headers["X-Resource-Id"] = str(patient.id)
         return patient
         
     except ValidationException as e:
@@ -81,7 +84,8 @@ async def list_patients(
             limit=limit
         )
         
-        return result
+        # Already typed, so skip response_model re-serialization
+        return Response(content=result.to_json(), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
@@ -47,12 +47,9 @@ async def get_test_patients(
                 # Convert RecordID to string
                 if 'id' in patient_data:
                     patient_data['id'] = str(patient_data['id'])
-                    
-                # Ensure all required fields
-                patient_data['ssn_last_four'] = patient_data.get('ssn', '')[-4:] if patient_data.get('ssn') else None
                 
-                # Add to list
-                patients.append(PatientResponse(**patient_data))
+                # Add to list (from_db masks the SSN)
+                patients.append(PatientResponse.from_db(patient_data))
         
         total_pages = math.ceil(total / limit) if limit > 0 else 0
         
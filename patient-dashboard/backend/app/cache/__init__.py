@@ -1,6 +1,7 @@
 """
 Cache module for managing temporary data storage.
 """
+from .local_cache import LocalResponseCache
 from .surreal_cache_manager import SurrealCacheManager
 
 # Global cache instance
@@ -24,4 +25,4 @@ def get_cache_manager():
     """Get the cache manager instance."""
     return _cache_manager
 
-__all__ = ["initialize_cache", "close_cache", "get_cache_manager", "SurrealCacheManager"]
+__all__ = ["initialize_cache", "close_cache", "get_cache_manager", "SurrealCacheManager", "LocalResponseCache"]
@@ -0,0 +1,38 @@
+"""
+Bounded in-process cache with per-entry expiry.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class LocalResponseCache:
+    """Bounded in-process LRU cache with per-entry expiry."""
+    
+    def __init__(self, maxsize: int = 2048):
+        self.maxsize = maxsize
+        # key -> (expires_at monotonic, cached value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a live entry and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+    
+    def set(self, key: Hashable, data: Any, ttl: float):
+        """Store an entry for ttl seconds, evicting the least recently used on overflow."""
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -16,6 +16,10 @@ from app.config.settings import get_settings
 settings = get_settings()
 
 
+# Patient statuses that raise an urgent alert on change
+_URGENT_STATUSES = frozenset({"URGENT", "CRITICAL", "EMERGENCY"})
+
+
 class SurrealCacheManager:
     """SurrealDB connection and cache operation manager"""
 
@@ -241,7 +245,7 @@ class PatientCache:
         """Cache patient status change and trigger real-time updates"""
 
         # If urgent or status is URGENT, trigger immediate alert
-        if urgent or new_status in ["URGENT", "CRITICAL", "EMERGENCY"]:
+        if urgent or new_status in _URGENT_STATUSES:
             alert_cache = UrgentAlertCache()
             await alert_cache.cache_urgent_alert({
                 "patient_id": patient_id,
@@ -4,6 +4,7 @@ Logging configuration with Logfire integration for HIPAA-compliant audit logging
 import os
 import logging
 import structlog
+from contextvars import ContextVar
 from typing import Any, Dict
 
 # Set LOGFIRE_TOKEN before importing logfire
@@ -14,6 +15,18 @@ if os.getenv('PFINNI_LOGFIRE_TOKEN'):
 
 import logfire
 
+# Current request ID, set by the request ID middleware for the lifetime of a request
+request_id_var: ContextVar[str] = ContextVar("request_id", default="")
+
+
+class RequestIDFilter(logging.Filter):
+    """Attach the current request ID to every stdlib log record."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
 def configure_logging() -> None:
     """Configure structured logging with Logfire integration."""
     
@@ -71,6 +84,8 @@ def configure_logging() -> None:
         level=getattr(logging, log_level.upper()),
         format="%(message)s"
     )
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(RequestIDFilter())
     
     # Configure structlog
     processors = [
@@ -83,6 +98,7 @@ def configure_logging() -> None:
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
         add_app_context,
+        add_request_id,
         filter_sensitive_data,
     ]
     
@@ -107,6 +123,13 @@ def add_app_context(logger: Any, method_name: str, event_dict: Dict[str, Any]) -
     event_dict["version"] = "1.0.0"  # TODO: Get from package version
     return event_dict
 
+def add_request_id(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the current request ID to log entries emitted during a request."""
+    request_id = request_id_var.get()
+    if request_id:
+        event_dict.setdefault("request_id", request_id)
+    return event_dict
+
 def filter_sensitive_data(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
     """Filter out sensitive data to ensure HIPAA compliance."""
     
@@ -140,6 +140,7 @@ class Settings(BaseSettings):
     ENABLE_REAL_TIME_ALERTS: bool = Field(default=True, env="ENABLE_REAL_TIME_ALERTS")
     ENABLE_BIRTHDAY_ALERTS: bool = Field(default=True, env="ENABLE_BIRTHDAY_ALERTS")
     ENABLE_WEBHOOK_ENDPOINTS: bool = Field(default=True, env="ENABLE_WEBHOOK_ENDPOINTS")
+    ENABLE_AI_CHAT: bool = Field(default=True, env="ENABLE_AI_CHAT")
 
     @property
     def cors_origins_list(self) -> List[str]:
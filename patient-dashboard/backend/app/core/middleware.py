@@ -4,12 +4,15 @@ Core middleware for security, logging, and request handling.
 import time
 import uuid
 import json
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Iterable
 from datetime import datetime
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
 
 from app.core.exceptions import RateLimitException
@@ -17,6 +20,34 @@ from app.core.rate_limiter import RateLimitMiddleware as EnhancedRateLimitMiddle
 
 logger = structlog.get_logger()
 
+class StreamingGZipMiddleware(GZipMiddleware):
+    """GZip responses, except server-sent event streams.
+
+    Starlette's gzip responder does not flush a streaming body until it
+    ends, so every event would reach the client at once. Requests to one of
+    ``stream_paths``, or that accept ``text/event-stream``, go through
+    uncompressed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compresslevel: int = 9,
+        stream_paths: Iterable[str] = (),
+    ):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.stream_paths = frozenset(stream_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and (
+            scope["path"] in self.stream_paths
+            or "text/event-stream" in Headers(scope=scope).get("accept", "")
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add enhanced security headers for HIPAA compliance."""
     
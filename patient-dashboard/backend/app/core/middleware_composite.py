@@ -0,0 +1,246 @@
+"""
+Composite edge middleware.
+
+Runs request ID tagging, in-memory rate limiting, request validation,
+security headers and access logging in a single pure-ASGI layer instead of
+stacking one BaseHTTPMiddleware per concern.
+"""
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import structlog
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.logging import request_id_var
+
+logger = structlog.get_logger()
+
+# Content Security Policy - strict with Clerk support
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval' https://clerk.*.lcl.dev https://*.clerk.accounts.dev; "
+    "style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data: https: blob:; "
+    "font-src 'self' data:; "
+    "connect-src 'self' https://clerk.*.lcl.dev https://*.clerk.accounts.dev ws://localhost:* wss://localhost:* http://localhost:8001 https://api.pfinni.com; "
+    "frame-src 'self' https://clerk.*.lcl.dev https://*.clerk.accounts.dev; "
+    "object-src 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'; "
+    "frame-ancestors 'none'; "
+    "upgrade-insecure-requests;"
+)
+
+# Permissions policy - disable unnecessary features
+PERMISSIONS_POLICY = (
+    "accelerometer=(), "
+    "camera=(), "
+    "geolocation=(), "
+    "gyroscope=(), "
+    "magnetometer=(), "
+    "microphone=(), "
+    "payment=(), "
+    "usb=()"
+)
+
+SECURITY_HEADERS: Dict[str, str] = {
+    "Content-Security-Policy": CONTENT_SECURITY_POLICY,
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains; preload",
+    "X-Frame-Options": "DENY",
+    "X-Content-Type-Options": "nosniff",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": PERMISSIONS_POLICY,
+    # HIPAA-specific headers
+    "X-HIPAA-Compliance": "enabled",
+    "X-Data-Classification": "PHI",
+}
+
+# Raw ASGI header pairs, encoded once and spliced into every response
+_SECURITY_HEADER_ITEMS: Tuple[Tuple[bytes, bytes], ...] = tuple(
+    (name.lower().encode("latin-1"), value.encode("latin-1"))
+    for name, value in SECURITY_HEADERS.items()
+)
+
+ALLOWED_CONTENT_TYPES = (
+    "application/json",
+    "multipart/form-data",
+    "application/x-www-form-urlencoded",
+)
+
+MAX_REQUEST_BODY_SIZE = 10 * 1024 * 1024  # 10MB
+
+
+class CompositeEdgeMiddleware:
+    """Request ID, rate limiting, validation, security headers and logging."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limit_requests: Optional[int] = None,
+        rate_limit_window: int = 60,
+        max_body_size: int = MAX_REQUEST_BODY_SIZE,
+        max_tracked_clients: int = 10000,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Downstream ASGI application
+            rate_limit_requests: Requests allowed per client per window; None disables limiting
+            rate_limit_window: Rate limit window in seconds
+            max_body_size: Largest accepted Content-Length in bytes
+            max_tracked_clients: Client count that triggers a sweep of expired windows
+        """
+        self.app = app
+        self.rate_limit_requests = rate_limit_requests
+        self.rate_limit_window = rate_limit_window
+        self.max_body_size = max_body_size
+        self.max_tracked_clients = max_tracked_clients
+        # client -> [window_start, request_count]
+        self._windows: Dict[str, List[float]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = os.urandom(16).hex()
+        scope.setdefault("state", {})["request_id"] = request_id
+        request_id_header = request_id.encode("latin-1")
+
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client else None
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", ())
+                    if name.lower() != b"server"
+                ]
+                headers.append((b"x-request-id", request_id_header))
+                headers.extend(_SECURITY_HEADER_ITEMS)
+                message["headers"] = headers
+                logger.info(
+                    "request_completed",
+                    method=method,
+                    path=path,
+                    client_host=client_host,
+                    status_code=message["status"],
+                    duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+                )
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            error_response = self._check_rate_limit(client_host or "unknown", path)
+            if error_response is None:
+                error_response = self._validate_request(scope, method, path)
+            if error_response is not None:
+                await error_response(scope, receive, send_wrapper)
+                return
+
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            logger.error(
+                "request_failed",
+                method=method,
+                path=path,
+                error=str(e),
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+            raise
+        finally:
+            request_id_var.reset(token)
+
+    def _check_rate_limit(self, client_id: str, path: str) -> Optional[ORJSONResponse]:
+        """Fixed-window per-client rate limit. Returns a 429 response when exceeded."""
+        if not self.rate_limit_requests or path == "/health":
+            return None
+
+        now = time.monotonic()
+        window = self._windows.get(client_id)
+        if window is None or now - window[0] >= self.rate_limit_window:
+            if window is None and len(self._windows) >= self.max_tracked_clients:
+                self._sweep_expired_windows(now)
+            self._windows[client_id] = [now, 1]
+            return None
+
+        if window[1] >= self.rate_limit_requests:
+            retry_after = max(1, int(self.rate_limit_window - (now - window[0])))
+            logger.warning(
+                "rate_limit_exceeded",
+                client_id=client_id,
+                requests_count=int(window[1])
+            )
+            return ORJSONResponse(
+                status_code=429,
+                content={
+                    "error_code": "RATE_LIMIT_EXCEEDED",
+                    "message": "Too many requests. Please try again later.",
+                    "details": {"retry_after": retry_after}
+                },
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        window[1] += 1
+        return None
+
+    def _sweep_expired_windows(self, now: float) -> None:
+        """Drop clients whose window has already expired."""
+        self._windows = {
+            client_id: window
+            for client_id, window in self._windows.items()
+            if now - window[0] < self.rate_limit_window
+        }
+
+    def _validate_request(self, scope: Scope, method: str, path: str) -> Optional[ORJSONResponse]:
+        """Validate content type and size. Returns an error response on failure."""
+        # Skip validation for OPTIONS requests (CORS preflight)
+        if method == "OPTIONS":
+            return None
+
+        content_type = ""
+        content_length = None
+        chunked = False
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                content_type = value.decode("latin-1")
+            elif name == b"content-length":
+                content_length = value
+            elif name == b"transfer-encoding":
+                chunked = True
+        has_body = chunked or (content_length is not None and content_length != b"0")
+
+        # Check content type for POST/PUT requests with a body (skip OAuth2 form login)
+        if has_body and method in ("POST", "PUT", "PATCH") and path != "/api/v1/auth/login":
+            if not content_type.startswith(ALLOWED_CONTENT_TYPES):
+                return ORJSONResponse(
+                    status_code=415,
+                    content={
+                        "error_code": "UNSUPPORTED_MEDIA_TYPE",
+                        "message": "Content-Type must be application/json or multipart/form-data"
+                    }
+                )
+
+        # Check for suspiciously large requests
+        if content_length:
+            try:
+                if int(content_length) > self.max_body_size:
+                    return ORJSONResponse(
+                        status_code=413,
+                        content={
+                            "error_code": "PAYLOAD_TOO_LARGE",
+                            "message": "Request body too large"
+                        }
+                    )
+            except ValueError:
+                pass
+
+        return None
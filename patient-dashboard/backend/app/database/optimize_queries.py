@@ -58,6 +58,15 @@ class DatabaseOptimizer:
             ("alert_created_idx", "alert", ["created_at"], False),
             ("alert_type_idx", "alert", ["type"], False),
             ("alert_assigned_idx", "alert", ["assigned_to"], False),
+            # Patient alert lists filter on patient/status/severity and page
+            # by newest; history filters on patient and a created_at range
+            ("alert_patient_status_sev_ctime_idx", "alert", ["patient_id", "status", "severity", "created_at"], False),
+            ("alert_patient_ctime_idx", "alert", ["patient_id", "created_at"], False),
+            # Dashboard aggregates all filter on status = 'active'; leading
+            # with status confines them to the active slice of the index
+            ("alert_status_ctime_idx", "alert", ["status", "created_at"], False),
+            ("alert_status_sev_idx", "alert", ["status", "severity"], False),
+            ("alert_status_type_idx", "alert", ["status", "type"], False),
         ]
         
         # Appointment table indexes
@@ -201,6 +210,7 @@ class DatabaseOptimizer:
             # Alert queries
             ("active_alerts", "SELECT * FROM alert WHERE status = 'active' AND severity IN ['critical', 'high'] ORDER BY created_at DESC"),
             ("patient_alerts", "SELECT * FROM alert WHERE patient_id = 'patient:123' ORDER BY created_at DESC LIMIT 10"),
+            ("patient_alerts_filtered", "SELECT * FROM alert WHERE patient_id = 'patient:123' AND status = 'active' AND severity = 'high' ORDER BY created_at DESC LIMIT 10"),
             
             # Dashboard queries
             ("patient_stats", "SELECT count() as total, status FROM patient GROUP BY status"),
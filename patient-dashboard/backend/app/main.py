@@ -8,25 +8,19 @@ FastAPI Backend Application Entry Point
 from app.config.logging import configure_logging, get_logger
 configure_logging()
 
-from fastapi import FastAPI, Request, Response
+from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+import asyncio
 import time
 
+import orjson
+
 from app.config.settings import get_settings
-from app.core.middleware import (
-    LoggingMiddleware,
-    SecurityHeadersMiddleware,
-    RateLimitMiddleware,
-    RequestValidationMiddleware,
-    EnhancedRateLimitMiddleware
-)
-from app.middleware.audit_middleware import AuditMiddleware, AuditedRoute
-from app.middleware.metrics_middleware import MetricsMiddleware
-from app.middleware.cache_middleware import CacheMiddleware
-from app.middleware.request_signing_middleware import RequestSigningMiddleware
+from app.core.middleware import StreamingGZipMiddleware
+from app.core.middleware_composite import CompositeEdgeMiddleware
 from app.core.exceptions import (
     ValidationException,
     AuthenticationException,
@@ -58,11 +52,77 @@ from app.api.v1.test_patients import router as test_patients
 from app.api.v1.test_patients_raw import router as test_patients_raw
 from app.api.v1.hipaa_reports import router as hipaa_reports
 
+if TYPE_CHECKING:
+    from app.integrations.monitoring.health_checker import HealthChecker
+    from app.integrations.monitoring.metrics_collector import MetricsCollector
+
 # Get configuration
 settings = get_settings()
 
+# Hot settings bound once so request handlers skip the settings attribute path
+ENV = settings.ENVIRONMENT
+ENABLE_METRICS = settings.ENABLE_METRICS
+DOCS_URL = "/docs" if ENV != "production" else None
+API_V1_PREFIX = "/api/v1"
+
 logger = get_logger(__name__)
 
+# Monitoring singletons, created on first use by the health/metrics endpoints
+_health_checker: "HealthChecker | None" = None
+_metrics_collector: "MetricsCollector | None" = None
+
+# Static info payloads never change for the life of the process, so they
+# are serialized once here and served as raw bytes
+_VERSION_BYTES = orjson.dumps({
+    "version": "1.0.0",
+    "environment": ENV,
+    "build_time": "2025-07-25T10:00:00Z",
+    "python_version": "3.11+",
+    "features": {
+        "patient_management": True,
+        "insurance_integration": True,
+        "real_time_alerts": True,
+        "hipaa_compliance": True,
+        "audit_logging": True,
+    },
+})
+
+_ROOT_BYTES = orjson.dumps({
+    "message": "Healthcare Provider Patient Management Dashboard API",
+    "version": "1.0.0",
+    "documentation": DOCS_URL,
+    "health": "/health",
+    "status": "operational",
+})
+
+
+async def _warmup(app: FastAPI) -> None:
+    """
+    Prime connections and caches so the first requests after a deploy do not
+    pay cold-start latency. Each step is best-effort; failures are logged and
+    never block startup.
+    """
+    from app.database.connection import get_database
+    from app.services.clerk_auth_service import clerk_auth_service
+
+    async def warm_database():
+        db = await get_database()
+        await db.execute("SELECT 1")
+        await db.execute("SELECT count() AS total FROM patient GROUP ALL")
+
+    async def warm_jwks():
+        if clerk_auth_service.clerk_publishable_key:
+            await clerk_auth_service.get_jwks()
+
+    results = await asyncio.gather(warm_database(), warm_jwks(), return_exceptions=True)
+    for step, result in zip(("database", "jwks"), results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Warmup step '{step}' failed: {result}")
+
+    # Build the OpenAPI schema now rather than on the first /docs hit
+    if app.openapi_url:
+        app.openapi()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -82,8 +142,12 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Cache initialization skipped: {e}")
         # Continue without cache for development
 
+    # Warm connections, JWKS and the OpenAPI route map before serving traffic
+    await _warmup(app)
+    logger.info("Startup warmup complete")
+
     # Initialize monitoring
-    if settings.ENABLE_METRICS:
+    if ENABLE_METRICS:
         logger.info("Metrics collection enabled")
     
     # Initialize metrics service first (after logging is configured)
@@ -96,6 +160,14 @@ async def lifespan(app: FastAPI):
     await audit_service.initialize()
     logger.info("Audit service initialized")
     
+    # Initialize alert service (alert_counts view for dashboard counts)
+    from app.services.alert_service import alert_service
+    try:
+        await alert_service.initialize()
+        logger.info("Alert service initialized")
+    except Exception as e:
+        logger.warning(f"Alert counts view not defined, counts will scan alerts: {e}")
+    
     # Initialize alerting service
     from app.services.alerting_service import alerting_service
     await alerting_service.initialize()
@@ -109,6 +181,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Patient Dashboard API...")
 
+    # Finish background chat history writes while the database is still open
+    from app.api.v1.chat import chat_service
+    await chat_service.drain()
+
+    # Emit request metrics still buffered by the metrics middleware
+    from app.middleware.metrics_middleware import drain_metrics
+    await drain_metrics()
+
     # Close database connection
     await close_database()
     logger.info("Database connection closed")
@@ -125,20 +205,20 @@ app = FastAPI(
     title="Patient Management Dashboard API",
     description="Healthcare Provider Patient Management System with HIPAA compliance",
     version="1.0.0",
-    openapi_url="/openapi.json" if settings.ENVIRONMENT != "production" else None,
-    docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
-    redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+    openapi_url="/openapi.json" if ENV != "production" else None,
+    docs_url=DOCS_URL,
+    redoc_url="/redoc" if ENV != "production" else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
-# Security middleware
-# Temporarily disabled TrustedHostMiddleware for development
-# app.add_middleware(
-#     TrustedHostMiddleware,
-#     allowed_hosts=settings.ALLOWED_HOSTS,
-# )
-
-app.add_middleware(SecurityHeadersMiddleware)
+# Request ID, rate limiting, request validation, security headers and
+# access logging run in one ASGI layer instead of one wrapper per concern
+app.add_middleware(
+    CompositeEdgeMiddleware,
+    rate_limit_requests=settings.RATE_LIMIT_REQUESTS if settings.RATE_LIMIT_ENABLED else None,
+    rate_limit_window=settings.RATE_LIMIT_WINDOW,
+)
 
 # CORS middleware
 logger.info(f"CORS origins configured: {settings.cors_origins_list}")
@@ -160,19 +240,29 @@ app.add_middleware(
 )
 
 # Custom middleware - temporarily disabled for debugging
-# app.add_middleware(LoggingMiddleware)
-# app.add_middleware(RequestValidationMiddleware)
+# from app.middleware.request_signing_middleware import RequestSigningMiddleware
+# from app.middleware.audit_middleware import AuditMiddleware
+# from app.middleware.metrics_middleware import MetricsMiddleware
+# from app.middleware.cache_middleware import CacheMiddleware
 # app.add_middleware(RequestSigningMiddleware)  # Add request signing for sensitive operations
 # app.add_middleware(AuditMiddleware)  # Add audit middleware
 # app.add_middleware(MetricsMiddleware)  # Add metrics middleware
 # app.add_middleware(CacheMiddleware)  # Add cache middleware for performance
 
-if settings.RATE_LIMIT_ENABLED:
-    # Use enhanced rate limiter with distributed storage
-    # Disable for now due to middleware issues
-    pass
-    # from app.core.rate_limiter import RateLimitMiddleware as EnhancedRateLimiter
-    # app.add_middleware(EnhancedRateLimiter)
+# Distributed (SurrealDB-backed) rate limiter - disabled for now due to
+# middleware issues; CompositeEdgeMiddleware applies the in-memory limit
+# from app.core.rate_limiter import RateLimitMiddleware as EnhancedRateLimiter
+# app.add_middleware(EnhancedRateLimiter)
+
+# Response compression - added last so it is the outermost layer and
+# compresses the final body (patients lists, reports, analytics payloads).
+# Event streams are left uncompressed so each event is delivered as sent.
+app.add_middleware(
+    StreamingGZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    stream_paths=(f"{API_V1_PREFIX}/alerts/overview/stream",),
+)
 
 
 # Exception handlers
@@ -180,7 +270,7 @@ if settings.RATE_LIMIT_ENABLED:
 async def validation_exception_handler(request: Request, exc: ValidationException):
     """Handle validation exceptions."""
     logger.warning(f"Validation error: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={
             "error": "Validation Error",
@@ -194,7 +284,7 @@ async def validation_exception_handler(request: Request, exc: ValidationExceptio
 async def authentication_exception_handler(request: Request, exc: AuthenticationException):
     """Handle authentication exceptions."""
     logger.warning(f"Authentication error: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=401,
         content={
             "error": "Authentication Required",
@@ -208,7 +298,7 @@ async def authentication_exception_handler(request: Request, exc: Authentication
 async def authorization_exception_handler(request: Request, exc: AuthorizationException):
     """Handle authorization exceptions."""
     logger.warning(f"Authorization error: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=403,
         content={
             "error": "Access Forbidden",
@@ -222,7 +312,7 @@ async def authorization_exception_handler(request: Request, exc: AuthorizationEx
 async def business_logic_exception_handler(request: Request, exc: BusinessLogicException):
     """Handle business logic exceptions."""
     logger.error(f"Business logic error: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "error": "Business Logic Error",
@@ -236,7 +326,7 @@ async def business_logic_exception_handler(request: Request, exc: BusinessLogicE
 async def external_service_exception_handler(request: Request, exc: ExternalServiceException):
     """Handle external service exceptions."""
     logger.error(f"External service error: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=503,
         content={
             "error": "External Service Unavailable",
@@ -250,7 +340,7 @@ async def external_service_exception_handler(request: Request, exc: ExternalServ
 async def database_exception_handler(request: Request, exc: DatabaseException):
     """Handle database exceptions."""
     logger.error(f"Database error: {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Database Error",
@@ -264,7 +354,7 @@ async def database_exception_handler(request: Request, exc: DatabaseException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
@@ -283,7 +373,7 @@ async def health_check():
     health_status = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "environment": settings.ENVIRONMENT,
+        "environment": ENV,
         "services": {
             "api": "healthy",
             "database": "unknown"
@@ -307,17 +397,19 @@ async def health_check():
 @app.get("/health/detailed", tags=["Health"])
 async def detailed_health_check():
     """Detailed health check with service status."""
-    from app.integrations.monitoring.health_checker import HealthChecker
+    global _health_checker
+    if _health_checker is None:
+        from app.integrations.monitoring.health_checker import HealthChecker
+        _health_checker = HealthChecker()
 
-    health_checker = HealthChecker()
-    health_status = await health_checker.check_all_services()
+    health_status = await _health_checker.check_all_services()
 
     return {
         "status": "healthy" if health_status["overall_healthy"] else "unhealthy",
         "timestamp": time.time(),
         "services": health_status["services"],
         "version": "1.0.0",
-        "environment": settings.ENVIRONMENT,
+        "environment": ENV,
     }
 
 
@@ -325,175 +417,62 @@ async def detailed_health_check():
 @app.get("/version", tags=["Info"])
 async def get_version():
     """Get API version information."""
-    return {
-        "version": "1.0.0",
-        "environment": settings.ENVIRONMENT,
-        "build_time": "2025-07-25T10:00:00Z",
-        "python_version": "3.11+",
-        "features": {
-            "patient_management": True,
-            "insurance_integration": True,
-            "real_time_alerts": True,
-            "hipaa_compliance": True,
-            "audit_logging": True,
-        },
-    }
+    return Response(content=_VERSION_BYTES, media_type="application/json")
 
 
 # Include API routers
-API_V1_PREFIX = "/api/v1"
 
-app.include_router(
-    auth,
-    prefix=f"{API_V1_PREFIX}/auth",
-    tags=["Authentication"],
+# (router, prefix, tag, enabled) - feature-flagged routers are only mounted
+# when their feature is on for this deployment
+_ROUTERS: tuple[tuple[APIRouter, str, str, bool], ...] = (
+    (auth, f"{API_V1_PREFIX}/auth", "Authentication", True),
+    (patients, f"{API_V1_PREFIX}/patients", "Patients", True),
+    (providers, f"{API_V1_PREFIX}/providers", "Providers", True),
+    (users, f"{API_V1_PREFIX}/users", "Users", True),
+    (dashboard, f"{API_V1_PREFIX}/dashboard", "Dashboard", True),
+    (alerts, f"{API_V1_PREFIX}/alerts", "Alerts", True),
+    (analytics, f"{API_V1_PREFIX}/analytics", "Analytics", True),
+    (insurance, f"{API_V1_PREFIX}/insurance", "Insurance", settings.ENABLE_INSURANCE_INTEGRATION),
+    (reports, f"{API_V1_PREFIX}/reports", "Reports", True),
+    (webhooks, f"{API_V1_PREFIX}/webhooks", "Webhooks", settings.ENABLE_WEBHOOK_ENDPOINTS),
+    (debug, f"{API_V1_PREFIX}/debug", "Debug", True),
+    (chat, f"{API_V1_PREFIX}/chat", "AI Chat", settings.ENABLE_AI_CHAT),
+    (test_clerk, API_V1_PREFIX, "Test", True),
+    (test_dashboard, API_V1_PREFIX, "Test Dashboard", True),
+    (test_patients, API_V1_PREFIX, "Test Patients", True),
+    (test_patients_raw, API_V1_PREFIX, "Test Patients Raw", True),
+    (system_alerts, f"{API_V1_PREFIX}/system-alerts", "System Alerts", True),
+    (hipaa_reports, f"{API_V1_PREFIX}/hipaa-reports", "HIPAA Compliance", True),
 )
 
-app.include_router(
-    patients,
-    prefix=f"{API_V1_PREFIX}/patients",
-    tags=["Patients"],
-)
-
-app.include_router(
-    providers,
-    prefix=f"{API_V1_PREFIX}/providers",
-    tags=["Providers"],
-)
-
-app.include_router(
-    users,
-    prefix=f"{API_V1_PREFIX}/users",
-    tags=["Users"],
-)
-
-app.include_router(
-    dashboard,
-    prefix=f"{API_V1_PREFIX}/dashboard",
-    tags=["Dashboard"],
-)
-
-app.include_router(
-    alerts,
-    prefix=f"{API_V1_PREFIX}/alerts",
-    tags=["Alerts"],
-)
-
-app.include_router(
-    analytics,
-    prefix=f"{API_V1_PREFIX}/analytics",
-    tags=["Analytics"],
-)
-
-app.include_router(
-    insurance,
-    prefix=f"{API_V1_PREFIX}/insurance",
-    tags=["Insurance"],
-)
-
-app.include_router(
-    reports,
-    prefix=f"{API_V1_PREFIX}/reports",
-    tags=["Reports"],
-)
-
-app.include_router(
-    webhooks,
-    prefix=f"{API_V1_PREFIX}/webhooks",
-    tags=["Webhooks"],
-)
-
-app.include_router(
-    debug,
-    prefix=f"{API_V1_PREFIX}/debug",
-    tags=["Debug"],
-)
-
-app.include_router(
-    chat,
-    prefix=f"{API_V1_PREFIX}/chat",
-    tags=["AI Chat"],
-)
-
-app.include_router(
-    test_clerk,
-    prefix=f"{API_V1_PREFIX}",
-    tags=["Test"],
-)
-
-app.include_router(
-    test_dashboard,
-    prefix=f"{API_V1_PREFIX}",
-    tags=["Test Dashboard"],
-)
-
-app.include_router(
-    test_patients,
-    prefix=f"{API_V1_PREFIX}",
-    tags=["Test Patients"],
-)
-
-app.include_router(
-    test_patients_raw,
-    prefix=f"{API_V1_PREFIX}",
-    tags=["Test Patients Raw"],
-)
-
-app.include_router(
-    system_alerts,
-    prefix=f"{API_V1_PREFIX}/system-alerts",
-    tags=["System Alerts"],
-)
-
-app.include_router(
-    hipaa_reports,
-    prefix=f"{API_V1_PREFIX}/hipaa-reports",
-    tags=["HIPAA Compliance"],
-)
+for router, prefix, tag, enabled in _ROUTERS:
+    if enabled:
+        app.include_router(router, prefix=prefix, tags=[tag])
 
 
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
     """API root endpoint with basic information."""
-    return {
-        "message": "Healthcare Provider Patient Management Dashboard API",
-        "version": "1.0.0",
-        "documentation": "/docs" if settings.ENVIRONMENT != "production" else None,
-        "health": "/health",
-        "status": "operational",
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
 # Module can be run directly for testing
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
-
-# Add request ID to all responses
-# @app.middleware("http")
-# async def add_request_id(request: Request, call_next):
-#     """Add unique request ID to all responses."""
-#     import uuid
-#
-#     request_id = str(uuid.uuid4())
-#     request.state.request_id = request_id
-#
-#     response = await call_next(request)
-#     response.headers["X-Request-ID"] = request_id
-#
-#     return response
-
+    uvicorn.run(app, host="0.0.0.0", port=8001, loop="uvloop", http="httptools")
 
 # Metrics endpoint (if enabled)
-if settings.ENABLE_METRICS:
+if ENABLE_METRICS:
     @app.get("/metrics", tags=["Monitoring"])
     async def get_metrics():
         """Prometheus-compatible metrics endpoint."""
-        from app.integrations.monitoring.metrics_collector import MetricsCollector
+        global _metrics_collector
+        if _metrics_collector is None:
+            from app.integrations.monitoring.metrics_collector import MetricsCollector
+            _metrics_collector = MetricsCollector()
 
-        metrics_collector = MetricsCollector()
-        metrics = await metrics_collector.get_prometheus_metrics()
+        metrics = await _metrics_collector.get_prometheus_metrics()
 
         return Response(
             content=metrics,
@@ -509,5 +488,7 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.RELOAD,
+        loop="uvloop",
+        http="httptools",
         log_config=None,  # Use our custom logging configuration
     )
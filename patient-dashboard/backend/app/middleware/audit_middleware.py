@@ -2,8 +2,10 @@
 Audit middleware for automatically logging all API requests.
 Per Production Proposal: Implement audit logging for all data access
 """
+import re
 import time
 import json
+import logfire
 from typing import Callable, Optional
 from fastapi import Request, Response
 from fastapi.routing import APIRoute
@@ -13,6 +15,38 @@ from starlette.types import ASGIApp
 from app.services.audit_service import audit_service, AuditAction, AuditResource
 from app.api.v1.auth import get_current_user_optional
 
+# Infrastructure endpoints that never touch PHI and are not audited
+_AUDIT_SKIP_PATHS: frozenset[str] = frozenset({
+    "/",
+    "/health",
+    "/health/detailed",
+    "/version",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+})
+
+def _compile_audit_routes(mapping: dict) -> tuple[dict, dict]:
+    """
+    Split an audit mapping into exact-path lookups and compiled `{id}` patterns.
+    
+    Returns:
+        Tuple of ({(method, path): (action, resource)},
+                  {method: ((regex, action, resource), ...)})
+    """
+    static_routes = {}
+    pattern_routes: dict[str, list] = {}
+    for (method, path_template), (action, resource) in mapping.items():
+        if "{id}" in path_template:
+            pattern = re.compile(
+                "^" + re.escape(path_template).replace(r"\{id\}", r"(?P<id>[^/]+)") + "$"
+            )
+            pattern_routes.setdefault(method, []).append((pattern, action, resource))
+        else:
+            static_routes[(method, path_template)] = (action, resource)
+    return static_routes, {method: tuple(routes) for method, routes in pattern_routes.items()}
+
 
 class AuditMiddleware(BaseHTTPMiddleware):
     """Middleware to audit all API requests."""
@@ -59,21 +93,23 @@ class AuditMiddleware(BaseHTTPMiddleware):
         ("GET", "/api/v1/reports/export"): (AuditAction.EXPORT, AuditResource.REPORT),
     }
     
+    _STATIC_ROUTES, _PATTERN_ROUTES = _compile_audit_routes(AUDIT_MAPPING)
+    
     def __init__(self, app: ASGIApp):
         super().__init__(app)
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process the request and audit it."""
-        # Skip audit for health checks and docs
-        if request.url.path in ["/health", "/docs", "/openapi.json", "/redoc"]:
+        # Skip audit for health checks, docs and static assets
+        path = request.scope["path"]
+        if path in _AUDIT_SKIP_PATHS or path.startswith("/static/"):
             return await call_next(request)
         
         # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Get request details
         method = request.method
-        path = request.url.path
         client_ip = request.client.host if request.client else None
         user_agent = request.headers.get("user-agent", "")
         
@@ -82,7 +118,6 @@ class AuditMiddleware(BaseHTTPMiddleware):
         user_email = "anonymous"
         user_role = "guest"
         session_id = None
-        resource_id = None
         patient_id = None
         error_message = None
         success = True
@@ -98,14 +133,6 @@ class AuditMiddleware(BaseHTTPMiddleware):
             # Get session ID from headers or cookies
             session_id = request.headers.get("x-session-id") or request.cookies.get("session_id")
             
-            # Extract resource ID from path if present
-            path_parts = path.split("/")
-            if "{id}" in str(request.url) or (len(path_parts) > 4 and path_parts[-1]):
-                # Try to extract ID from path
-                potential_id = path_parts[-1]
-                if potential_id and not potential_id.startswith("?"):
-                    resource_id = potential_id
-            
             # Process the request
             response = await call_next(request)
             
@@ -125,12 +152,12 @@ class AuditMiddleware(BaseHTTPMiddleware):
             )
         
         # Calculate request duration
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         
         # Determine audit action and resource
         audit_info = self._get_audit_info(method, path)
         if audit_info:
-            action, resource = audit_info
+            action, resource, resource_id = audit_info
             
             # Special handling for patient-related endpoints
             if resource == AuditResource.PATIENT and resource_id:
@@ -174,22 +201,20 @@ class AuditMiddleware(BaseHTTPMiddleware):
         
         return response
     
-    def _get_audit_info(self, method: str, path: str) -> Optional[tuple[AuditAction, AuditResource]]:
-        """Get audit action and resource for a given method and path."""
+    def _get_audit_info(
+        self, method: str, path: str
+    ) -> Optional[tuple[AuditAction, AuditResource, Optional[str]]]:
+        """Get audit action, resource and resource ID for a given method and path."""
         # Direct match
-        key = (method, path)
-        if key in self.AUDIT_MAPPING:
-            return self.AUDIT_MAPPING[key]
+        audit_info = self._STATIC_ROUTES.get((method, path))
+        if audit_info:
+            return audit_info[0], audit_info[1], None
         
         # Pattern matching for parameterized paths
-        for pattern_key, audit_info in self.AUDIT_MAPPING.items():
-            pattern_method, pattern_path = pattern_key
-            if method == pattern_method:
-                # Simple pattern matching for {id} parameters
-                if "{id}" in pattern_path:
-                    pattern_base = pattern_path.replace("{id}", "")
-                    if path.startswith(pattern_base) and path.count("/") == pattern_path.count("/"):
-                        return audit_info
+        for pattern, action, resource in self._PATTERN_ROUTES.get(method, ()):
+            match = pattern.match(path)
+            if match:
+                return action, resource, match.group("id")
         
         return None
 
@@ -201,13 +226,17 @@ class AuditedRoute(APIRoute):
         original_route_handler = super().get_route_handler()
         
         async def custom_route_handler(request: Request) -> Response:
-            # Try to get current user and add to request state
+            # Try to get current user and add to request state. The resolved
+            # user is cached on the scope so the route's own auth dependency
+            # does not verify the token a second time.
             try:
-                user = await get_current_user_optional(request)
+                user = await get_current_user_optional(request, None)
                 if user:
                     request.state.user = user
-            except:
-                pass
+            except Exception as e:
+                # Auditing must never fail the request; verification errors
+                # (bad tokens, JWKS or network failures) just leave it anonymous
+                logfire.warning("Audit user lookup failed", path=request.url.path, error=str(e))
             
             return await original_route_handler(request)
         
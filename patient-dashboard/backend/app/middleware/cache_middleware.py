@@ -2,21 +2,30 @@
 Response caching middleware for API performance optimization.
 Per Production Proposal Phase 2: Implement response caching
 """
+import asyncio
+import base64
 import hashlib
 import json
-import time
-from typing import Optional, Dict, Any, Callable
+import re
+import zlib
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from datetime import datetime, timedelta
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logfire
+import orjson
 
+from app.cache.local_cache import LocalResponseCache
 from app.cache.surreal_cache_manager import surreal_cache_manager
 from app.config.settings import get_settings
 
 settings = get_settings()
 
+# Cached bodies are mostly JSON and compress well; a low level keeps the
+# background write cheap
+CACHE_COMPRESSION_LEVEL = 3
+
 
 class CacheMiddleware(BaseHTTPMiddleware):
     """Middleware for caching API responses."""
@@ -47,10 +56,89 @@ class CacheMiddleware(BaseHTTPMiddleware):
         "/api/v1/reports": {"ttl": 600, "vary_by": ["user_id", "type", "period"]},
     }
     
+    # Largest number of cache records written per INSERT, and the most
+    # writes allowed to wait; writes beyond that are dropped
+    WRITE_BATCH_SIZE = 64
+    WRITE_QUEUE_SIZE = 1024
+    
     def __init__(self, app: ASGIApp):
         super().__init__(app)
         self.cache_client = None
-        self.cache_enabled = settings.CACHE_ENABLED
+        # Enabled by startup() once the SurrealDB cache client is available
+        self.cache_enabled = False
+        # Cache writes are queued and flushed by a single background worker
+        # as multi-record INSERTs
+        self._write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._writer_task: Optional[asyncio.Task] = None
+        # L1 cache in front of SurrealDB, plus per-key locks so concurrent
+        # misses on the same key share a single SurrealDB lookup
+        self._l1 = LocalResponseCache(maxsize=2048)
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+        
+        # Split the config once into exact paths and parameterized prefixes
+        self._exact: Dict[str, Dict[str, Any]] = {}
+        self._prefixes: Dict[str, Dict[str, Any]] = {}
+        for pattern, config in self.CACHE_CONFIG.items():
+            vary_by = config.get("vary_by", [])
+            config = {
+                **config,
+                # Sorted once so key order is stable regardless of config order
+                "vary_params": tuple(sorted(p for p in vary_by if p != "user_id")),
+                "vary_user": "user_id" in vary_by,
+            }
+            if "{" in pattern:
+                self._prefixes.setdefault(pattern.split("{")[0], config)
+            else:
+                self._exact[pattern] = config
+        
+        # Longest prefix first so the most specific pattern wins
+        self._prefix_re = None
+        if self._prefixes:
+            self._prefix_re = re.compile(
+                "^(" + "|".join(re.escape(p) for p in sorted(self._prefixes, key=len, reverse=True)) + ")"
+            )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "lifespan":
+            await super().__call__(scope, receive, send)
+            return
+        
+        # The app's lifespan initializes the SurrealDB cache; acquire the
+        # client once it reports startup complete
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "lifespan.startup.complete":
+                await self.startup()
+            elif message["type"] == "lifespan.shutdown.complete":
+                await self.shutdown()
+            await send(message)
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    async def startup(self):
+        """Acquire the SurrealDB cache client and start the cache writer."""
+        if not settings.CACHE_ENABLED:
+            return
+        
+        try:
+            self.cache_client = surreal_cache_manager.get_client()
+        except Exception as e:
+            logfire.warning("SurrealDB cache not available, caching disabled", error=str(e))
+            self.cache_enabled = False
+            return
+        
+        self._writer_task = asyncio.create_task(self._cache_writer_loop())
+        self.cache_enabled = True
+    
+    async def shutdown(self):
+        """Stop the cache writer."""
+        self.cache_enabled = False
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with caching logic."""
@@ -63,17 +151,6 @@ class CacheMiddleware(BaseHTTPMiddleware):
         if not cache_config:
             return await call_next(request)
         
-        # Initialize SurrealDB cache client if needed
-        if not self.cache_client:
-            try:
-                self.cache_client = surreal_cache_manager.get_client()
-                if not self.cache_client:
-                    raise RuntimeError("SurrealDB cache not initialized")
-            except Exception as e:
-                logfire.warning("SurrealDB cache not available, caching disabled", error=str(e))
-                self.cache_enabled = False
-                return await call_next(request)
-        
         # Generate cache key
         cache_key = await self._generate_cache_key(request, cache_config)
         
@@ -92,83 +169,79 @@ class CacheMiddleware(BaseHTTPMiddleware):
         
         # Only cache successful responses
         if 200 <= response.status_code < 300:
-            await self._cache_response(
+            self._cache_response(
                 cache_key,
                 response,
                 cache_config["ttl"]
             )
-            logfire.info(
-                "Response cached",
-                path=request.url.path,
-                cache_key=cache_key,
-                ttl=cache_config["ttl"]
-            )
         
         return response
     
     def _get_cache_config(self, path: str) -> Optional[Dict[str, Any]]:
         """Get cache configuration for a given path."""
-        # Direct match
-        if path in self.CACHE_CONFIG:
-            return self.CACHE_CONFIG[path]
+        path = path.partition("?")[0]
         
-        # Pattern matching for parameterized paths
-        for pattern, config in self.CACHE_CONFIG.items():
-            if self._path_matches_pattern(path, pattern):
-                return config
+        config = self._exact.get(path)
+        if config is not None or self._prefix_re is None:
+            return config
         
-        return None
-    
-    def _path_matches_pattern(self, path: str, pattern: str) -> bool:
-        """Check if a path matches a pattern (simple implementation)."""
-        # Remove query parameters
-        path = path.split("?")[0]
-        
-        # Simple pattern matching for now
-        if "{" in pattern:
-            # For patterns with parameters, just check the base
-            pattern_base = pattern.split("{")[0]
-            return path.startswith(pattern_base)
-        
-        return path == pattern
+        # Pattern matching for parameterized paths
+        match = self._prefix_re.match(path)
+        return self._prefixes[match.group(1)] if match else None
     
     async def _generate_cache_key(self, request: Request, cache_config: Dict[str, Any]) -> str:
         """Generate a cache key based on request and configuration."""
-        # Base key components
-        key_parts = [
-            "cache",
-            request.method,
-            request.url.path
-        ]
-        
-        # Add vary-by parameters
-        vary_by = cache_config.get("vary_by", [])
-        
-        # Add user_id if specified
-        if "user_id" in vary_by:
+        user_id = None
+        if cache_config["vary_user"]:
             user = getattr(request.state, "user", None)
             if user:
-                key_parts.append(f"user:{user.id}")
-        
-        # Add query parameters if specified
-        for param in vary_by:
-            if param not in ["user_id"]:  # Skip already handled
-                value = request.query_params.get(param)
-                if value:
-                    key_parts.append(f"{param}:{value}")
+                user_id = str(user.id)
         
-        # Generate hash of key parts
-        key_string = ":".join(key_parts)
-        key_hash = hashlib.md5(key_string.encode()).hexdigest()[:16]
+        query_params = request.query_params
+        payload = orjson.dumps((
+            request.method,
+            request.url.path,
+            user_id,
+            [query_params.get(param) for param in cache_config["vary_params"]],
+        ))
+        key_hash = hashlib.blake2b(payload, digest_size=8).hexdigest()
         
         return f"response_cache:{key_hash}"
     
     async def _get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get cached response from the local cache, falling back to SurrealDB."""
+        cached = self._l1.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        lock = self._key_locks.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                # Another request may have filled L1 while we waited
+                cached = self._l1.get(cache_key)
+                if cached is not None:
+                    return cached
+                
+                cached = await self._get_stored_response(cache_key)
+                if cached is not None:
+                    self._l1.set(cache_key, cached, self._remaining_ttl(cached))
+                return cached
+        finally:
+            if not lock.locked():
+                self._key_locks.pop(cache_key, None)
+    
+    @staticmethod
+    def _remaining_ttl(cached_data: Dict[str, Any]) -> float:
+        """Seconds until a stored entry expires."""
+        cached_at = datetime.fromisoformat(cached_data["cached_at"])
+        return cached_data["ttl"] - (datetime.utcnow() - cached_at).total_seconds()
+    
+    async def _get_stored_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get cached response from SurrealDB."""
         try:
             # Query SurrealDB for cached response
             result = await self.cache_client.query(
-                "SELECT * FROM cache WHERE id = $id AND expires_at > time::now()",
+                "SELECT * FROM type::thing('cache', $id) WHERE expires_at > time::now()",
                 {"id": cache_key}
             )
             
@@ -180,54 +253,107 @@ class CacheMiddleware(BaseHTTPMiddleware):
             logfire.error("Failed to get cached response", error=str(e), cache_key=cache_key)
             return None
     
-    async def _cache_response(self, cache_key: str, response: Response, ttl: int):
-        """Cache response in SurrealDB."""
+    def _cache_response(self, cache_key: str, response: Response, ttl: int):
+        """Stream the response through and cache it in the background once complete."""
+        body_iterator = response.body_iterator
+        
+        async def tee():
+            chunks = []
+            async for chunk in body_iterator:
+                chunks.append(chunk)
+                yield chunk
+            
+            # Body fully sent; persist without holding up the client
+            self._enqueue_write(
+                cache_key,
+                b"".join(chunks),
+                response.status_code,
+                dict(response.headers),
+                ttl
+            )
+        
+        response.body_iterator = tee()
+    
+    def _enqueue_write(
+        self,
+        cache_key: str,
+        body: bytes,
+        status_code: int,
+        headers: Dict[str, str],
+        ttl: int
+    ):
+        """Queue a response for the background writer, starting it on first use."""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._cache_writer_loop())
+        
         try:
-            # Read response body
-            body = b""
-            async for chunk in response.body_iterator:
-                body += chunk
+            self._write_queue.put_nowait((cache_key, body, status_code, headers, ttl))
+        except asyncio.QueueFull:
+            logfire.warning("Cache write queue full, dropping write", cache_key=cache_key)
+    
+    async def _cache_writer_loop(self):
+        """Drain the write queue, coalescing pending writes into one INSERT."""
+        while True:
+            batch = [await self._write_queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
             
-            # Cache the response data
+            try:
+                await self._persist_responses(batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    async def _persist_responses(self, batch: List[Tuple[str, bytes, int, Dict[str, str], int]]):
+        """Cache a batch of responses in SurrealDB."""
+        now = datetime.utcnow()
+        cached_at = now.isoformat()
+        
+        # Later writes for the same key win
+        records: Dict[str, Dict[str, Any]] = {}
+        for cache_key, body, status_code, headers, ttl in batch:
             cache_data = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "body": body.decode("utf-8"),
-                "cached_at": datetime.utcnow().isoformat(),
+                "status_code": status_code,
+                "headers": headers,
+                "body": base64.b64encode(zlib.compress(body, CACHE_COMPRESSION_LEVEL)).decode("ascii"),
+                "encoding": "zlib",
+                "cached_at": cached_at,
                 "ttl": ttl
             }
-            
-            # Calculate expiration time
-            expires_at = datetime.utcnow() + timedelta(seconds=ttl)
-            
-            # Store in SurrealDB with TTL
+            self._l1.set(cache_key, cache_data, ttl)
+            records[cache_key] = {
+                "id": cache_key,
+                "data": cache_data,
+                "expires_at": (now + timedelta(seconds=ttl)).isoformat()
+            }
+        
+        try:
+            # Store in SurrealDB with TTL, replacing expired or stale entries
             await self.cache_client.query(
                 """
-                CREATE cache:⟨$id⟩ SET
-                    data = $data,
-                    expires_at = $expires_at,
+                INSERT INTO cache $recs ON DUPLICATE KEY UPDATE
+                    data = $input.data,
+                    expires_at = $input.expires_at,
                     created_at = time::now()
                 """,
-                {
-                    "id": cache_key,
-                    "data": cache_data,
-                    "expires_at": expires_at.isoformat()
-                }
+                {"recs": list(records.values())}
             )
-            
-            # Recreate response body iterator
-            async def body_iterator():
-                yield body
-            
-            response.body_iterator = body_iterator()
+            logfire.info("Responses cached", count=len(records))
             
         except Exception as e:
-            logfire.error("Failed to cache response", error=str(e), cache_key=cache_key)
+            logfire.error("Failed to cache responses", error=str(e), count=len(records))
     
     def _build_cached_response(self, cached_data: Dict[str, Any]) -> Response:
         """Build response from cached data."""
+        body = base64.b64decode(cached_data["body"])
+        if cached_data.get("encoding") == "zlib":
+            body = zlib.decompress(body)
+        
         response = Response(
-            content=cached_data["body"],
+            content=body,
             status_code=cached_data["status_code"],
             headers=cached_data["headers"]
         )
@@ -256,42 +382,35 @@ class CacheControl:
             vary_by: List of parameters to vary cache by
             private: Whether cache is private (user-specific)
         """
+        # Headers depend only on the decorator arguments, so build them once
+        cache_control = ["private" if private else "public", f"max-age={ttl}"]
+        if ttl == 0:
+            cache_control.append("no-cache")
+            cache_control.append("must-revalidate")
+        cache_control_header = ", ".join(cache_control)
+        
+        vary_values = []
+        if vary_by:
+            if "user_id" in vary_by:
+                vary_values.append("Authorization")
+            if not {"skip", "limit", "search"}.isdisjoint(vary_by):
+                vary_values.append("Accept")
+        vary_header = ", ".join(vary_values) or None
+        
         def decorator(func):
             async def wrapper(*args, **kwargs):
                 response = await func(*args, **kwargs)
                 
                 if isinstance(response, Response):
-                    # Add cache control headers
-                    cache_control = []
-                    
-                    if private:
-                        cache_control.append("private")
-                    else:
-                        cache_control.append("public")
-                    
-                    cache_control.append(f"max-age={ttl}")
-                    
-                    if ttl == 0:
-                        cache_control.append("no-cache")
-                        cache_control.append("must-revalidate")
-                    
-                    response.headers["Cache-Control"] = ", ".join(cache_control)
-                    
-                    # Add vary header
-                    if vary_by:
-                        vary_values = []
-                        if "user_id" in vary_by:
-                            vary_values.append("Authorization")
-                        if any(p in vary_by for p in ["skip", "limit", "search"]):
-                            vary_values.append("Accept")
-                        
-                        if vary_values:
-                            response.headers["Vary"] = ", ".join(vary_values)
+                    response.headers["Cache-Control"] = cache_control_header
+                    if vary_header:
+                        response.headers["Vary"] = vary_header
                     
-                    # Add ETag for conditional requests
+                    # Add weak ETag for conditional requests; it is a content
+                    # fingerprint, not a byte-for-byte guarantee
                     if hasattr(response, "body"):
-                        etag = hashlib.md5(response.body).hexdigest()
-                        response.headers["ETag"] = f'"{etag}"'
+                        etag = hashlib.blake2b(response.body, digest_size=16).hexdigest()
+                        response.headers["ETag"] = f'W/"{etag}"'
                 
                 return response
             
@@ -2,53 +2,70 @@
 Metrics middleware for automatic API performance tracking.
 Per Production Proposal Phase 2: Add comprehensive Logfire metrics
 """
+import asyncio
+import contextlib
+import sys
 import time
-import json
-from typing import Callable
+import weakref
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+import logfire
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
 from app.services.metrics_service import metrics_service
 
+# Paths that are never tracked
+_EXCLUDE_PATHS = frozenset(
+    sys.intern(path)
+    for path in (
+        "/health",
+        "/metrics",
+        "/docs",
+        "/openapi.json",
+        "/redoc",
+        "/favicon.ico"
+    )
+)
+
+# Live middleware instances, so shutdown can flush their buffered metrics
+_instances: "weakref.WeakSet[MetricsMiddleware]" = weakref.WeakSet()
+
 
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to automatically track API metrics."""
     
+    # Request metrics are buffered and flushed every interval, or sooner once
+    # the batch size is reached
+    FLUSH_INTERVAL = 1.0
+    FLUSH_BATCH_SIZE = 256
+    MAX_PENDING = 10000
+    
     def __init__(self, app: ASGIApp):
         super().__init__(app)
-        self.exclude_paths = {
-            "/health",
-            "/metrics",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-            "/favicon.ico"
-        }
+        # (method, path, status_code, duration_ms, user_id, user_role)
+        self._pending: Deque[Tuple[str, str, int, float, Optional[str], Optional[str]]] = deque(
+            maxlen=self.MAX_PENDING
+        )
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_now = asyncio.Event()
+        self.exclude_paths = _EXCLUDE_PATHS
+        _instances.add(self)
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request and track metrics."""
         # Skip metrics for excluded paths
-        if request.url.path in self.exclude_paths:
+        path = request.scope["path"]
+        if path in self.exclude_paths:
             return await call_next(request)
         
         # Start timing
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Extract request metadata
         method = request.method
-        path = request.url.path
-        user_id = None
-        user_role = None
-        
-        # Try to get user info from request state
-        if hasattr(request.state, "user") and request.state.user:
-            user = request.state.user
-            user_id = user.id
-            user_role = user.role
-        
-        # Track request start
-        request_id = f"{method}:{path}:{start_time}"
         
         # Process request
         response = None
@@ -60,36 +77,39 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             error = e
-            # Track error
-            metrics_service.track_error(
-                error_type=type(e).__name__,
-                error_message=str(e),
-                user_id=user_id,
-                method=method,
-                path=path
-            )
             raise
             
         finally:
             # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ns = time.perf_counter_ns() - start_ns
+            duration_ms = duration_ns / 1_000_000
+            
+            # Resolve user info once, after downstream auth has populated state
+            user_id = None
+            user_role = None
+            user = getattr(request.state, "user", None)
+            if user:
+                user_id = user.id
+                user_role = user.role
+            
+            if error is not None:
+                # Track error
+                metrics_service.track_error(
+                    error_type=type(error).__name__,
+                    error_message=str(error),
+                    user_id=user_id,
+                    method=method,
+                    path=path
+                )
             
             # Determine status code
             status_code = response.status_code if response else 500
             
-            # Track API request
-            metrics_service.track_api_request(
-                method=method,
-                path=path,
-                status_code=status_code,
-                duration_ms=duration_ms,
-                user_id=user_id,
-                user_role=user_role,
-                error=str(error) if error else None
-            )
+            # Queue API request for the next batch
+            self._record_request(method, path, status_code, duration_ms, user_id, user_role)
             
             # Track slow requests
-            if duration_ms > 1000:  # Requests taking more than 1 second
+            if duration_ns > 1_000_000_000:  # Requests taking more than 1 second
                 metrics_service.track_custom_metric(
                     "slow_request",
                     value=duration_ms,
@@ -101,9 +121,57 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             
             # Track specific endpoint metrics
             self._track_endpoint_specific_metrics(
-                method, path, status_code, duration_ms, request, response
+                method, path, status_code, duration_ms, request, response, user_id
             )
     
+    def _record_request(
+        self,
+        method: str,
+        path: str,
+        status_code: int,
+        duration_ms: float,
+        user_id: Optional[str],
+        user_role: Optional[str]
+    ):
+        """Buffer a request metric, starting the flush loop on first use."""
+        self._pending.append((method, path, status_code, duration_ms, user_id, user_role))
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if len(self._pending) >= self.FLUSH_BATCH_SIZE:
+            self._flush_now.set()
+    
+    async def _flush_loop(self):
+        """Periodically emit buffered request metrics as one batch."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Drop the failed batch but keep the loop alive for the next one
+                logfire.warning("Failed to flush request metrics", error=str(e))
+    
+    def flush(self):
+        """Emit all buffered request metrics."""
+        if not self._pending:
+            return
+        batch = list(self._pending)
+        self._pending.clear()
+        metrics_service.track_api_requests(batch)
+    
+    async def aclose(self):
+        """Stop the flush loop and emit whatever is still buffered."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self.flush()
+    
     def _track_endpoint_specific_metrics(
         self,
         method: str,
@@ -111,31 +179,30 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         status_code: int,
         duration_ms: float,
         request: Request,
-        response: Response
+        response: Response,
+        user_id: Optional[str] = None
     ):
         """Track metrics specific to certain endpoints."""
+        user_id = user_id or "unknown"
+
         # Dashboard metrics
         if path == "/api/v1/dashboard/metrics" and status_code == 200:
             metrics_service.track_dashboard_load(
-                user_id=getattr(request.state, "user", {}).get("id", "unknown"),
+                user_id=user_id,
                 load_time_ms=duration_ms,
                 widget_count=8  # Default widget count
             )
         
         # Patient operations
         elif path.startswith("/api/v1/patients"):
-            if method == "POST" and status_code == 201:
-                # New patient created
-                try:
-                    # Try to get patient ID from response
-                    if hasattr(response, "body"):
-                        body = json.loads(response.body)
-                        metrics_service.track_patient_created(
-                            patient_id=body.get("id"),
-                            created_by=getattr(request.state, "user", {}).get("id", "unknown")
-                        )
-                except:
-                    pass
+            if method == "POST" and 200 <= status_code < 300:
+                # New patient created; the create endpoint exposes its ID
+                patient_id = response.headers.get("X-Resource-Id") if response else None
+                if patient_id:
+                    metrics_service.track_patient_created(
+                        patient_id=patient_id,
+                        created_by=user_id
+                    )
             
             elif method == "GET" and "/search" in path:
                 # Patient search
@@ -180,7 +247,13 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         # Data exports
         elif "export" in path and status_code == 200:
             metrics_service.track_data_export(
-                user_id=getattr(request.state, "user", {}).get("id", "unknown"),
+                user_id=user_id,
                 export_type=path.split("/")[-1],
-                record_count=0  # Would need to parse response
-            )
\ No newline at end of file
+                record_count=int(response.headers.get("X-Record-Count", 0)) if response else 0
+            )
+
+
+async def drain_metrics():
+    """Flush every live MetricsMiddleware; called at shutdown."""
+    for middleware in list(_instances):
+        await middleware.aclose()
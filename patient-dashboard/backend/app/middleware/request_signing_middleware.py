@@ -3,8 +3,10 @@ Request signing middleware for sensitive operations.
 """
 import hmac
 import hashlib
+import ssl
 import time
 import json
+import re
 from typing import Optional
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
@@ -12,6 +14,42 @@ from starlette.responses import JSONResponse
 import logfire
 import os
 
+# Signature algorithms accepted in X-Signature-Alg. Requests without the
+# header are HMAC-SHA256, so existing clients keep working.
+SIGNATURE_ALG_HMAC_SHA256 = "hmac-sha256"
+SIGNATURE_ALG_BLAKE2B = "blake2b"
+DEFAULT_SIGNATURE_ALG = SIGNATURE_ALG_HMAC_SHA256
+SIGNATURE_ALGORITHMS = frozenset({SIGNATURE_ALG_HMAC_SHA256, SIGNATURE_ALG_BLAKE2B})
+
+# Hex lengths of a 32-byte signature and a 16-byte nonce
+SIGNATURE_HEX_LENGTH = 64
+NONCE_HEX_LENGTH = 32
+
+# Accepted clock skew for X-Request-Timestamp, in seconds
+TIMESTAMP_WINDOW = 300
+
+
+def _blake2b_key(key: bytes) -> bytes:
+    """BLAKE2b accepts keys up to 64 bytes; longer keys are hashed down."""
+    return key if len(key) <= hashlib.blake2b.MAX_KEY_SIZE else hashlib.blake2b(key).digest()
+
+
+def compute_signature(algorithm: str, key: bytes, message: bytes) -> bytes:
+    """Compute the raw signature of a message with the given algorithm."""
+    if algorithm == SIGNATURE_ALG_BLAKE2B:
+        # Keyed BLAKE2b is a MAC in a single pass, unlike HMAC's two
+        return hashlib.blake2b(message, key=_blake2b_key(key), digest_size=32).digest()
+    return hmac.new(key, message, hashlib.sha256).digest()
+
+
+def _check_hash_backend():
+    """Warn when SHA-256 is not served by a modern OpenSSL (no SHA-NI dispatch)."""
+    if "sha256" not in hashlib.algorithms_available or ssl.OPENSSL_VERSION_INFO < (1, 1, 1):
+        logfire.warning(
+            "Request signing is using a slow SHA-256 implementation",
+            openssl_version=ssl.OPENSSL_VERSION
+        )
+
 
 class RequestSigningMiddleware(BaseHTTPMiddleware):
     """Validate request signatures for sensitive operations."""
@@ -34,6 +72,18 @@ class RequestSigningMiddleware(BaseHTTPMiddleware):
         if not self.signing_key:
             logfire.warning("No PFINNI_REQUEST_SIGNING_KEY found")
             self.signing_key = "development-signing-key"  # Development only
+        self.signing_key_bytes = self.signing_key.encode()
+        # Keyed hash states per algorithm; each request copies one instead of
+        # re-deriving the keyed state from scratch
+        self._signers = {
+            SIGNATURE_ALG_HMAC_SHA256: hmac.new(self.signing_key_bytes, digestmod=hashlib.sha256),
+            SIGNATURE_ALG_BLAKE2B: hashlib.blake2b(key=_blake2b_key(self.signing_key_bytes), digest_size=32),
+        }
+        _check_hash_backend()
+        # Matches a protected endpoint or anything nested under it
+        self._protected_prefix_re = re.compile(
+            "^(?:" + "|".join(map(re.escape, sorted(self.PROTECTED_ENDPOINTS))) + ")(?:/|$)"
+        )
             
     async def dispatch(self, request: Request, call_next):
         # Check if this endpoint requires signing
@@ -58,20 +108,11 @@ class RequestSigningMiddleware(BaseHTTPMiddleware):
     
     def _requires_signing(self, request: Request) -> bool:
         """Check if the request requires signature validation."""
-        # Check if it's a protected endpoint
-        path = request.url.path
-        method = request.method
+        # Reads are never signed
+        if request.method not in self.PROTECTED_METHODS:
+            return False
         
-        # Check exact matches first
-        if path in self.PROTECTED_ENDPOINTS and method in self.PROTECTED_METHODS:
-            return True
-            
-        # Check prefix matches for nested endpoints
-        for endpoint in self.PROTECTED_ENDPOINTS:
-            if path.startswith(endpoint + "/") and method in self.PROTECTED_METHODS:
-                return True
-                
-        return False
+        return self._protected_prefix_re.match(request.scope["path"]) is not None
     
     async def _validate_signature(self, request: Request) -> bool:
         """Validate the request signature."""
@@ -80,50 +121,56 @@ class RequestSigningMiddleware(BaseHTTPMiddleware):
             signature = request.headers.get("X-Request-Signature")
             timestamp = request.headers.get("X-Request-Timestamp")
             nonce = request.headers.get("X-Request-Nonce")
+            algorithm = request.headers.get("X-Signature-Alg", DEFAULT_SIGNATURE_ALG).lower()
             
             if not all([signature, timestamp, nonce]):
                 logfire.warning("Missing signature headers")
                 return False
             
+            if algorithm not in SIGNATURE_ALGORITHMS:
+                logfire.warning("Unsupported signature algorithm", algorithm=algorithm)
+                return False
+            
+            # Cheap shape checks before any parsing or hashing
+            if len(signature) != SIGNATURE_HEX_LENGTH or len(nonce) != NONCE_HEX_LENGTH:
+                logfire.warning("Malformed signature headers")
+                return False
+            
             # Check timestamp (prevent replay attacks)
-            current_time = int(time.time())
-            request_time = int(timestamp)
-            if abs(current_time - request_time) > 300:  # 5 minute window
+            now = int(time.time())
+            try:
+                request_time = int(timestamp)
+            except ValueError:
+                logfire.warning("Malformed request timestamp")
+                return False
+            if request_time < now - TIMESTAMP_WINDOW or request_time > now + TIMESTAMP_WINDOW:
                 logfire.warning("Request timestamp too old")
                 return False
             
+            try:
+                provided_signature = bytes.fromhex(signature)
+            except ValueError:
+                return False
+            
             # Get request body
             body = await request.body()
             
-            # Create the message to sign
-            message_parts = [
-                request.method,
-                request.url.path,
-                timestamp,
-                nonce,
-                body.decode() if body else ""
-            ]
-            message = "|".join(message_parts)
+            # Create the message to sign, without decoding the body
+            message = b"|".join((
+                request.method.encode(),
+                request.url.path.encode(),
+                timestamp.encode(),
+                nonce.encode(),
+                body
+            ))
             
             # Calculate expected signature
-            expected_signature = hmac.new(
-                self.signing_key.encode(),
-                message.encode(),
-                hashlib.sha256
-            ).hexdigest()
+            signer = self._signers[algorithm].copy()
+            signer.update(message)
+            expected_signature = signer.digest()
             
-            # Compare signatures
-            is_valid = hmac.compare_digest(signature, expected_signature)
-            
-            if is_valid:
-                with logfire.span("request_signature_valid"):
-                    logfire.info(
-                        "Valid request signature",
-                        path=request.url.path,
-                        method=request.method
-                    )
-            
-            return is_valid
+            # Compare signatures (only failures are logged, by dispatch)
+            return hmac.compare_digest(provided_signature, expected_signature)
             
         except Exception as e:
             logfire.error("Signature validation error", error=str(e))
@@ -134,9 +181,13 @@ def generate_request_signature(
     method: str,
     path: str,
     body: Optional[dict] = None,
-    signing_key: Optional[str] = None
+    signing_key: Optional[str] = None,
+    algorithm: str = DEFAULT_SIGNATURE_ALG
 ) -> dict:
     """Generate signature headers for a request."""
+    if algorithm not in SIGNATURE_ALGORITHMS:
+        raise ValueError(f"Unsupported signature algorithm: {algorithm}")
+
     if not signing_key:
         signing_key = os.getenv('PFINNI_REQUEST_SIGNING_KEY', 'development-signing-key')
         
@@ -154,14 +205,11 @@ def generate_request_signature(
     message = "|".join(message_parts)
     
     # Calculate signature
-    signature = hmac.new(
-        signing_key.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    signature = compute_signature(algorithm, signing_key.encode(), message.encode()).hex()
     
     return {
         "X-Request-Signature": signature,
         "X-Request-Timestamp": timestamp,
-        "X-Request-Nonce": nonce
+        "X-Request-Nonce": nonce,
+        "X-Signature-Alg": algorithm
     }
\ No newline at end of file
@@ -1,86 +1,94 @@
 """
 Pydantic models for the patient dashboard.
-"""
-from .patient import (
-    PatientStatus,
-    RiskLevel,
-    Gender,
-    Address,
-    Insurance,
-    PatientBase,
-    PatientCreate,
-    PatientUpdate,
-    PatientInDB,
-    PatientResponse,
-    PatientListResponse,
-    PatientSearchFilters,
-    PatientStatusChange
-)
-
-from .user import (
-    UserRole,
-    UserBase,
-    UserCreate,
-    UserUpdate,
-    UserInDB,
-    UserResponse,
-    UserListResponse,
-    UserLogin,
-    UserPasswordChange,
-    UserPasswordReset,
-    UserPasswordResetConfirm,
-    TokenResponse,
-    TokenData
-)
-
-from .audit import (
-    AuditAction,
-    ResourceType,
-    AuditLogBase,
-    AuditLogCreate,
-    AuditLogInDB,
-    AuditLogResponse,
-    AuditLogListResponse,
-    AuditLogSearchParams
-)
 
-from .alert import (
-    AlertType,
-    AlertSeverity,
-    AlertStatus,
-    AlertPriority,
-    AlertBase,
-    AlertCreate,
-    AlertUpdate,
-    AlertInDB,
-    AlertResponse,
-    AlertListResponse,
-    AlertSearchParams,
-    AlertBulkAcknowledge
-)
+Submodules are imported on first attribute access (PEP 562), so touching one
+model does not pull in every other model module.
+"""
+import importlib
+from typing import Any
 
-from .analytics import (
-    MetricType,
-    DashboardMetrics,
-    TimeSeriesData,
-    PatientMetrics,
-    MetricTrend,
-    AnalyticsReport,
-    ProviderMetrics,
-    SystemHealthMetrics
-)
+# Submodule providing each exported name
+_SUBMODULES = {
+    "patient": (
+        "PatientStatus",
+        "RiskLevel",
+        "Gender",
+        "Address",
+        "Insurance",
+        "PatientDBBase",
+        "PatientBase",
+        "PatientCreate",
+        "PatientUpdate",
+        "PatientInDB",
+        "PatientResponse",
+        "PatientListResponse",
+        "PatientSearchFilters",
+        "PatientStatusChange",
+    ),
+    "user": (
+        "UserRole",
+        "UserBase",
+        "UserCreate",
+        "UserUpdate",
+        "UserInDB",
+        "UserResponse",
+        "UserListResponse",
+        "UserLogin",
+        "UserPasswordChange",
+        "UserPasswordReset",
+        "UserPasswordResetConfirm",
+        "TokenResponse",
+        "TokenData",
+    ),
+    "audit": (
+        "AuditAction",
+        "ResourceType",
+        "AuditLogBase",
+        "AuditLogCreate",
+        "AuditLogInDB",
+        "AuditLogResponse",
+        "AuditLogListResponse",
+        "AuditLogSearchParams",
+    ),
+    "alert": (
+        "AlertType",
+        "AlertSeverity",
+        "AlertStatus",
+        "AlertPriority",
+        "AlertBase",
+        "AlertCreate",
+        "AlertUpdate",
+        "AlertInDB",
+        "AlertResponse",
+        "AlertListResponse",
+        "AlertListResponseSoA",
+        "AlertSearchParams",
+        "AlertBulkAcknowledge",
+    ),
+    "analytics": (
+        "MetricType",
+        "DashboardMetrics",
+        "TimeSeriesData",
+        "PatientMetrics",
+        "MetricTrend",
+        "AnalyticsReport",
+        "ProviderMetrics",
+        "SystemHealthMetrics",
+    ),
+    "chat": (
+        "ChatRole",
+        "MessageType",
+        "ChatContext",
+        "ChatMessage",
+        "ChatSession",
+        "ChatRequest",
+        "ChatResponse",
+        "ChatSummary",
+        "ChatAnalytics",
+    ),
+}
 
-from .chat import (
-    ChatRole,
-    MessageType,
-    ChatContext,
-    ChatMessage,
-    ChatSession,
-    ChatRequest,
-    ChatResponse,
-    ChatSummary,
-    ChatAnalytics
-)
+_LAZY = {name: f"{__name__}.{module}" for module, names in _SUBMODULES.items() for name in names}
 
 __all__ = [
     # Patient models
@@ -89,6 +97,7 @@ __all__ = [
     "Gender",
     "Address",
     "Insurance",
+    "PatientDBBase",
     "PatientBase",
     "PatientCreate",
     "PatientUpdate",
@@ -134,6 +143,7 @@ __all__ = [
     "AlertInDB",
     "AlertResponse",
     "AlertListResponse",
+    "AlertListResponseSoA",
     "AlertSearchParams",
     "AlertBulkAcknowledge",
     
@@ -158,3 +168,19 @@ __all__ = [
     "ChatSummary",
     "ChatAnalytics"
 ]
+
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), name)
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
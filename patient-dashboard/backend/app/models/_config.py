@@ -0,0 +1,10 @@
+"""
+Shared model configurations.
+"""
+from pydantic import ConfigDict
+
+# Models loaded from database rows or ORM-style objects
+DB_CONFIG = ConfigDict(from_attributes=True)
+
+# Serialization-only response models: immutable and strict about unknown fields
+RESPONSE_CONFIG = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
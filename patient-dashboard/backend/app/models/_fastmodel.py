@@ -0,0 +1,135 @@
+"""
+Checked constructors for models built from server-originated data.
+
+Full pydantic validation is wasted on values the server produced itself
+(audit entries, rule-generated alerts). ``fast_model`` generates a
+``construct_checked`` classmethod per model that only does inline isinstance
+checks and enum coercion, then fills the instance the way ``model_construct``
+does, with defaults resolved at decoration time.
+"""
+import types
+import typing
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+ModelT = TypeVar("ModelT", bound=Type[BaseModel])
+
+_MISSING = object()
+
+# Defaults that are safe to share between instances without copying
+_IMMUTABLE_DEFAULTS = (bool, int, float, str, bytes, tuple, frozenset, Enum)
+
+# Runtime types accepted for plain annotations; anything else is unchecked
+_CHECKED_TYPES: Dict[Any, Tuple[type, ...]] = {
+    str: (str,),
+    bool: (bool,),
+    int: (int,),
+    float: (int, float),
+    dict: (dict,),
+    list: (list,),
+    datetime: (datetime,),
+    date: (date,),
+}
+
+
+def _unwrap(annotation: Any) -> Tuple[Any, bool]:
+    """Return the annotation without Optional, and whether None is allowed."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is types.UnionType:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        nullable = len(args) < len(typing.get_args(annotation))
+        if len(args) == 1:
+            return args[0], nullable
+        return Any, nullable
+    return annotation, False
+
+
+def _field_check(name: str, annotation: Any, namespace: Dict[str, Any]) -> Optional[str]:
+    """Source for the check on one argument, or None if it is unchecked."""
+    inner, nullable = _unwrap(annotation)
+    guard = f"{name} is not None and " if nullable else ""
+
+    if isinstance(inner, type) and issubclass(inner, Enum):
+        namespace[f"_t_{name}"] = inner
+        return f"    if {guard}not isinstance({name}, _t_{name}): {name} = _t_{name}({name})"
+
+    accepted = _CHECKED_TYPES.get(typing.get_origin(inner) or inner)
+    if accepted is None:
+        return None
+    namespace[f"_t_{name}"] = accepted
+    return (
+        f"    if {guard}not isinstance({name}, _t_{name}):\n"
+        f"        raise TypeError('{name}: expected {getattr(inner, '__name__', inner)}, "
+        f"got ' + _type({name}).__name__)"
+    )
+
+
+def _default_source(name: str, field: FieldInfo, namespace: Dict[str, Any]) -> str:
+    """Source expression producing a field's default value."""
+    if field.default_factory is not None:
+        namespace[f"_f_{name}"] = field.default_factory
+        return f"_f_{name}()"
+    if field.default is None or isinstance(field.default, _IMMUTABLE_DEFAULTS):
+        namespace[f"_d_{name}"] = field.default
+        return f"_d_{name}"
+    # Mutable default: let pydantic copy it as it would on validation
+    namespace[f"_fi_{name}"] = field
+    return f"_fi_{name}.get_default(call_default_factory=True)"
+
+
+def fast_model(cls: ModelT) -> ModelT:
+    """Attach a generated ``construct_checked`` classmethod to a model."""
+    # Fields may shadow builtins (AlertBase.type), so bind what the source uses
+    namespace: Dict[str, Any] = {
+        "_MISSING": _MISSING,
+        "_type": type,
+        "_new": object.__new__,
+        "_setattr": object.__setattr__,
+    }
+    params = []
+    required = []
+    body = []
+
+    for name, field in cls.model_fields.items():
+        check = _field_check(name, field.annotation, namespace)
+        if field.is_required():
+            params.append(name)
+            required.append(name)
+            if check:
+                body.append(check)
+        else:
+            params.append(f"{name}=_MISSING")
+            body.append(f"    if {name} is _MISSING:")
+            body.append(f"        {name} = {_default_source(name, field, namespace)}")
+            body.append("    else:")
+            if check:
+                body.append("\n".join("    " + line for line in check.split("\n")))
+            body.append(f"        fields_set.add('{name}')")
+
+    values = ", ".join(f"'{name}': {name}" for name in cls.model_fields)
+    body.insert(0, f"    fields_set = {{{', '.join(repr(name) for name in required)}}}" if required else "    fields_set = set()")
+    if cls.__private_attributes__ or cls.model_config.get("extra") == "allow":
+        # Let pydantic set up private and extra state
+        body.append(f"    return cls.model_construct(fields_set, **{{{values}}})")
+    else:
+        # What model_construct does, without its per-call field loop
+        body.extend([
+            "    obj = _new(cls)",
+            f"    _setattr(obj, '__dict__', {{{values}}})",
+            "    _setattr(obj, '__pydantic_fields_set__', fields_set)",
+            "    _setattr(obj, '__pydantic_extra__', None)",
+            "    _setattr(obj, '__pydantic_private__', None)",
+            "    return obj",
+        ])
+    src = f"def construct_checked(cls, *, {', '.join(params)}):\n" + "\n".join(body)
+    exec(src, namespace)
+
+    constructor = namespace["construct_checked"]
+    constructor.__doc__ = f"Build a {cls.__name__} from trusted values with type checks only."
+    constructor.__qualname__ = f"{cls.__qualname__}.construct_checked"
+    cls.construct_checked = classmethod(constructor)
+    return cls
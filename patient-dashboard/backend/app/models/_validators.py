@@ -0,0 +1,25 @@
+"""
+Field validators shared across models.
+"""
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def validate_nanp_phone(v: str) -> str:
+    """Check a US phone number has 10 digits, ignoring formatting, in NANP form."""
+    # Fast path for already-clean numbers, the common case in bulk imports
+    if len(v) == 10 and v.isdecimal():
+        digits = v
+    else:
+        digits = ''.join(filter(str.isdecimal, v))
+        if len(digits) != 10:
+            raise ValueError('Phone number must be 10 digits')
+    # NANP: area code and exchange cannot start with 0 or 1
+    if digits[0] in '01' or digits[3] in '01':
+        raise ValueError('Phone number must have a valid area code and exchange')
+    return v
+
+
+# US phone number; use Optional[PhoneStr] for optional fields
+PhoneStr = Annotated[str, AfterValidator(validate_nanp_phone)]
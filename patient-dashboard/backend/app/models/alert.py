@@ -2,11 +2,16 @@
 Alert model for notifications and real-time updates.
 """
 from datetime import datetime
-from typing import Optional, Dict, Any
-from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from functools import cached_property
+from typing import Optional, Dict, Any, Iterable, List
+from enum import StrEnum
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic_core import to_json
 
-class AlertType(str, Enum):
+from ._config import DB_CONFIG, RESPONSE_CONFIG
+from ._fastmodel import fast_model
+
+class AlertType(StrEnum):
     """Types of alerts."""
     MEDICATION = "medication"
     APPOINTMENT = "appointment"
@@ -19,21 +24,21 @@ class AlertType(str, Enum):
     SYSTEM = "system"
     URGENT = "urgent"
 
-class AlertSeverity(str, Enum):
+class AlertSeverity(StrEnum):
     """Alert severity levels."""
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     CRITICAL = "critical"
 
-class AlertPriority(str, Enum):
+class AlertPriority(StrEnum):
     """Alert priority levels."""
     LOW = "LOW"
     MEDIUM = "MEDIUM"
     HIGH = "HIGH"
     URGENT = "URGENT"
 
-class AlertStatus(str, Enum):
+class AlertStatus(StrEnum):
     """Alert status."""
     ACTIVE = "active"
     ACKNOWLEDGED = "acknowledged"
@@ -41,6 +46,27 @@ class AlertStatus(str, Enum):
     RESOLVED = "resolved"
     EXPIRED = "expired"
 
+# Severities that trigger notifications, built once for membership checks
+NOTIFY_SEVERITIES = frozenset({AlertSeverity.HIGH, AlertSeverity.CRITICAL})
+
+# Fields coerced by AlertResponse.from_db in place of full validation
+_ALERT_ENUM_FIELDS = {
+    "type": AlertType,
+    "severity": AlertSeverity,
+    "priority": AlertPriority,
+    "status": AlertStatus,
+}
+_ALERT_DATETIME_FIELDS = (
+    "expires_at",
+    "read_at",
+    "acknowledged_at",
+    "resolved_at",
+    "snoozed_until",
+    "created_at",
+    "updated_at",
+)
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
 class AlertBase(BaseModel):
     """Base alert model."""
     type: AlertType
@@ -54,6 +80,7 @@ class AlertBase(BaseModel):
     requires_action: bool = False
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
+@fast_model
 class AlertCreate(AlertBase):
     """Model for creating a new alert."""
     triggered_by: str  # user_id or 'system'
@@ -83,11 +110,26 @@ class AlertInDB(AlertBase):
     created_at: datetime
     updated_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class AlertResponse(AlertInDB):
     """Alert model for API responses."""
-    pass
+    
+    model_config = RESPONSE_CONFIG
+    
+    @classmethod
+    def from_db(cls, alert: Dict[str, Any]) -> "AlertResponse":
+        """Create response from a database alert row without re-validating it."""
+        data = dict(alert)
+        for field, enum_cls in _ALERT_ENUM_FIELDS.items():
+            value = data.get(field)
+            if value is not None:
+                data[field] = enum_cls(value)
+        for field in _ALERT_DATETIME_FIELDS:
+            value = data.get(field)
+            if value is not None and not isinstance(value, datetime):
+                data[field] = _DATETIME_ADAPTER.validate_python(value)
+        return cls.model_construct(**data)
 
 class AlertListResponse(BaseModel):
     """Response model for alert list endpoint."""
@@ -98,6 +140,54 @@ class AlertListResponse(BaseModel):
     per_page: int
     pages: int
 
+    def to_json(self) -> bytes:
+        """Serialize straight to JSON bytes in one pydantic-core pass."""
+        return to_json(self)
+
+class AlertListResponseSoA(BaseModel):
+    """Column-oriented alert list; one list per field instead of one model per row."""
+    ids: List[str]
+    types: List[AlertType]
+    severities: List[AlertSeverity]
+    statuses: List[AlertStatus]
+    titles: List[str]
+    # Sparse: only timestamp columns with at least one value are present
+    timestamps: Dict[str, List[Optional[str]]]
+    total: int
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "AlertListResponseSoA":
+        """Transpose database alert rows into columns without per-row models."""
+        ids: List[str] = []
+        types: List[AlertType] = []
+        severities: List[AlertSeverity] = []
+        statuses: List[AlertStatus] = []
+        titles: List[str] = []
+        stamps: Dict[str, List[Optional[str]]] = {field: [] for field in _ALERT_DATETIME_FIELDS}
+        
+        for row in rows:
+            ids.append(str(row["id"]))
+            types.append(AlertType(row["type"]))
+            severities.append(AlertSeverity(row.get("severity", AlertSeverity.MEDIUM)))
+            statuses.append(AlertStatus(row.get("status", AlertStatus.ACTIVE)))
+            titles.append(row["title"])
+            for field, column in stamps.items():
+                value = row.get(field)
+                column.append(value.isoformat() if isinstance(value, datetime) else value)
+        
+        return cls.model_construct(
+            ids=ids,
+            types=types,
+            severities=severities,
+            statuses=statuses,
+            titles=titles,
+            timestamps={
+                field: column for field, column in stamps.items()
+                if any(value is not None for value in column)
+            },
+            total=len(ids)
+        )
+
 class AlertSearchParams(BaseModel):
     """Parameters for alert search."""
     type: Optional[AlertType] = None
@@ -114,4 +204,9 @@ class AlertSearchParams(BaseModel):
 
 class AlertBulkAcknowledge(BaseModel):
     """Model for bulk alert acknowledgment."""
-    alert_ids: list[str] = Field(..., min_items=1, max_items=100)
\ No newline at end of file
+    alert_ids: tuple[str, ...] = Field(..., min_length=1, max_length=100)
+    
+    @cached_property
+    def ids_set(self) -> frozenset[str]:
+        """Deduplicated IDs for containment checks, built on first use."""
+        return frozenset(self.alert_ids)
\ No newline at end of file
@@ -1,13 +1,30 @@
 """
 Analytics models for dashboard metrics and reporting
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from array import array
+from pydantic import BaseModel, Field, PlainSerializer, ValidatorFunctionWrapHandler, WrapValidator
+from typing import Annotated, Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class MetricType(str, Enum):
+def _pack_floats(v: Any, handler: ValidatorFunctionWrapHandler) -> array:
+    """Validate a series as a list of floats, then pack it into a float64 array."""
+    if isinstance(v, array) and v.typecode == "d":
+        return v
+    return array("d", handler(v))
+
+
+# Float series kept as a contiguous float64 buffer rather than boxed floats;
+# validated like List[float] and serialized back to a JSON list
+FloatArray = Annotated[
+    List[float],
+    WrapValidator(_pack_floats),
+    PlainSerializer(lambda a: a.tolist(), return_type=List[float]),
+]
+
+
+class MetricType(StrEnum):
     """Types of metrics available"""
     PATIENT_COUNT = "patient_count"
     ADHERENCE_RATE = "adherence_rate"
@@ -53,7 +70,7 @@ class MetricTrend(BaseModel):
     direction: str = Field(..., description="Trend direction: up, down, stable")
     percentage_change: float = Field(..., description="Percentage change")
     trend_strength: float = Field(..., description="Trend strength (0-1)")
-    forecast: Optional[List[float]] = Field(None, description="Future predictions")
+    forecast: Optional[FloatArray] = Field(None, description="Future predictions")
 
 
 class AnalyticsReport(BaseModel):
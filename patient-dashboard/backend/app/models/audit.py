@@ -3,10 +3,14 @@ Audit log model for HIPAA compliance.
 """
 from datetime import datetime
 from typing import Optional, Dict, Any
-from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from enum import StrEnum
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
 
-class AuditAction(str, Enum):
+from ._config import DB_CONFIG, RESPONSE_CONFIG
+from ._fastmodel import fast_model
+
+class AuditAction(StrEnum):
     """Types of auditable actions."""
     CREATE = "CREATE"
     READ = "READ"
@@ -17,7 +21,7 @@ class AuditAction(str, Enum):
     EXPORT = "EXPORT"
     STATUS_CHANGE = "STATUS_CHANGE"
 
-class ResourceType(str, Enum):
+class ResourceType(StrEnum):
     """Types of resources that can be audited."""
     PATIENT = "PATIENT"
     USER = "USER"
@@ -40,6 +44,7 @@ class AuditLogBase(BaseModel):
     success: bool = True
     error_message: Optional[str] = None
 
+@fast_model
 class AuditLogCreate(AuditLogBase):
     """Model for creating audit log entries."""
     pass
@@ -49,11 +54,12 @@ class AuditLogInDB(AuditLogBase):
     id: str
     created_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class AuditLogResponse(AuditLogInDB):
     """Audit log model for API responses."""
-    pass
+    
+    model_config = RESPONSE_CONFIG
 
 class AuditLogListResponse(BaseModel):
     """Response model for audit log list endpoint."""
@@ -63,6 +69,10 @@ class AuditLogListResponse(BaseModel):
     per_page: int
     pages: int
 
+    def to_json(self) -> bytes:
+        """Serialize straight to JSON bytes in one pydantic-core pass."""
+        return to_json(self)
+
 class AuditLogSearchParams(BaseModel):
     """Parameters for audit log search."""
     user_id: Optional[str] = None
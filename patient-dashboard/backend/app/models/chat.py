@@ -1,20 +1,20 @@
 """
 Chat models for AI-powered chat functionality
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class ChatRole(str, Enum):
+class ChatRole(StrEnum):
     """Chat message roles"""
     USER = "user"
     ASSISTANT = "assistant"
     SYSTEM = "system"
 
 
-class MessageType(str, Enum):
+class MessageType(StrEnum):
     """Types of chat messages"""
     TEXT = "text"
     IMAGE = "image"
@@ -40,6 +40,9 @@ class ChatMessage(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
     attachments: Optional[List[str]] = Field(default_factory=list)
+    
+    # Serialization-only: immutable and strict about unknown fields
+    model_config = ConfigDict(frozen=True, extra='forbid')
 
 
 class ChatSession(BaseModel):
@@ -3,11 +3,59 @@ Patient model with HIPAA-compliant field handling and validation.
 """
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from enum import Enum
-from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
+from enum import StrEnum
+from pydantic import BaseModel, Field, EmailStr, field_validator, TypeAdapter
+from pydantic_core import to_json
 import re
 
-class PatientStatus(str, Enum):
+from ._config import DB_CONFIG, RESPONSE_CONFIG
+
+# Compiled once; the validators below run on every patient instance
+_ZIP_CODE_RE = re.compile(r'^\d{5}(-\d{4})?$')
+
+# Shared field constraints, built once and reused across the patient models
+_NAME = Field(..., min_length=1, max_length=100)
+_OPTIONAL_NAME = Field(None, min_length=1, max_length=100)
+_MIDDLE_NAME = Field(None, max_length=100)
+
+_DATETIME_ADAPTER = TypeAdapter(datetime)
+
+
+def _as_datetime(value: Any) -> Any:
+    """Coerce a stored timestamp to datetime without validating a whole model."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return _DATETIME_ADAPTER.validate_python(value)
+
+
+def _validate_date_of_birth(v: str) -> str:
+    """Check a YYYY-MM-DD date of birth is a real date and not in the future."""
+    try:
+        # Fast path for the canonical fixed-width format
+        if (
+            len(v) == 10 and v[4] == '-' and v[7] == '-' and v.isascii()
+            and v[:4].isdigit() and v[5:7].isdigit() and v[8:].isdigit()
+        ):
+            month, day = int(v[5:7]), int(v[8:])
+            # Out-of-range fields fail strptime's pattern, so report them
+            # as a format error the same way
+            if not (1 <= month <= 12 and 1 <= day <= 31):
+                raise ValueError('Date of birth must be in YYYY-MM-DD format')
+            dob = datetime(int(v[:4]), month, day)
+        else:
+            dob = datetime.strptime(v, "%Y-%m-%d")
+    except ValueError as e:
+        # strptime reports trailing characters separately from mismatches
+        if "time data" in str(e) or "unconverted data" in str(e):
+            raise ValueError('Date of birth must be in YYYY-MM-DD format')
+        raise
+    
+    if dob > datetime.now():
+        raise ValueError('Date of birth cannot be in the future')
+    return v
+
+
+class PatientStatus(StrEnum):
     """Patient status workflow states."""
     INQUIRY = "inquiry"
     ONBOARDING = "onboarding"
@@ -15,13 +63,13 @@ class PatientStatus(str, Enum):
     CHURNED = "churned"
     URGENT = "urgent"
 
-class RiskLevel(str, Enum):
+class RiskLevel(StrEnum):
     """Patient risk levels."""
     LOW = "Low"
     MEDIUM = "Medium"
     HIGH = "High"
 
-class Gender(str, Enum):
+class Gender(StrEnum):
     """Gender options."""
     MALE = "M"
     FEMALE = "F"
@@ -43,7 +91,7 @@ class Address(BaseModel):
     @field_validator('zip')
     def validate_zip_code(cls, v):
         # Validate US postal code (5 digits or 5+4 format)
-        if not re.match(r'^\d{5}(-\d{4})?$', v):
+        if not _ZIP_CODE_RE.match(v):
             raise ValueError('Invalid postal code format')
         return v
 
@@ -56,48 +104,41 @@ class Insurance(BaseModel):
     effective_date: str
     termination_date: Optional[str] = None
 
-class PatientBase(BaseModel):
-    """Base patient model with common fields."""
-    first_name: str = Field(..., min_length=1, max_length=100)
-    last_name: str = Field(..., min_length=1, max_length=100)
-    middle_name: Optional[str] = Field(None, max_length=100)
+class PatientDBBase(BaseModel):
+    """Patient fields as loaded from the database (validated on write)."""
+    first_name: str = _NAME
+    last_name: str = _NAME
+    middle_name: Optional[str] = _MIDDLE_NAME
     date_of_birth: str
-    email: EmailStr
+    email: str
     phone: str = Field(..., max_length=20)
     ssn: str = Field(..., max_length=11, description="Social Security Number")
     address: Address
     insurance: Insurance
     status: PatientStatus = Field(default=PatientStatus.INQUIRY)
     risk_level: RiskLevel = Field(default=RiskLevel.LOW)
+
+class PatientBase(PatientDBBase):
+    """Base patient model with common fields and input validation."""
+    email: EmailStr
     
     @field_validator('phone')
     def validate_phone(cls, v):
-        # Remove all non-numeric characters
-        phone_digits = re.sub(r'\D', '', v)
-        # Validate US phone number (10 digits)
-        if len(phone_digits) != 10:
+        # Validate US phone number (10 digits, ignoring formatting)
+        if sum(map(str.isdecimal, v)) != 10:
             raise ValueError('Phone number must be 10 digits')
         return v
     
     @field_validator('ssn')
     def validate_ssn(cls, v):
-        # Remove any hyphens
-        ssn_digits = re.sub(r'\D', '', v)
-        if len(ssn_digits) != 9:
+        # Count digits, ignoring hyphens
+        if sum(map(str.isdecimal, v)) != 9:
             raise ValueError('SSN must be 9 digits')
         return v
     
     @field_validator('date_of_birth')
     def validate_date_of_birth(cls, v):
-        try:
-            dob = datetime.strptime(v, "%Y-%m-%d")
-            if dob > datetime.now():
-                raise ValueError('Date of birth cannot be in the future')
-            return v
-        except ValueError as e:
-            if "time data" in str(e):
-                raise ValueError('Date of birth must be in YYYY-MM-DD format')
-            raise
+        return _validate_date_of_birth(v)
 
 class PatientCreate(PatientBase):
     """Model for creating a new patient."""
@@ -105,9 +146,9 @@ class PatientCreate(PatientBase):
 
 class PatientUpdate(BaseModel):
     """Model for updating patient information."""
-    first_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    last_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    middle_name: Optional[str] = Field(None, max_length=100)
+    first_name: Optional[str] = _OPTIONAL_NAME
+    last_name: Optional[str] = _OPTIONAL_NAME
+    middle_name: Optional[str] = _MIDDLE_NAME
     date_of_birth: Optional[str] = None
     email: Optional[EmailStr] = None
     phone: Optional[str] = Field(None, max_length=20)
@@ -120,10 +161,8 @@ class PatientUpdate(BaseModel):
     def validate_phone(cls, v):
         if v is None:
             return v
-        # Remove all non-numeric characters
-        phone_digits = re.sub(r'\D', '', v)
-        # Validate US phone number (10 digits)
-        if len(phone_digits) != 10:
+        # Validate US phone number (10 digits, ignoring formatting)
+        if sum(map(str.isdecimal, v)) != 10:
             raise ValueError('Phone number must be 10 digits')
         return v
     
@@ -131,17 +170,9 @@ class PatientUpdate(BaseModel):
     def validate_date_of_birth(cls, v):
         if v is None:
             return v
-        try:
-            dob = datetime.strptime(v, "%Y-%m-%d")
-            if dob > datetime.now():
-                raise ValueError('Date of birth cannot be in the future')
-            return v
-        except ValueError as e:
-            if "time data" in str(e):
-                raise ValueError('Date of birth must be in YYYY-MM-DD format')
-            raise
+        return _validate_date_of_birth(v)
 
-class PatientInDB(PatientBase):
+class PatientInDB(PatientDBBase):
     """Patient model as stored in database."""
     id: str
     created_at: datetime
@@ -150,7 +181,7 @@ class PatientInDB(PatientBase):
     deleted_at: Optional[datetime] = None
     deleted_by: Optional[str] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class PatientResponse(BaseModel):
     """Patient model for API responses (may exclude sensitive fields)."""
@@ -171,7 +202,7 @@ class PatientResponse(BaseModel):
     # Mask SSN for security
     ssn_last_four: Optional[str] = Field(None, description="Last 4 digits of SSN")
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = RESPONSE_CONFIG
     
     @classmethod
     def from_db(cls, patient: Dict[str, Any]) -> "PatientResponse":
@@ -180,7 +211,12 @@ class PatientResponse(BaseModel):
         ssn = patient.get("ssn", "")
         ssn_last_four = ssn[-4:] if ssn and len(ssn) >= 4 else None
         
-        return cls(
+        # Rows come from our own database and were validated on write, so
+        # skip re-validation (notably EmailStr and the nested models) and only
+        # coerce the enum and datetime fields the serializer expects
+        address = patient["address"]
+        insurance = patient["insurance"]
+        return cls.model_construct(
             id=patient["id"],
             first_name=patient["first_name"],
             last_name=patient["last_name"],
@@ -188,12 +224,12 @@ class PatientResponse(BaseModel):
             date_of_birth=patient["date_of_birth"],
             email=patient["email"],
             phone=patient["phone"],
-            address=patient["address"],
-            insurance=patient["insurance"],
-            status=patient["status"],
-            risk_level=patient["risk_level"],
-            created_at=patient["created_at"],
-            updated_at=patient["updated_at"],
+            address=Address.model_construct(**address) if isinstance(address, dict) else address,
+            insurance=Insurance.model_construct(**insurance) if isinstance(insurance, dict) else insurance,
+            status=PatientStatus(patient["status"]),
+            risk_level=RiskLevel(patient["risk_level"]),
+            created_at=_as_datetime(patient["created_at"]),
+            updated_at=_as_datetime(patient["updated_at"]),
             ssn_last_four=ssn_last_four
         )
 
@@ -207,6 +243,10 @@ class PatientListResponse(BaseModel):
     has_next: bool
     has_prev: bool
 
+    def to_json(self) -> bytes:
+        """Serialize straight to JSON bytes in one pydantic-core pass."""
+        return to_json(self)
+
 class PatientSearchFilters(BaseModel):
     """Parameters for patient search."""
     search: Optional[str] = Field(None, description="Search in name, email, member ID")
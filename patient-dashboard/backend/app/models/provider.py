@@ -2,12 +2,51 @@
 Provider model for healthcare providers management.
 """
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from enum import Enum
-from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
-import re
+from functools import lru_cache
+from typing import Annotated, Optional, Dict, Any, List
+from enum import StrEnum
+from pydantic import AfterValidator, BaseModel, Field, EmailStr
 
-class ProviderRole(str, Enum):
+from ._config import DB_CONFIG
+from ._validators import PhoneStr
+
+
+@lru_cache(maxsize=4096)
+def _parse_hire_date(v: str) -> datetime:
+    """Parse a YYYY-MM-DD hire date; cached since imports repeat the same dates."""
+    # Fast path for the canonical fixed-width format
+    if (
+        len(v) == 10 and v[4] == '-' and v[7] == '-' and v.isascii()
+        and v[:4].isdigit() and v[5:7].isdigit() and v[8:].isdigit()
+    ):
+        return datetime(int(v[:4]), int(v[5:7]), int(v[8:]))
+    return datetime.strptime(v, "%Y-%m-%d")
+
+
+def _validate_hire_date(v: str) -> str:
+    """Check a YYYY-MM-DD hire date is a real date and not in the future."""
+    try:
+        hire_date = _parse_hire_date(v)
+    except ValueError:
+        # Malformed text and impossible dates alike are not valid YYYY-MM-DD
+        raise ValueError('Hire date must be in YYYY-MM-DD format')
+    
+    if hire_date > datetime.now():
+        raise ValueError('Hire date cannot be in the future')
+    return v
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_z(v: str) -> datetime:
+    """Parse a stored ISO timestamp; cached since batch inserts share timestamps."""
+    return datetime.fromisoformat(v[:-1] + '+00:00' if v.endswith('Z') else v)
+
+
+# Validated hire date shared by the create and update models
+HireDateStr = Annotated[str, AfterValidator(_validate_hire_date)]
+
+
+class ProviderRole(StrEnum):
     """Provider role types."""
     DOCTOR = "doctor"
     NURSE = "nurse"
@@ -15,7 +54,7 @@ class ProviderRole(str, Enum):
     RECEPTIONIST = "receptionist"
     SPECIALIST = "specialist"
 
-class ProviderStatus(str, Enum):
+class ProviderStatus(StrEnum):
     """Provider status types."""
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -27,34 +66,13 @@ class ProviderBase(BaseModel):
     last_name: str = Field(..., min_length=1, max_length=100)
     middle_name: Optional[str] = Field(None, max_length=100)
     email: EmailStr
-    phone: str = Field(..., max_length=20)
+    phone: PhoneStr = Field(..., max_length=20)
     role: ProviderRole
     specialization: Optional[str] = Field(None, max_length=100)
     license_number: str = Field(..., max_length=50)
     department: Optional[str] = Field(None, max_length=100)
     status: ProviderStatus = Field(default=ProviderStatus.ACTIVE)
-    hire_date: str
-    
-    @field_validator('phone')
-    def validate_phone(cls, v):
-        # Remove all non-numeric characters
-        phone_digits = re.sub(r'\D', '', v)
-        # Validate US phone number (10 digits)
-        if len(phone_digits) != 10:
-            raise ValueError('Phone number must be 10 digits')
-        return v
-    
-    @field_validator('hire_date')
-    def validate_hire_date(cls, v):
-        try:
-            hire_date = datetime.strptime(v, "%Y-%m-%d")
-            if hire_date > datetime.now():
-                raise ValueError('Hire date cannot be in the future')
-            return v
-        except ValueError as e:
-            if "time data" in str(e):
-                raise ValueError('Hire date must be in YYYY-MM-DD format')
-            raise
+    hire_date: HireDateStr
 
 class ProviderCreate(ProviderBase):
     """Model for creating a new provider."""
@@ -66,39 +84,14 @@ class ProviderUpdate(BaseModel):
     last_name: Optional[str] = Field(None, min_length=1, max_length=100)
     middle_name: Optional[str] = Field(None, max_length=100)
     email: Optional[EmailStr] = None
-    phone: Optional[str] = Field(None, max_length=20)
+    phone: Optional[PhoneStr] = Field(None, max_length=20)
     role: Optional[ProviderRole] = None
     specialization: Optional[str] = Field(None, max_length=100)
     license_number: Optional[str] = Field(None, max_length=50)
     department: Optional[str] = Field(None, max_length=100)
     status: Optional[ProviderStatus] = None
-    hire_date: Optional[str] = None
+    hire_date: Optional[HireDateStr] = None
     assigned_patients: Optional[List[str]] = None
-    
-    @field_validator('phone')
-    def validate_phone(cls, v):
-        if v is None:
-            return v
-        # Remove all non-numeric characters
-        phone_digits = re.sub(r'\D', '', v)
-        # Validate US phone number (10 digits)
-        if len(phone_digits) != 10:
-            raise ValueError('Phone number must be 10 digits')
-        return v
-    
-    @field_validator('hire_date')
-    def validate_hire_date(cls, v):
-        if v is None:
-            return v
-        try:
-            hire_date = datetime.strptime(v, "%Y-%m-%d")
-            if hire_date > datetime.now():
-                raise ValueError('Hire date cannot be in the future')
-            return v
-        except ValueError as e:
-            if "time data" in str(e):
-                raise ValueError('Hire date must be in YYYY-MM-DD format')
-            raise
 
 class ProviderInDB(ProviderBase):
     """Provider model as stored in database."""
@@ -110,7 +103,7 @@ class ProviderInDB(ProviderBase):
     deleted_at: Optional[datetime] = None
     deleted_by: Optional[str] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class ProviderResponse(BaseModel):
     """Provider model for API responses."""
@@ -130,7 +123,7 @@ class ProviderResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
     
     @classmethod
     def from_db(cls, provider: Dict[str, Any]) -> "ProviderResponse":
@@ -145,24 +138,26 @@ class ProviderResponse(BaseModel):
         # Handle datetime strings
         created_at = provider["created_at"]
         if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+            created_at = _parse_iso_z(created_at)
         
         updated_at = provider["updated_at"]
         if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+            updated_at = _parse_iso_z(updated_at)
             
-        return cls(
+        # Rows come from our own database and were validated on write, so
+        # skip re-validation and only coerce the enum fields
+        return cls.model_construct(
             id=provider_id,
             first_name=provider["first_name"],
             last_name=provider["last_name"],
             middle_name=provider.get("middle_name"),
             email=provider["email"],
             phone=provider["phone"],
-            role=provider["role"],
+            role=ProviderRole(provider["role"]),
             specialization=provider.get("specialization"),
             license_number=provider["license_number"],
             department=provider.get("department"),
-            status=provider["status"],
+            status=ProviderStatus(provider["status"]),
             hire_date=provider["hire_date"],
             assigned_patients=provider.get("assigned_patients", []),
             created_at=created_at,
@@ -2,11 +2,60 @@
 User model with role-based access control.
 """
 from datetime import datetime
-from typing import Optional
-from enum import Enum
-from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
+from typing import Annotated, Optional
+from enum import StrEnum
+from pydantic import AfterValidator, BaseModel, Field, EmailStr
 
-class UserRole(str, Enum):
+from ._config import DB_CONFIG
+
+# Shared field constraints, built once and reused across the user models
+_NAME = Field(..., min_length=1, max_length=100)
+_OPTIONAL_NAME = Field(None, min_length=1, max_length=100)
+_PASSWORD = Field(..., min_length=8, max_length=100)
+
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*()_+-=[]{}|;:,.<>?')
+
+# Character classes a password needs, as bits, with the message for each
+_PW_UPPER, _PW_LOWER, _PW_DIGIT, _PW_SPECIAL = 1, 2, 4, 8
+_PW_ALL = _PW_UPPER | _PW_LOWER | _PW_DIGIT | _PW_SPECIAL
+_PW_MESSAGES = (
+    (_PW_UPPER, 'Password must contain at least one uppercase letter'),
+    (_PW_LOWER, 'Password must contain at least one lowercase letter'),
+    (_PW_DIGIT, 'Password must contain at least one digit'),
+    (_PW_SPECIAL, 'Password must contain at least one special character'),
+)
+
+
+def _validate_password_strength(v: str) -> str:
+    """Check length and character classes in a single pass over the password."""
+    if len(v) < 8:
+        raise ValueError('Password must be at least 8 characters long')
+    seen = 0
+    for c in v:
+        if c.isupper():
+            seen |= _PW_UPPER
+        elif c.islower():
+            seen |= _PW_LOWER
+        elif c.isdigit():
+            seen |= _PW_DIGIT
+        elif c in _PASSWORD_SPECIALS:
+            seen |= _PW_SPECIAL
+        else:
+            continue
+        if seen == _PW_ALL:
+            return v
+    # Report the first missing class, in the original check order
+    for bit, message in _PW_MESSAGES:
+        if not seen & bit:
+            raise ValueError(message)
+    return v
+
+
+# Password with strength checks, shared by every model that sets one
+StrongPassword = Annotated[str, AfterValidator(_validate_password_strength)]
+
+
+class UserRole(StrEnum):
     """User roles for access control."""
     PROVIDER = "PROVIDER"
     ADMIN = "ADMIN"
@@ -19,35 +68,20 @@ class UserRole(str, Enum):
 class UserBase(BaseModel):
     """Base user model."""
     email: EmailStr
-    first_name: str = Field(..., min_length=1, max_length=100)
-    last_name: str = Field(..., min_length=1, max_length=100)
+    first_name: str = _NAME
+    last_name: str = _NAME
     role: UserRole
     is_active: bool = True
     clerk_user_id: Optional[str] = None
 
 class UserCreate(UserBase):
     """Model for creating a new user."""
-    password: str = Field(..., min_length=8, max_length=100)
-    
-    @field_validator('password')
-    def validate_password_strength(cls, v):
-        """Ensure password meets security requirements."""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(c.isupper() for c in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(c.islower() for c in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        if not any(c.isdigit() for c in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(c in '!@#$%^&*()_+-=[]{}|;:,.<>?' for c in v):
-            raise ValueError('Password must contain at least one special character')
-        return v
+    password: StrongPassword = _PASSWORD
 
 class UserUpdate(BaseModel):
     """Model for updating user information."""
-    first_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    last_name: Optional[str] = Field(None, min_length=1, max_length=100)
+    first_name: Optional[str] = _OPTIONAL_NAME
+    last_name: Optional[str] = _OPTIONAL_NAME
     role: Optional[UserRole] = None
     is_active: Optional[bool] = None
 
@@ -60,7 +94,7 @@ class UserInDB(UserBase):
     updated_at: datetime
     last_login: Optional[datetime] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class User(BaseModel):
     """User model for authenticated users."""
@@ -71,7 +105,7 @@ class User(BaseModel):
     role: UserRole
     is_active: bool
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class UserResponse(BaseModel):
     """User model for API responses (excludes password)."""
@@ -86,7 +120,7 @@ class UserResponse(BaseModel):
     updated_at: datetime
     last_login: Optional[datetime] = None
     
-    model_config = ConfigDict(from_attributes=True)
+    model_config = DB_CONFIG
 
 class UserListResponse(BaseModel):
     """Response model for user list endpoint."""
@@ -104,9 +138,7 @@ class UserLogin(BaseModel):
 class UserPasswordChange(BaseModel):
     """Model for password change request."""
     current_password: str
-    new_password: str = Field(..., min_length=8, max_length=100)
-    
-    _validate_password = field_validator('new_password')(UserCreate.validate_password_strength)
+    new_password: StrongPassword = _PASSWORD
 
 class UserPasswordReset(BaseModel):
     """Model for password reset request."""
@@ -115,9 +147,7 @@ class UserPasswordReset(BaseModel):
 class UserPasswordResetConfirm(BaseModel):
     """Model for confirming password reset."""
     token: str
-    new_password: str = Field(..., min_length=8, max_length=100)
-    
-    _validate_password = field_validator('new_password')(UserCreate.validate_password_strength)
+    new_password: StrongPassword = _PASSWORD
 
 class TokenResponse(BaseModel):
     """JWT token response."""
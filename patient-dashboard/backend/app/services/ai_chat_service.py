@@ -2,30 +2,33 @@
 AI Chat Service for context-aware healthcare assistance.
 Provides HIPAA-compliant chat functionality with context management.
 """
+import asyncio
 import os
-import json
-from typing import List, Dict, Any, Optional
+import uuid
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import logging
 import logfire
 # Production-ready: anthropic package should be installed via requirements.txt
 try:
-    from anthropic import Anthropic
+    from anthropic import AsyncAnthropic
 except ImportError:
     # Fallback implementation if anthropic is not installed
-    class Anthropic:
+    class AsyncAnthropic:
         def __init__(self, api_key=None):
             self.api_key = api_key
             self.messages = MockMessages()
             logfire.warning("Anthropic package not installed, using mock implementation")
 
     class MockMessages:
-        def create(self, **kwargs):
+        async def create(self, **kwargs):
             return type('obj', (object,), {
             'content': [type('obj', (object,), {'text': 'Mock AI response'})]
         })
-import hashlib
 
+from app.cache.local_cache import LocalResponseCache
 from app.database.connection import get_database
 from app.models.user import UserResponse
 from app.config.settings import get_settings
@@ -49,6 +52,118 @@ def safe_logfire_error(message, **kwargs):
         pass
 
 
+# Chat cache keys hash only this many leading characters of the message
+CACHE_KEY_PREFIX_LENGTH = 64
+
+# (message length, message prefix, user role, page)
+CacheKey = Tuple[int, str, Any, Any]
+
+# Built once and read-only; the chat context for every message is assembled
+# from these. UserRole is a StrEnum, so enum members look up like strings.
+_ROLE_PERMISSIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    'ADMIN': ('view_all_patients', 'edit_patients', 'view_analytics', 'manage_users'),
+    'PROVIDER': ('view_assigned_patients', 'edit_assigned_patients', 'view_limited_analytics'),
+    'AUDIT': ('view_all_patients', 'view_audit_logs', 'view_analytics'),
+})
+
+# Keyed by the first segment of the page path
+_PAGE_CONTEXTS: Mapping[str, Dict[str, Tuple[str, ...]]] = MappingProxyType({
+    'patients': {
+        'available_actions': (
+            'search_patients',
+            'filter_by_status',
+            'view_patient_details',
+            'edit_patient_info',
+        ),
+        'help_topics': (
+            'patient_status_workflow',
+            'risk_levels',
+            'insurance_verification',
+        ),
+    },
+    'dashboard': {
+        'available_actions': (
+            'view_metrics',
+            'analyze_trends',
+            'export_reports',
+        ),
+        'help_topics': (
+            'understanding_metrics',
+            'patient_distribution',
+            'performance_indicators',
+        ),
+    },
+})
+
+
+# Suggested prompts by (page, role), at most four each
+_SUGGESTED_PROMPTS: Mapping[Tuple[str, str], Tuple[str, ...]] = MappingProxyType({
+    ('/dashboard', 'ADMIN'): (
+        "What's our patient churn rate this month?",
+        "Show me the patient distribution by risk level",
+        "How can I improve patient onboarding metrics?",
+        "What alerts require my attention today?",
+    ),
+    ('/dashboard', 'PROVIDER'): (
+        "Show me my high-risk patients",
+        "How do I update a patient's status?",
+        "What's the workflow for patient onboarding?",
+        "Help me find patients with upcoming appointments",
+    ),
+    ('/patients', 'ADMIN'): (
+        "How do I bulk update patient statuses?",
+        "Show me all patients in onboarding status",
+        "What's the best way to search for patients?",
+        "How can I export patient data?",
+    ),
+    ('/patients', 'PROVIDER'): (
+        "How do I add a new patient?",
+        "What information is required for patient intake?",
+        "How do I document a patient interaction?",
+        "Show me patients I haven't contacted recently",
+    ),
+})
+
+_DEFAULT_SUGGESTED_PROMPTS: Tuple[str, ...] = (
+    "How do I navigate this system?",
+    "What are my permissions?",
+    "Show me keyboard shortcuts",
+    "How do I report an issue?",
+)
+
+_SYSTEM_PROMPT_HEAD = """You are a helpful AI assistant for a HIPAA-compliant healthcare patient management system.
+
+Current user: """
+
+
+@lru_cache(maxsize=256)
+def _system_prompt_parts(
+    role: str,
+    page: str,
+    permissions: Tuple[str, ...],
+    actions: Tuple[str, ...],
+    topics: Tuple[str, ...]
+) -> Tuple[str, str]:
+    """System prompt text either side of the user's name, shared per role and page."""
+    # Split around the name rather than formatting a template, since page
+    # paths come from the client and may contain braces
+    return _SYSTEM_PROMPT_HEAD, f""" (Role: {role})
+User permissions: {', '.join(permissions)}
+Current page: {page}
+Available actions on this page: {', '.join(actions)}
+
+Guidelines:
+1. Always maintain HIPAA compliance - never expose real patient PHI in examples
+2. Provide helpful guidance based on the user's role and permissions
+3. Suggest relevant actions based on the current page context
+4. Use professional healthcare terminology appropriately
+5. If asked about patients, use example data only (e.g., "Patient John Doe")
+6. Focus on workflow efficiency and best practices
+7. Be concise but thorough in explanations
+
+Help topics for this page: {', '.join(topics)}"""
+
+
 class AIChatService:
     """Service for AI-powered chat assistance in healthcare context."""
     
@@ -57,14 +172,18 @@ class AIChatService:
         self.anthropic_api_key = settings.ANTHROPIC_API_KEY
         self.client = None
         self.cache_ttl = 3600  # 1 hour cache for common queries
-        self._response_cache = {}
+        # Bounded so sustained traffic cannot grow it without limit
+        self._response_cache = LocalResponseCache(maxsize=10_000)
+        # History writes run in the background; hold references until done
+        self._pending_writes: Set[asyncio.Task] = set()
         self._init_client()
     
     def _init_client(self):
         """Initialize Anthropic client if API key is available."""
         if self.anthropic_api_key and self.anthropic_api_key != "your-anthropic-api-key-here":
             try:
-                self.client = Anthropic(api_key=self.anthropic_api_key)
+                # Async client so the API round-trip does not block the event loop
+                self.client = AsyncAnthropic(api_key=self.anthropic_api_key)
                 safe_logfire_info("Anthropic client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize Anthropic client: {str(e)}")
@@ -74,29 +193,26 @@ class AIChatService:
         """Get database connection."""
         return await get_database()
     
-    def _generate_cache_key(self, message: str, context: Dict[str, Any]) -> str:
+    def _generate_cache_key(self, message: str, context: Dict[str, Any]) -> CacheKey:
         """Generate cache key for response caching."""
-        cache_data = f"{message}:{json.dumps(context, sort_keys=True)}"
-        return hashlib.md5(cache_data.encode()).hexdigest()
+        # The cache is an in-process dict, so a plain tuple is a valid key.
+        # Only a bounded prefix of the message is hashed; hits are confirmed
+        # against the full message in _get_cached_response.
+        return (len(message), message[:CACHE_KEY_PREFIX_LENGTH], context.get('user_role'), context.get('page'))
     
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached response is still valid."""
-        if cache_key not in self._response_cache:
-            return False
-        
-        cached_item = self._response_cache[cache_key]
-        age = (datetime.utcnow() - cached_item['timestamp']).total_seconds()
-        return age < self.cache_ttl
+    def _get_cached_response(self, cache_key: CacheKey, message: str) -> Optional[str]:
+        """Return the cached response for this exact message, if still valid."""
+        cached = self._response_cache.get(cache_key)
+        if cached is None or cached[0] != message:
+            return None
+        return cached[1]
     
-    def _cache_response(self, cache_key: str, response: str) -> str:
+    def _cache_response(self, cache_key: CacheKey, message: str, response: str) -> str:
         """Cache AI response."""
-        self._response_cache[cache_key] = {
-            'response': response,
-            'timestamp': datetime.utcnow()
-        }
+        self._response_cache.set(cache_key, (message, response), self.cache_ttl)
         return response
     
-    async def _get_user_context(self, user: UserResponse) -> Dict[str, Any]:
+    def _get_user_context(self, user: UserResponse) -> Dict[str, Any]:
         """Get user-specific context for AI responses."""
         return {
             'user_role': user.role,
@@ -104,67 +220,28 @@ class AIChatService:
             'permissions': self._get_role_permissions(user.role)
         }
     
-    def _get_role_permissions(self, role: str) -> List[str]:
+    def _get_role_permissions(self, role: str) -> Tuple[str, ...]:
         """Get permissions based on user role."""
-        permissions_map = {
-            'ADMIN': ['view_all_patients', 'edit_patients', 'view_analytics', 'manage_users'],
-            'PROVIDER': ['view_assigned_patients', 'edit_assigned_patients', 'view_limited_analytics'],
-            'AUDIT': ['view_all_patients', 'view_audit_logs', 'view_analytics']
-        }
-        return permissions_map.get(role, [])
+        return _ROLE_PERMISSIONS.get(role, ())
     
-    async def _get_page_context(self, page_path: str) -> Dict[str, Any]:
+    def _get_page_context(self, page_path: str) -> Dict[str, Any]:
         """Get context based on current page/route."""
-        context = {
-            'page': page_path,
-            'available_actions': []
-        }
-        
-        if '/patients' in page_path:
-            context['available_actions'] = [
-                'search_patients',
-                'filter_by_status',
-                'view_patient_details',
-                'edit_patient_info'
-            ]
-            context['help_topics'] = [
-                'patient_status_workflow',
-                'risk_levels',
-                'insurance_verification'
-            ]
-        elif '/dashboard' in page_path:
-            context['available_actions'] = [
-                'view_metrics',
-                'analyze_trends',
-                'export_reports'
-            ]
-            context['help_topics'] = [
-                'understanding_metrics',
-                'patient_distribution',
-                'performance_indicators'
-            ]
-        
-        return context
+        segment = page_path.split('/', 2)[1] if page_path.startswith('/') else ''
+        page_context = _PAGE_CONTEXTS.get(segment)
+        if page_context is None:
+            return {'page': page_path, 'available_actions': ()}
+        return {'page': page_path, **page_context}
     
     def _build_system_prompt(self, user_context: Dict[str, Any], page_context: Dict[str, Any]) -> str:
         """Build system prompt for AI with healthcare and HIPAA context."""
-        return f"""You are a helpful AI assistant for a HIPAA-compliant healthcare patient management system.
-
-Current user: {user_context['user_name']} (Role: {user_context['user_role']})
-User permissions: {', '.join(user_context['permissions'])}
-Current page: {page_context['page']}
-Available actions on this page: {', '.join(page_context['available_actions'])}
-
-Guidelines:
-1. Always maintain HIPAA compliance - never expose real patient PHI in examples
-2. Provide helpful guidance based on the user's role and permissions
-3. Suggest relevant actions based on the current page context
-4. Use professional healthcare terminology appropriately
-5. If asked about patients, use example data only (e.g., "Patient John Doe")
-6. Focus on workflow efficiency and best practices
-7. Be concise but thorough in explanations
-
-Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
+        head, tail = _system_prompt_parts(
+            user_context['user_role'],
+            page_context['page'],
+            tuple(user_context['permissions']),
+            tuple(page_context['available_actions']),
+            tuple(page_context.get('help_topics', ())),
+        )
+        return head + user_context['user_name'] + tail
     
     async def process_message(
         self,
@@ -174,10 +251,11 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
         conversation_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Process a chat message and return AI response."""
+        conversation_id = conversation_id or self._generate_conversation_id()
         try:
             # Get context
-            user_context = await self._get_user_context(user)
-            page_ctx = await self._get_page_context(page_context)
+            user_context = self._get_user_context(user)
+            page_ctx = self._get_page_context(page_context)
             
             # Check cache
             cache_key = self._generate_cache_key(message, {
@@ -185,12 +263,13 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
                 'page': page_context
             })
             
-            if self._is_cache_valid(cache_key):
+            cached_response = self._get_cached_response(cache_key, message)
+            if cached_response is not None:
                 safe_logfire_info("Returning cached chat response", cache_hit=True)
                 return {
-                    'response': self._response_cache[cache_key]['response'],
+                    'response': cached_response,
                     'cached': True,
-                    'conversation_id': conversation_id or self._generate_conversation_id()
+                    'conversation_id': conversation_id
                 }
             
             # Generate response
@@ -198,7 +277,7 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
                 return {
                     'response': "AI chat is currently unavailable. Please configure the Anthropic API key.",
                     'error': True,
-                    'conversation_id': conversation_id or self._generate_conversation_id()
+                    'conversation_id': conversation_id
                 }
             
             system_prompt = self._build_system_prompt(user_context, page_ctx)
@@ -209,7 +288,7 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
                             message_length=len(message))
             
             # Call Anthropic API
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model="claude-3-haiku-20240307",  # Fast, cost-effective model
                 max_tokens=500,
                 temperature=0.7,
@@ -225,16 +304,19 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
             ai_response = response.content[0].text
             
             # Cache response
-            self._cache_response(cache_key, ai_response)
+            self._cache_response(cache_key, message, ai_response)
             
-            # Store in database for history
-            await self._store_chat_message(
+            # Store in database for history without holding up the reply;
+            # _store_chat_message handles its own errors
+            task = asyncio.create_task(self._store_chat_message(
                 user_id=user.id,
-                conversation_id=conversation_id or self._generate_conversation_id(),
+                conversation_id=conversation_id,
                 message=message,
                 response=ai_response,
                 page_context=page_context
-            )
+            ))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
             
             safe_logfire_info("AI chat response generated successfully", 
                             response_length=len(ai_response))
@@ -242,7 +324,7 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
             return {
                 'response': ai_response,
                 'cached': False,
-                'conversation_id': conversation_id or self._generate_conversation_id()
+                'conversation_id': conversation_id
             }
             
         except Exception as e:
@@ -252,13 +334,12 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
             return {
                 'response': "I apologize, but I'm having trouble processing your request. Please try again or contact support if the issue persists.",
                 'error': True,
-                'conversation_id': conversation_id or self._generate_conversation_id()
+                'conversation_id': conversation_id
             }
     
     def _generate_conversation_id(self) -> str:
         """Generate unique conversation ID."""
-        import uuid
-        return str(uuid.uuid4())
+        return uuid.uuid4().hex
     
     async def _store_chat_message(
         self,
@@ -301,6 +382,11 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
             logger.error(f"Error storing chat message: {str(e)}")
             safe_logfire_error("Failed to store chat message", error=str(e))
     
+    async def drain(self):
+        """Wait for background history writes to finish, e.g. on shutdown."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes)
+    
     async def get_conversation_history(
         self,
         user_id: str,
@@ -404,45 +490,4 @@ Help topics for this page: {', '.join(page_context.get('help_topics', []))}"""
     
     def get_suggested_prompts(self, page_context: str, user_role: str) -> List[str]:
         """Get suggested prompts based on context."""
-        suggestions = {
-            '/dashboard': {
-                'ADMIN': [
-                    "What's our patient churn rate this month?",
-                    "Show me the patient distribution by risk level",
-                    "How can I improve patient onboarding metrics?",
-                    "What alerts require my attention today?"
-                ],
-                'PROVIDER': [
-                    "Show me my high-risk patients",
-                    "How do I update a patient's status?",
-                    "What's the workflow for patient onboarding?",
-                    "Help me find patients with upcoming appointments"
-                ]
-            },
-            '/patients': {
-                'ADMIN': [
-                    "How do I bulk update patient statuses?",
-                    "Show me all patients in onboarding status",
-                    "What's the best way to search for patients?",
-                    "How can I export patient data?"
-                ],
-                'PROVIDER': [
-                    "How do I add a new patient?",
-                    "What information is required for patient intake?",
-                    "How do I document a patient interaction?",
-                    "Show me patients I haven't contacted recently"
-                ]
-            }
-        }
-        
-        default_suggestions = [
-            "How do I navigate this system?",
-            "What are my permissions?",
-            "Show me keyboard shortcuts",
-            "How do I report an issue?"
-        ]
-        
-        page_suggestions = suggestions.get(page_context, {})
-        role_suggestions = page_suggestions.get(user_role, default_suggestions)
-        
-        return role_suggestions[:4]  # Return top 4 suggestions
\ No newline at end of file
+        return list(_SUGGESTED_PROMPTS.get((page_context, user_role), _DEFAULT_SUGGESTED_PROMPTS))
\ No newline at end of file
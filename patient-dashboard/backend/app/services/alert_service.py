@@ -1,22 +1,117 @@
 """
 Alert service for managing patient alerts and notifications
 """
+import asyncio
+import time
 import logfire
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from app.models.alert import (
-    AlertCreate, AlertUpdate, AlertResponse, AlertInDB,
-    AlertType, AlertSeverity, AlertStatus
+    AlertCreate, AlertUpdate, AlertResponse, AlertInDB, AlertListResponseSoA,
+    AlertType, AlertSeverity, AlertStatus, NOTIFY_SEVERITIES
 )
 from app.database.connection import get_database
 from app.core.exceptions import ResourceNotFoundException
 
+# Every severity appears in severity counts, in this order, even with no alerts
+_ZERO_SEVERITY_COUNTS = {"critical": 0, "high": 0, "medium": 0, "low": 0}
+
+# Patient alert queries for each filter combination, indexed by
+# (status given) * 2 + (severity given)
+_PATIENT_ALERTS_QUERIES = tuple(
+    "SELECT * FROM alert WHERE patient_id = $patient_id"
+    + (" AND status = $status" if by_status else "")
+    + (" AND severity = $severity" if by_severity else "")
+    + " ORDER BY created_at DESC LIMIT $limit"
+    for by_status in (False, True)
+    for by_severity in (False, True)
+)
+
+# Dashboard overview queries, built from shared pieces so the full overview
+# and the streamed overview always count alerts the same way
+_ACTIVE_COUNT_LETS = """
+    LET $total = (
+        SELECT count() AS count FROM alert
+        WHERE status = 'active'
+        GROUP ALL
+    );
+    LET $by_severity_type = (
+        SELECT severity, type, count() AS count FROM alert
+        WHERE status = 'active'
+        GROUP BY severity, type
+    );
+"""
+
+_RECENT_ACTIVE_ALERTS = """
+    SELECT * FROM alert
+    WHERE status = 'active'
+    ORDER BY created_at DESC
+    LIMIT 10
+"""
+
+_OVERVIEW_QUERY = f"""
+    BEGIN TRANSACTION;
+    {_ACTIVE_COUNT_LETS}
+    LET $recent = ({_RECENT_ACTIVE_ALERTS});
+    
+    RETURN {{
+        total: $total,
+        by_severity_type: $by_severity_type,
+        recent: $recent
+    }};
+    
+    COMMIT TRANSACTION;
+"""
+
+_OVERVIEW_COUNTS_QUERY = f"""
+    BEGIN TRANSACTION;
+    {_ACTIVE_COUNT_LETS}
+    RETURN {{
+        total: $total,
+        by_severity_type: $by_severity_type
+    }};
+    
+    COMMIT TRANSACTION;
+"""
+
+# Active counts per (severity, type, status), maintained by the database on
+# every alert write. Defining the view also computes it from existing alerts,
+# so IF NOT EXISTS keeps restarts from recomputing it.
+_DEFINE_ALERT_COUNTS = """
+    DEFINE TABLE IF NOT EXISTS alert_counts AS
+    SELECT severity, type, status, count() AS count
+    FROM alert
+    GROUP BY severity, type, status
+"""
+
 class AlertService:
     """Service for managing alerts."""
     
+    # Seconds a dashboard overview is reused between alert writes
+    OVERVIEW_TTL = 5.0
+    # Alerts resolved per UPDATE when auto-resolving old alerts
+    AUTO_RESOLVE_BATCH_SIZE = 1000
+    # Alerts written per INSERT by create_alerts
+    CREATE_BATCH_SIZE = 50
+    
     def __init__(self):
         self.notification_service = None  # Will be initialized if needed
         self.escalation_service = None  # Will be initialized if needed
+        # Cached overview with its monotonic deadline; writes bump the
+        # generation so an overview computed before a write is not stored
+        self._overview: Optional[Dict[str, Any]] = None
+        self._overview_expires_at = 0.0
+        self._overview_generation = 0
+    
+    async def initialize(self):
+        """Define the alert_counts view if this database does not have it yet."""
+        db = await get_database()
+        await db.execute(_DEFINE_ALERT_COUNTS)
+    
+    def _invalidate_overview(self):
+        """Drop the cached overview after an alert write."""
+        self._overview = None
+        self._overview_generation += 1
         
     async def create_alert(self, alert_data: AlertCreate) -> AlertResponse:
         """Create a new alert."""
@@ -33,25 +128,53 @@ class AlertService:
                 "CREATE alert CONTENT $alert",
                 {"alert": alert_dict}
             )
+            self._invalidate_overview()
             
             if not result:
                 raise Exception("Failed to create alert")
             
-            alert = AlertResponse(**result[0])
-            
-            # Send notification for high/critical alerts
-            if alert.severity in [AlertSeverity.HIGH, AlertSeverity.CRITICAL]:
-                if self.notification_service:
-                    await self.notification_service.send_alert_notification(alert)
-                    
-            # Escalate critical alerts
-            if alert.severity == AlertSeverity.CRITICAL:
-                if self.escalation_service:
-                    await self.escalation_service.escalate_critical_alert(alert)
+            alert = AlertResponse.from_db(result[0])
+            await self._dispatch_alert(alert)
             
             logfire.info("Alert created", alert_id=alert.id)
             return alert
     
+    async def create_alerts(self, alerts: List[AlertCreate]) -> List[AlertResponse]:
+        """Create many alerts with one INSERT per batch."""
+        if not alerts:
+            return []
+        
+        with logfire.span("create_alerts", count=len(alerts)):
+            db = await get_database()
+            now = datetime.utcnow()
+            
+            created: List[AlertResponse] = []
+            for start in range(0, len(alerts), self.CREATE_BATCH_SIZE):
+                rows = [
+                    {**alert.model_dump(), 'created_at': now, 'updated_at': now, 'status': AlertStatus.ACTIVE}
+                    for alert in alerts[start:start + self.CREATE_BATCH_SIZE]
+                ]
+                result = await db.execute("INSERT INTO alert $alerts", {"alerts": rows})
+                if not result:
+                    raise Exception("Failed to create alerts")
+                created.extend(AlertResponse.from_db(row) for row in result)
+            self._invalidate_overview()
+            
+            await asyncio.gather(*(self._dispatch_alert(alert) for alert in created))
+            
+            logfire.info("Alerts created", count=len(created))
+            return created
+    
+    async def _dispatch_alert(self, alert: AlertResponse):
+        """Notify on high/critical alerts and escalate critical ones, concurrently."""
+        side_effects = []
+        if alert.severity in NOTIFY_SEVERITIES and self.notification_service:
+            side_effects.append(self.notification_service.send_alert_notification(alert))
+        if alert.severity == AlertSeverity.CRITICAL and self.escalation_service:
+            side_effects.append(self.escalation_service.escalate_critical_alert(alert))
+        if side_effects:
+            await asyncio.gather(*side_effects)
+    
     async def get_alert(self, alert_id: str) -> Optional[AlertResponse]:
         """Get alert by ID."""
         db = await get_database()
@@ -64,7 +187,7 @@ class AlertService:
         if not result or not result[0]:
             return None
             
-        return AlertResponse(**result[0])
+        return AlertResponse.from_db(result[0])
     
     async def get_alerts_for_patient(
         self, 
@@ -75,32 +198,45 @@ class AlertService:
     ) -> List[AlertResponse]:
         """Get alerts for a specific patient."""
         db = await get_database()
+        result = await db.execute(*self._patient_alerts_query(patient_id, status, severity, limit))
         
-        query = "SELECT * FROM alert WHERE patient_id = $patient_id"
-        params = {"patient_id": patient_id}
+        return [AlertResponse.from_db(alert) for alert in result] if result else []
+    
+    async def get_alert_columns_for_patient(
+        self,
+        patient_id: str,
+        status: Optional[AlertStatus] = None,
+        severity: Optional[AlertSeverity] = None,
+        limit: int = 50
+    ) -> AlertListResponseSoA:
+        """Get alerts for a patient as columns, for list rendering."""
+        db = await get_database()
+        result = await db.execute(*self._patient_alerts_query(patient_id, status, severity, limit))
         
-        if status:
-            query += " AND status = $status"
+        return AlertListResponseSoA.from_rows(result or [])
+    
+    @staticmethod
+    def _patient_alerts_query(
+        patient_id: str,
+        status: Optional[AlertStatus],
+        severity: Optional[AlertSeverity],
+        limit: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Pick the prebuilt patient alert query for the filters and bind its parameters."""
+        query = _PATIENT_ALERTS_QUERIES[(status is not None) * 2 + (severity is not None)]
+        params = {"patient_id": patient_id, "limit": limit}
+        if status is not None:
             params["status"] = status.value
-            
-        if severity:
-            query += " AND severity = $severity"
+        if severity is not None:
             params["severity"] = severity.value
-            
-        query += " ORDER BY created_at DESC LIMIT $limit"
-        params["limit"] = limit
         
-        result = await db.execute(query, params)
-        
-        return [AlertResponse(**alert) for alert in result] if result else []
+        return query, params
     
     async def acknowledge_alert(self, alert_id: str, user_id: str) -> Optional[AlertResponse]:
         """Acknowledge an alert."""
         with logfire.span("acknowledge_alert", alert_id=alert_id):
-            alert = await self.get_alert(alert_id)
-            if not alert:
-                return None
-            
+            # No separate existence check: an unknown or already resolved
+            # alert matches no row and the update comes back empty
             db = await get_database()
             
             update_data = {
@@ -112,15 +248,17 @@ class AlertService:
             
             result = await db.execute(
                 "UPDATE alert SET status = $status, acknowledged_by = $acknowledged_by, "
-                "acknowledged_at = $acknowledged_at, updated_at = $updated_at WHERE id = $id",
+                "acknowledged_at = $acknowledged_at, updated_at = $updated_at "
+                "WHERE id = $id AND status != 'resolved' RETURN AFTER",
                 {"id": alert_id, **update_data}
             )
+            self._invalidate_overview()
             
             if not result:
                 return None
                 
             logfire.info("Alert acknowledged", alert_id=alert_id, user_id=user_id)
-            return AlertResponse(**result[0])
+            return AlertResponse.from_db(result[0])
     
     async def resolve_alert(
         self, 
@@ -130,10 +268,6 @@ class AlertService:
     ) -> Optional[AlertResponse]:
         """Resolve an alert."""
         with logfire.span("resolve_alert", alert_id=alert_id):
-            alert = await self.get_alert(alert_id)
-            if not alert:
-                return None
-                
             db = await get_database()
             
             update_data = {
@@ -147,15 +281,16 @@ class AlertService:
             result = await db.execute(
                 "UPDATE alert SET status = $status, resolved_by = $resolved_by, "
                 "resolved_at = $resolved_at, resolution_notes = $resolution_notes, "
-                "updated_at = $updated_at WHERE id = $id",
+                "updated_at = $updated_at WHERE id = $id AND status != 'resolved' RETURN AFTER",
                 {"id": alert_id, **update_data}
             )
+            self._invalidate_overview()
             
             if not result:
                 return None
                 
             logfire.info("Alert resolved", alert_id=alert_id, user_id=user_id)
-            return AlertResponse(**result[0])
+            return AlertResponse.from_db(result[0])
     
     async def snooze_alert(
         self,
@@ -165,10 +300,6 @@ class AlertService:
     ) -> Optional[AlertResponse]:
         """Snooze an alert until a specific time."""
         with logfire.span("snooze_alert", alert_id=alert_id):
-            alert = await self.get_alert(alert_id)
-            if not alert:
-                return None
-                
             db = await get_database()
             
             update_data = {
@@ -180,35 +311,43 @@ class AlertService:
             
             result = await db.execute(
                 "UPDATE alert SET status = $status, snoozed_by = $snoozed_by, "
-                "snoozed_until = $snoozed_until, updated_at = $updated_at WHERE id = $id",
+                "snoozed_until = $snoozed_until, updated_at = $updated_at "
+                "WHERE id = $id AND status != 'resolved' RETURN AFTER",
                 {"id": alert_id, **update_data}
             )
+            self._invalidate_overview()
             
             if not result:
                 return None
                 
             logfire.info("Alert snoozed", alert_id=alert_id, until=snooze_until.isoformat())
-            return AlertResponse(**result[0])
+            return AlertResponse.from_db(result[0])
     
     async def get_active_alerts_count(self, user_id: Optional[str] = None) -> int:
         """Get count of active alerts."""
         db = await get_database()
         
-        query = "SELECT count() FROM alert WHERE status = 'active'"
-        params = {}
-        
         if user_id:
             # Count alerts for patients assigned to this user
-            query = """
+            result = await db.execute("""
                 SELECT count() FROM alert 
                 WHERE status = 'active' 
                 AND patient_id IN (
                     SELECT id FROM patient WHERE assigned_provider = $user_id
                 )
-            """
-            params["user_id"] = user_id
-            
-        result = await db.execute(query, params)
+            """, {"user_id": user_id})
+            return result[0]['count'] if result else 0
+        
+        # alert_counts is a view the database updates on every alert write,
+        # so the unscoped count sums a handful of rows. No rows means either
+        # no active alerts or no view yet; the indexed scan is right for both.
+        result = await db.execute(
+            "SELECT math::sum(count) AS count FROM alert_counts WHERE status = 'active' GROUP ALL"
+        )
+        if not result:
+            result = await db.execute(
+                "SELECT count() AS count FROM alert WHERE status = 'active' GROUP ALL"
+            )
         return result[0]['count'] if result else 0
     
     async def get_alerts_by_severity(self) -> Dict[str, int]:
@@ -216,23 +355,28 @@ class AlertService:
         db = await get_database()
         
         result = await db.execute("""
-            SELECT severity, count() as count 
-            FROM alert 
-            WHERE status = 'active' 
+            SELECT severity, math::sum(count) AS count
+            FROM alert_counts
+            WHERE status = 'active'
             GROUP BY severity
         """)
+        if not result:
+            # Same fallback as get_active_alerts_count
+            result = await db.execute("""
+                SELECT severity, count() AS count
+                FROM alert
+                WHERE status = 'active'
+                GROUP BY severity
+            """)
         
-        severity_counts = {
-            "critical": 0,
-            "high": 0,
-            "medium": 0,
-            "low": 0
-        }
-        
-        if result:
-            for row in result:
-                severity_counts[row['severity']] = row['count']
-                
+        return self._severity_counts(result)
+    
+    @staticmethod
+    def _severity_counts(rows: Optional[List[Dict[str, Any]]]) -> Dict[str, int]:
+        """Fold grouped severity rows into counts for every severity."""
+        severity_counts = dict(_ZERO_SEVERITY_COUNTS)
+        if rows:
+            severity_counts.update({row['severity']: row['count'] for row in rows})
         return severity_counts
     
     async def auto_resolve_old_alerts(self, days_old: int = 30) -> Dict[str, Any]:
@@ -242,63 +386,139 @@ class AlertService:
             
             cutoff_date = datetime.utcnow() - timedelta(days=days_old)
             
-            result = await db.execute("""
-                UPDATE alert 
-                SET status = 'resolved', 
-                    resolved_at = $now,
-                    resolution_notes = 'Auto-resolved due to age',
-                    updated_at = $now
-                WHERE status IN ('active', 'acknowledged') 
-                AND created_at < $cutoff_date
-                RETURN count()
-            """, {
-                "now": datetime.utcnow(),
-                "cutoff_date": cutoff_date
-            })
-            
-            resolved_count = result[0]['count'] if result else 0
+            now = datetime.utcnow()
+            
+            # Resolve in bounded batches so no single update holds a large
+            # transaction; resolved alerts drop out of the next selection
+            resolved_count = 0
+            while True:
+                result = await db.execute("""
+                    UPDATE (
+                        SELECT VALUE id FROM alert
+                        WHERE status IN ['active', 'acknowledged']
+                        AND created_at < $cutoff_date
+                        LIMIT $batch_size
+                    )
+                    SET status = 'resolved',
+                        resolved_at = $now,
+                        resolution_notes = 'Auto-resolved due to age',
+                        updated_at = $now
+                    RETURN id
+                """, {
+                    "now": now,
+                    "cutoff_date": cutoff_date,
+                    "batch_size": self.AUTO_RESOLVE_BATCH_SIZE
+                })
+                batch_count = len(result) if result else 0
+                if not batch_count:
+                    break
+                
+                resolved_count += batch_count
+                self._invalidate_overview()
+                logfire.info("Auto-resolved alert batch", batch=batch_count, total=resolved_count)
+                if batch_count < self.AUTO_RESOLVE_BATCH_SIZE:
+                    break
+                # Let other requests run between batches
+                await asyncio.sleep(0)
             
             logfire.info("Auto-resolved old alerts", count=resolved_count)
             return {"resolved_count": resolved_count}
     
     async def get_alerts_overview(self) -> Dict[str, Any]:
         """Get alerts overview for dashboard."""
+        # Dashboards poll this; reuse a recent overview until an alert changes
+        if self._overview is not None and time.monotonic() < self._overview_expires_at:
+            return dict(self._overview)
+        
+        generation = self._overview_generation
         db = await get_database()
         
-        # Get total active alerts
-        total_active = await self.get_active_alerts_count()
+        # All four aggregates in one round-trip, read from one snapshot
+        result = await db.execute(_OVERVIEW_QUERY)
         
-        # Get by severity
-        by_severity = await self.get_alerts_by_severity()
+        overview = self._returned_object(result)
+        summary = self._overview_counts(overview)
+        summary["recent_alerts"] = [AlertResponse.from_db(alert) for alert in overview.get('recent') or []]
         
-        # Get by type
-        type_result = await db.execute("""
-            SELECT type, count() as count 
-            FROM alert 
-            WHERE status = 'active' 
-            GROUP BY type
-        """)
+        self._store_overview(summary, generation)
+        return dict(summary)
+    
+    async def stream_overview(self) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield overview sections as each query finishes, for progressive rendering."""
+        if self._overview is not None and time.monotonic() < self._overview_expires_at:
+            for section in self._overview.items():
+                yield section
+            return
         
-        by_type = {}
-        if type_result:
-            for row in type_result:
-                by_type[row['type']] = row['count']
+        generation = self._overview_generation
+        db = await get_database()
         
-        # Get recent alerts
-        recent_result = await db.execute("""
-            SELECT * FROM alert 
-            WHERE status = 'active' 
-            ORDER BY created_at DESC 
-            LIMIT 10
-        """)
+        async def counts() -> Dict[str, Any]:
+            result = await db.execute(_OVERVIEW_COUNTS_QUERY)
+            return self._overview_counts(self._returned_object(result))
+        
+        async def recent() -> Dict[str, Any]:
+            result = await db.execute(_RECENT_ACTIVE_ALERTS)
+            return {"recent_alerts": [AlertResponse.from_db(alert) for alert in result or []]}
+        
+        # The counts and the recent list run concurrently; whichever
+        # finishes first is sent first
+        summary: Dict[str, Any] = {}
+        tasks = (asyncio.create_task(counts()), asyncio.create_task(recent()))
+        try:
+            for sections in asyncio.as_completed(tasks):
+                for key, value in (await sections).items():
+                    summary[key] = value
+                    yield key, value
+        finally:
+            # A client that disconnects mid-stream closes the generator
+            # early; stop the query still running, and retrieve any error
+            # nobody will read so it is not reported as unhandled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+        
+        self._store_overview(
+            {key: summary[key] for key in ("total_active", "by_severity", "by_type", "recent_alerts")},
+            generation
+        )
+    
+    def _store_overview(self, summary: Dict[str, Any], generation: int):
+        """Cache an overview unless an alert was written while computing it."""
+        if generation == self._overview_generation:
+            self._overview = summary
+            self._overview_expires_at = time.monotonic() + self.OVERVIEW_TTL
+    
+    @staticmethod
+    def _returned_object(result: Any) -> Dict[str, Any]:
+        """Get the RETURN object, the last statement result of a transaction."""
+        returned = result[-1] if result else {}
+        if isinstance(returned, dict) and 'result' in returned:
+            returned = returned['result']
+        if isinstance(returned, list):
+            returned = returned[0] if returned else {}
+        return returned
+    
+    @staticmethod
+    def _overview_counts(overview: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the overview counts from the total and (severity, type) groups."""
+        total_rows = overview.get('total') or []
+        total_active = total_rows[0]['count'] if total_rows else 0
         
-        recent_alerts = [AlertResponse(**alert) for alert in recent_result] if recent_result else []
+        # Pivot the (severity, type) groups into both breakdowns
+        by_severity = dict(_ZERO_SEVERITY_COUNTS)
+        by_type: Dict[str, int] = {}
+        for row in overview.get('by_severity_type') or []:
+            count = row['count']
+            by_severity[row['severity']] = by_severity.get(row['severity'], 0) + count
+            by_type[row['type']] = by_type.get(row['type'], 0) + count
         
         return {
             "total_active": total_active,
             "by_severity": by_severity,
-            "by_type": by_type,
-            "recent_alerts": recent_alerts
+            "by_type": by_type
         }
     
     async def create_alert_rule(self, rule_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -381,18 +601,18 @@ class AlertService:
                 })
             
             # Create alerts for triggered rules
-            for alert_data in triggered_alerts:
-                await self.create_alert(
-                    AlertCreate(
-                        patient_id=patient_id,
-                        type=AlertType.SYSTEM_GENERATED,
-                        severity=AlertSeverity(alert_data['severity']),
-                        title=alert_data['message'],
-                        description=f"Automated alert from rule: {alert_data['rule']}",
-                        metadata={"rule": alert_data['rule']}
-                    ),
-                    created_by="system"
+            await self.create_alerts([
+                AlertCreate.construct_checked(
+                    patient_id=patient_id,
+                    type=AlertType.SYSTEM,
+                    severity=alert_data['severity'],
+                    title=alert_data['message'],
+                    description=f"Automated alert from rule: {alert_data['rule']}",
+                    metadata={"rule": alert_data['rule']},
+                    triggered_by="system"
                 )
+                for alert_data in triggered_alerts
+            ])
             
             return {
                 "triggered_alerts": triggered_alerts,
@@ -6,7 +6,7 @@ import asyncio
 import logfire
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime, timedelta, timezone
-from enum import Enum
+from enum import StrEnum
 from pydantic import BaseModel, Field
 from collections import defaultdict
 
@@ -17,7 +17,7 @@ from app.database.connection import DatabaseConnection
 settings = get_settings()
 
 
-class AlertSeverity(str, Enum):
+class AlertSeverity(StrEnum):
     """Alert severity levels."""
     CRITICAL = "critical"
     HIGH = "high"
@@ -26,7 +26,11 @@ class AlertSeverity(str, Enum):
     INFO = "info"
 
 
-class AlertType(str, Enum):
+# Severities that are logged as immediate-action alerts
+_URGENT_SEVERITIES = frozenset({AlertSeverity.CRITICAL, AlertSeverity.HIGH})
+
+
+class AlertType(StrEnum):
     """Types of system alerts."""
     # Performance
     SLOW_API = "slow_api"
@@ -441,7 +445,7 @@ class AlertingService:
     async def _send_notifications(self, alert: Alert):
         """Send alert notifications via Logfire."""
         # Log critical alerts with high priority
-        if alert.severity in [AlertSeverity.CRITICAL, AlertSeverity.HIGH]:
+        if alert.severity in _URGENT_SEVERITIES:
             logfire.error(
                 "CRITICAL ALERT - Immediate action required",
                 alert_type=alert.type.value,
@@ -6,7 +6,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import logging
 import logfire
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from app.database.connection import get_database
 from app.config.logging import audit_logger
@@ -55,7 +55,8 @@ class AnalyticsService:
             logfire.info("Starting dashboard metrics calculation")
             
             # Get all patients and count by status
-            all_patients_query = "SELECT * FROM patient WHERE status != 'Deleted'"
+            # Only the fields counted below; the full rows are never needed
+            all_patients_query = "SELECT status, risk_level, created_at FROM patient WHERE status != 'Deleted'"
             result = await db.execute(all_patients_query)
             
             # Handle SurrealDB response format
@@ -67,29 +68,18 @@ class AnalyticsService:
                 elif isinstance(result[0], list):
                     all_patients = result[0]
             
-            status_counts = {}
-            if all_patients:
-                for patient in all_patients:
-                    status = patient.get('status', 'unknown')
-                    status_counts[status] = status_counts.get(status, 0) + 1
-            
-            # Count by risk level from the same data
-            risk_counts = {}
-            recent_patients = 0
-            
-            if all_patients:
-                for patient in all_patients:
-                    risk_level = patient.get('risk_level', 'unknown')
-                    risk_counts[risk_level] = risk_counts.get(risk_level, 0) + 1
-                    
-                    # Count recent patients (simplified check)
-                    if patient.get('created_at'):
-                        recent_patients += 1  # Simplified - counting all as recent for now
+            # Count statuses and risk levels in C via Counter rather than
+            # per-row dict updates
+            status_counts = dict(Counter(patient.get('status', 'unknown') for patient in all_patients))
+            risk_counts = dict(Counter(patient.get('risk_level', 'unknown') for patient in all_patients))
+            
+            # Count recent patients (simplified - counting all as recent for now)
+            recent_patients = sum(1 for patient in all_patients if patient.get('created_at'))
             
             total_patients = len(all_patients) if all_patients else 0
             
             # Get active alerts count
-            alerts_query = "SELECT * FROM alert WHERE status = 'ACTIVE'"
+            alerts_query = "SELECT count() AS total FROM alert WHERE status = 'ACTIVE' GROUP ALL"
             alerts_result = await db.execute(alerts_query)
             
             # Handle SurrealDB response format for alerts
@@ -100,7 +90,7 @@ class AnalyticsService:
                 elif isinstance(alerts_result[0], list):
                     alerts_data = alerts_result[0]
             
-            active_alerts = len(alerts_data)
+            active_alerts = alerts_data[0].get('total', 0) if alerts_data else 0
             
             # Count active and urgent patients
             # Active includes: active, onboarding, urgent statuses
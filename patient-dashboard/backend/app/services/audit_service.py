@@ -6,14 +6,16 @@ import json
 import logfire
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
-from enum import Enum
+from enum import StrEnum
 from pydantic import BaseModel, Field
 
+from app.config.logging import request_id_var
 from app.database.connection import DatabaseConnection
+from app.models._fastmodel import fast_model
 from app.models.user import UserRole
 
 
-class AuditAction(str, Enum):
+class AuditAction(StrEnum):
     """Types of audit actions."""
     # Authentication
     LOGIN = "login"
@@ -39,7 +41,7 @@ class AuditAction(str, Enum):
     IMPERSONATION = "impersonation"
 
 
-class AuditResource(str, Enum):
+class AuditResource(StrEnum):
     """Types of resources being audited."""
     PATIENT = "patient"
     USER = "user"
@@ -52,6 +54,7 @@ class AuditResource(str, Enum):
     SYSTEM = "system"
 
 
+@fast_model
 class AuditEntry(BaseModel):
     """Model for audit log entries."""
     id: Optional[str] = None
@@ -170,7 +173,8 @@ class AuditService:
         Returns:
             Created audit entry
         """
-        entry = AuditEntry(
+        # Values come from the server itself, so skip full validation
+        entry = AuditEntry.construct_checked(
             user_id=user_id,
             user_email=user_email,
             user_role=user_role,
@@ -188,6 +192,9 @@ class AuditService:
             phi_accessed=phi_accessed
         )
         
+        # Build the record once; the same dict feeds Logfire and the DB write
+        entry_data = entry.model_dump(exclude_none=True)
+        
         # Log to Logfire immediately
         with logfire.span(
             "audit_log",
@@ -195,11 +202,12 @@ class AuditService:
             action=action.value,
             resource=resource.value,
             resource_id=resource_id,
+            request_id=request_id_var.get() or None,
             success=success
         ):
             logfire.info(
                 f"Audit: {action.value} on {resource.value}",
-                **entry.dict(exclude_none=True)
+                **entry_data
             )
         
         # Store in database
@@ -207,26 +215,18 @@ class AuditService:
             if not self.db:
                 await self.initialize()
             
-            # Convert entry to dict and create SQL query
-            entry_data = entry.dict(exclude_none=True)
-            fields = []
-            params = {}
-            for key, value in entry_data.items():
-                fields.append(f"{key} = ${key}")
-                params[key] = value
-            
-            query = f"""
-                CREATE {self.audit_table} SET
-                    {', '.join(fields)}
-            """
-            
-            result = await self.db.execute(query, params)
+            # Pass the record as a single CONTENT param; the driver encodes it
+            # natively instead of us templating one SET clause per field
+            result = await self.db.execute(
+                f"CREATE {self.audit_table} CONTENT $entry",
+                {"entry": entry_data}
+            )
             
             if result and len(result) > 0:
                 entry.id = result[0].get('id')
             
         except Exception as e:
-            logfire.error("Failed to store audit log", error=str(e), entry=entry.dict())
+            logfire.error("Failed to store audit log", error=str(e), entry=entry_data)
             # Don't fail the operation if audit logging fails
         
         return entry
@@ -2,12 +2,12 @@
 Consolidated Clerk authentication service with enhanced JWT validation.
 Combines functionality from clerk_auth_service.py and enhanced_clerk_auth.py
 """
+import time
 import httpx
 import jwt
 import logfire
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timezone
-from functools import lru_cache
 from fastapi import HTTPException, status
 from pydantic import BaseModel, Field
 from jwt.algorithms import RSAAlgorithm
@@ -58,7 +58,8 @@ class ClerkAuthService:
         self.clerk_issuer = self._extract_issuer_from_key()
         self.jwks_url = f"https://{self.clerk_issuer}/.well-known/jwks.json"
         self._jwks_cache = None
-        self._jwks_cache_time = None
+        # Monotonic deadline, immune to wall-clock jumps
+        self._jwks_expires_at = 0.0
         self._cache_duration = 300  # 5 minutes
         self.user_service = UserService()
         
@@ -171,16 +172,13 @@ class ClerkAuthService:
                 **config_status
             )
     
-    @lru_cache(maxsize=128)
     async def get_jwks(self) -> Dict[str, Any]:
         """Fetch and cache JWKS from Clerk."""
-        now = datetime.now(timezone.utc)
+        now = time.monotonic()
         
         # Check cache
-        if self._jwks_cache and self._jwks_cache_time:
-            cache_age = (now - self._jwks_cache_time).total_seconds()
-            if cache_age < self._cache_duration:
-                return self._jwks_cache
+        if self._jwks_cache and now < self._jwks_expires_at:
+            return self._jwks_cache
         
         # Fetch new JWKS
         try:
@@ -191,7 +189,7 @@ class ClerkAuthService:
                 
                 # Update cache
                 self._jwks_cache = jwks
-                self._jwks_cache_time = now
+                self._jwks_expires_at = now + self._cache_duration
                 
                 return jwks
         except Exception as e:
@@ -4,7 +4,7 @@ Per Production Proposal Phase 2: Add comprehensive Logfire metrics
 """
 import time
 import logfire
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, List, Sequence, Tuple
 from functools import wraps
 from datetime import datetime, timezone
 import asyncio
@@ -153,6 +153,46 @@ class MetricsService:
         if status_code >= 500:
             asyncio.create_task(self._record_metric_async("api_request_error", 1))
     
+    def track_api_requests(self, requests: Sequence[Tuple[str, str, int, float, Optional[str], Optional[str]]]):
+        """
+        Track a batch of API requests with a single log event.
+        
+        Args:
+            requests: (method, path, status_code, duration_ms, user_id, user_role) tuples
+        """
+        if not requests:
+            return
+        
+        error_count = 0
+        alert_metrics: List[Tuple[str, float]] = []
+        for _, _, status_code, duration_ms, _, _ in requests:
+            alert_metrics.append(("api_request", 1))
+            alert_metrics.append(("api_request_duration", duration_ms))
+            if status_code >= 500:
+                error_count += 1
+                alert_metrics.append(("api_request_error", 1))
+        
+        logfire.info(
+            "api.request.batch",
+            count=len(requests),
+            error_count=error_count,
+            requests=[
+                {
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "duration_ms": duration_ms,
+                    "user_id": user_id,
+                    "user_role": user_role,
+                }
+                for method, path, status_code, duration_ms, user_id, user_role in requests
+            ],
+            metric_type="performance"
+        )
+        
+        # Record metrics for alerting in one task rather than one per value
+        asyncio.create_task(self._record_metrics_async(alert_metrics))
+    
     def track_cache_operation(self, operation: str, key: str, hit: bool, duration_ms: float):
         """Track cache operations."""
         logfire.info(
@@ -393,6 +433,11 @@ class MetricsService:
             # Don't fail if metric recording fails
             logfire.debug("Failed to record metric for alerting", error=str(e))
     
+    async def _record_metrics_async(self, metrics: List[Tuple[str, float]]):
+        """Record several metrics for alerting sequentially."""
+        for metric_type, value in metrics:
+            await self._record_metric_async(metric_type, value)
+    
     @asynccontextmanager
     async def track_database_query_with_metrics(self, query_type: str, table: str):
         """Enhanced database query tracking with metrics recording."""
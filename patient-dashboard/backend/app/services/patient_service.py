@@ -128,6 +128,15 @@ class PatientService:
             logger.error(f"Error getting patient {patient_id}: {str(e)}")
             raise
     
+    async def _patient_exists(self, patient_id: str) -> bool:
+        """Check a patient exists without fetching or decrypting the record."""
+        db = await self._get_db()
+        result = await db.execute(
+            "SELECT id FROM patient WHERE id = $id LIMIT 1",
+            {"id": patient_id}
+        )
+        return bool(result and result[0].get('result'))
+    
     async def update_patient(
         self, 
         patient_id: str, 
@@ -186,8 +195,7 @@ class PatientService:
             db = await self._get_db()
             
             # Check if patient exists
-            existing = await self.get_patient_by_id(patient_id)
-            if not existing:
+            if not await self._patient_exists(patient_id):
                 return False
             
             # Soft delete by updating status
@@ -363,8 +371,7 @@ class PatientService:
             db = await self._get_db()
             
             # Check if patient exists
-            existing = await self.get_patient_by_id(patient_id)
-            if not existing:
+            if not await self._patient_exists(patient_id):
                 return False
             
             # Create note
@@ -199,6 +199,15 @@ class ProviderService:
             
             return None
     
+    async def _record_exists(self, table: str, record_id: str) -> bool:
+        """Check a non-deleted record exists without fetching its fields."""
+        db = await self._get_db()
+        result = await db.execute(
+            f"SELECT id FROM {table} WHERE id = $id AND deleted_at IS NULL LIMIT 1",
+            {"id": record_id}
+        )
+        return bool(result and result[0].get('result'))
+    
     async def update_provider(
         self, 
         provider_id: str, 
@@ -263,8 +272,7 @@ class ProviderService:
         """Soft delete a provider."""
         with logfire.span('delete_provider', provider_id=provider_id):
             # Check if provider exists
-            existing = await self.get_provider_by_id(provider_id)
-            if not existing:
+            if not await self._record_exists(self.table_name, provider_id):
                 return False
             
             # Soft delete
@@ -301,13 +309,9 @@ class ProviderService:
                 return False
             
             # Check if patient exists
-            db = await self._get_db()
-            patient_result = await db.execute(
-                "SELECT * FROM patient WHERE id = $id AND deleted_at IS NULL",
-                {"id": patient_id}
-            )
-            if not patient_result or not patient_result[0].get('result') or not patient_result[0]['result']:
+            if not await self._record_exists("patient", patient_id):
                 return False
+            db = await self._get_db()
             
             # Add patient to provider's assigned patients
             assigned_patients = provider.assigned_patients.copy()
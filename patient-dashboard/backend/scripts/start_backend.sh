@@ -7,4 +7,4 @@ export $(grep -v '^#' /Users/dionedge/devqai/.env | xargs)
 cd "$(dirname "$0")/.."
 
 # Start the backend server
-python -m uvicorn app.main:app --host 0.0.0.0 --port 8001 --reload
\ No newline at end of file
+python -m uvicorn app.main:app --host 0.0.0.0 --port 8001 --reload --loop uvloop --http httptools
\ No newline at end of file
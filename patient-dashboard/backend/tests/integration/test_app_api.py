@@ -0,0 +1,43 @@
+"""
+Integration tests for application-level endpoints and middleware stack
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.mark.integration
+@pytest.mark.api
+class TestAppAPI:
+    """Test root, version and cross-cutting response behaviour."""
+
+    @pytest.fixture
+    def client(self):
+        """Create test client."""
+        return TestClient(app)
+
+    def test_root(self, client):
+        """Test root endpoint payload."""
+        response = client.get("/")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["status"] == "operational"
+        assert data["health"] == "/health"
+
+    def test_version(self, client):
+        """Test version endpoint payload."""
+        response = client.get("/version")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["version"] == "1.0.0"
+        assert data["features"]["hipaa_compliance"] is True
+
+    def test_request_id_header(self, client):
+        """Test every response carries a request ID."""
+        response = client.get("/version")
+
+        assert response.headers.get("x-request-id")
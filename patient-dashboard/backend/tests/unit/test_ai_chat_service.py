@@ -1,12 +1,13 @@
 """
 Unit tests for AIChatService
 """
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 import json
 
-from app.services.ai_chat_service import AIChatService
+from app.services.ai_chat_service import AIChatService, CACHE_KEY_PREFIX_LENGTH
 from app.models.chat import (
     ChatMessage,
     ChatSession,
@@ -363,4 +364,202 @@ class TestAIChatService:
         assert len(result) == 3
         assert "missed dose" in result[0]
         assert "double up" in result[1]
-        assert "reminder" in result[2].lower()
\ No newline at end of file
+        assert "reminder" in result[2].lower()
+
+@pytest.mark.unit
+@pytest.mark.ai
+class TestAIChatResponseCache:
+    """Test cases for the in-process chat response cache."""
+    
+    @pytest.fixture
+    def service(self):
+        """Create AI chat service without an Anthropic client."""
+        return AIChatService()
+    
+    def test_cache_key_is_hashable_tuple(self, service):
+        """Test cache keys are plain tuples of message length, prefix, role and page."""
+        key = service._generate_cache_key("hello", {'user_role': 'DOCTOR', 'page': 'patients'})
+        
+        assert key == (5, "hello", 'DOCTOR', 'patients')
+        assert hash(key) == hash(service._generate_cache_key(
+            "hello", {'page': 'patients', 'user_role': 'DOCTOR'}
+        ))
+    
+    def test_cache_key_distinguishes_context(self, service):
+        """Test the same message on different pages gets different keys."""
+        first = service._generate_cache_key("hello", {'user_role': 'DOCTOR', 'page': 'patients'})
+        second = service._generate_cache_key("hello", {'user_role': 'DOCTOR', 'page': 'alerts'})
+        
+        assert first != second
+    
+    def test_cache_key_hashes_bounded_prefix(self, service):
+        """Test long messages are keyed by length and a fixed-size prefix."""
+        message = "x" * 10_000
+        key = service._generate_cache_key(message, {'user_role': 'DOCTOR', 'page': 'patients'})
+        
+        assert key[0] == 10_000
+        assert len(key[1]) == CACHE_KEY_PREFIX_LENGTH
+    
+    def test_cached_response_round_trip(self, service):
+        """Test a cached response is returned until it expires."""
+        key = service._generate_cache_key("hello", {'user_role': 'DOCTOR', 'page': 'patients'})
+        service._cache_response(key, "hello", "Hi there")
+        
+        assert service._get_cached_response(key, "hello") == "Hi there"
+        
+        service.cache_ttl = 0
+        key = service._generate_cache_key("other", {})
+        service._cache_response(key, "other", "ignored")
+        assert service._get_cached_response(key, "other") is None
+    
+    def test_cached_response_requires_full_message_match(self, service):
+        """Test messages sharing a key prefix and length do not share responses."""
+        context = {'user_role': 'DOCTOR', 'page': 'patients'}
+        prefix = "p" * CACHE_KEY_PREFIX_LENGTH
+        first, second = prefix + "first!", prefix + "second"
+        key = service._generate_cache_key(first, context)
+        assert key == service._generate_cache_key(second, context)
+        
+        service._cache_response(key, first, "reply to first")
+        
+        assert service._get_cached_response(key, first) == "reply to first"
+        assert service._get_cached_response(key, second) is None
+    
+    def test_response_cache_is_bounded(self, service):
+        """Test the response cache evicts old entries instead of growing."""
+        service._response_cache.maxsize = 2
+        for i in range(3):
+            message = f"message {i}"
+            service._cache_response(service._generate_cache_key(message, {}), message, f"reply {i}")
+        
+        assert len(service._response_cache) == 2
+        assert service._get_cached_response(service._generate_cache_key("message 0", {}), "message 0") is None
+
+
+@pytest.mark.unit
+@pytest.mark.ai
+class TestAIChatContext:
+    """Test cases for chat prompt context."""
+    
+    @pytest.fixture
+    def service(self):
+        """Create AI chat service without an Anthropic client."""
+        return AIChatService()
+    
+    def test_role_permissions(self, service):
+        """Test known roles map to their permissions and others to none."""
+        assert 'manage_users' in service._get_role_permissions('ADMIN')
+        assert service._get_role_permissions('UNKNOWN') == ()
+    
+    def test_role_permissions_accept_enum_and_are_read_only(self, service):
+        """Test UserRole members look up like strings and the table is frozen."""
+        from app.models.user import UserRole
+        from app.services.ai_chat_service import _ROLE_PERMISSIONS
+        
+        assert service._get_role_permissions(UserRole.ADMIN) == service._get_role_permissions('ADMIN')
+        with pytest.raises(TypeError):
+            _ROLE_PERMISSIONS['ADMIN'] = ()
+    
+    def test_suggested_prompts(self, service):
+        """Test suggestions are looked up by page and role with a default."""
+        prompts = service.get_suggested_prompts('/patients', 'PROVIDER')
+        
+        assert prompts[0] == "How do I add a new patient?"
+        assert len(prompts) == 4
+        assert service.get_suggested_prompts('/patients', 'AUDIT')[0] == "How do I navigate this system?"
+        
+        # Callers get their own list
+        prompts.clear()
+        assert len(service.get_suggested_prompts('/patients', 'PROVIDER')) == 4
+    
+    def test_page_context_matches_path(self, service):
+        """Test page context is chosen by path and carries the page."""
+        context = service._get_page_context('/patients/123')
+        
+        assert context['page'] == '/patients/123'
+        assert 'search_patients' in context['available_actions']
+        assert 'risk_levels' in context['help_topics']
+    
+    def test_page_context_is_not_shared(self, service):
+        """Test callers cannot mutate the shared page context."""
+        context = service._get_page_context('/dashboard')
+        context['page'] = 'changed'
+        
+        assert service._get_page_context('/dashboard')['page'] == '/dashboard'
+        assert service._get_page_context('/settings') == {
+            'page': '/settings', 'available_actions': ()
+        }
+    
+    @pytest.mark.parametrize("page", ["/patients", "/patients/123/edit", "/dashboard"])
+    def test_page_context_by_first_segment(self, service, page):
+        """Test the first path segment selects the page context."""
+        assert service._get_page_context(page)['available_actions']
+    
+    @pytest.mark.parametrize("page", ["/", "", "patients", "/settings/patients"])
+    def test_page_context_default(self, service, page):
+        """Test paths not starting with a known segment get no actions."""
+        assert service._get_page_context(page)['available_actions'] == ()
+    
+    def test_system_prompt_per_user(self, service):
+        """Test cached prompt text is shared per role and page but names the user."""
+        user = Mock(role="PROVIDER", first_name="Jane", last_name="Doe")
+        page = service._get_page_context('/patients/{id}')
+        
+        prompt = service._build_system_prompt(service._get_user_context(user), page)
+        
+        assert "Current user: Jane Doe (Role: PROVIDER)" in prompt
+        assert "Current page: /patients/{id}" in prompt
+        assert "User permissions: view_assigned_patients, edit_assigned_patients" in prompt
+        assert prompt.endswith("insurance_verification")
+        
+        user.first_name = "John"
+        other = service._build_system_prompt(service._get_user_context(user), page)
+        assert other == prompt.replace("Jane Doe", "John Doe")
+
+
+@pytest.mark.unit
+@pytest.mark.ai
+class TestAIChatHistoryWrites:
+    """Test cases for background chat history writes."""
+    
+    @pytest.mark.asyncio
+    async def test_reply_does_not_wait_for_history_write(self):
+        """Test the reply returns before the history write and drain() waits for it."""
+        service = AIChatService()
+        service.client = Mock()
+        service.client.messages.create = AsyncMock(return_value=Mock(content=[Mock(text="Hello")]))
+        
+        release = asyncio.Event()
+        stored = []
+        
+        async def slow_store(**kwargs):
+            await release.wait()
+            stored.append(kwargs)
+        
+        service._store_chat_message = slow_store
+        user = Mock(id="user:1", role="PROVIDER", first_name="Jane", last_name="Doe")
+        
+        result = await service.process_message("hi", user, "/dashboard")
+        
+        assert result['response'] == "Hello"
+        assert stored == []
+        assert len(service._pending_writes) == 1
+        
+        release.set()
+        await service.drain()
+        
+        assert stored[0]['conversation_id'] == result['conversation_id']
+        assert not service._pending_writes
+    
+    @pytest.mark.asyncio
+    async def test_conversation_id_generated_once(self):
+        """Test a missing conversation id is generated once and passed through."""
+        service = AIChatService()
+        service.client = None
+        user = Mock(id="user:1", role="PROVIDER", first_name="Jane", last_name="Doe")
+        
+        result = await service.process_message("hi", user, "/dashboard")
+        assert len(result['conversation_id']) == 32
+        
+        result = await service.process_message("hi", user, "/dashboard", conversation_id="conv-1")
+        assert result['conversation_id'] == "conv-1"
@@ -2,6 +2,7 @@
 Unit tests for AlertService
 """
 import pytest
+import asyncio
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
 
@@ -392,4 +393,487 @@ class TestAlertService:
         
         assert len(result) == 2
         assert result[0]["id"] == "alert:1"
-        assert result[1]["id"] == "alert:2"
\ No newline at end of file
+        assert result[1]["id"] == "alert:2"
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestAlertResponseFromDB:
+    """Test cases for AlertResponse.from_db."""
+    
+    def test_coerces_enums_and_datetimes(self):
+        """Test stored strings come back as enums and datetimes."""
+        alert = AlertResponse.from_db({
+            "id": "alert:1",
+            "patient_id": "patient:123",
+            "type": "medication",
+            "severity": "high",
+            "title": "Medication Non-Adherence",
+            "description": "Patient missed 3 consecutive doses",
+            "triggered_by": "system",
+            "status": "acknowledged",
+            "acknowledged_at": "2024-01-15T10:30:00Z",
+            "created_at": "2024-01-15T10:00:00Z",
+            "updated_at": "2024-01-15T10:30:00Z"
+        })
+        
+        assert alert.type is AlertType.MEDICATION
+        assert alert.severity is AlertSeverity.HIGH
+        assert alert.status is AlertStatus.ACKNOWLEDGED
+        assert alert.acknowledged_at.year == 2024
+        assert isinstance(alert.created_at, datetime)
+        assert alert.is_read is False
+        assert alert.model_dump(mode="json")["severity"] == "high"
+    
+    def test_list_columns_from_rows(self):
+        """Test rows are transposed into columns with sparse timestamps."""
+        from app.models.alert import AlertListResponseSoA
+        
+        columns = AlertListResponseSoA.from_rows([
+            {
+                "id": "alert:1",
+                "type": "medication",
+                "severity": "high",
+                "status": "active",
+                "title": "Missed dose",
+                "created_at": "2024-01-15T10:00:00Z"
+            },
+            {
+                "id": "alert:2",
+                "type": "vitals",
+                "title": "High BP",
+                "created_at": datetime(2024, 1, 16, 9, 0),
+                "read_at": "2024-01-16T09:05:00Z"
+            }
+        ])
+        
+        assert columns.total == 2
+        assert columns.ids == ["alert:1", "alert:2"]
+        assert columns.severities == [AlertSeverity.HIGH, AlertSeverity.MEDIUM]
+        assert columns.statuses == [AlertStatus.ACTIVE, AlertStatus.ACTIVE]
+        assert set(columns.timestamps) == {"created_at", "read_at"}
+        assert columns.timestamps["created_at"][1] == "2024-01-16T09:00:00"
+        assert columns.timestamps["read_at"] == [None, "2024-01-16T09:05:00Z"]
+        assert columns.model_dump(mode="json")["types"] == ["medication", "vitals"]
+    
+    def test_bulk_acknowledge_ids(self):
+        """Test bulk IDs are stored as a tuple with a cached set view."""
+        from pydantic import ValidationError
+        from app.models.alert import AlertBulkAcknowledge
+        
+        bulk = AlertBulkAcknowledge(alert_ids=["alert:1", "alert:2", "alert:1"])
+        
+        assert bulk.alert_ids == ("alert:1", "alert:2", "alert:1")
+        assert bulk.ids_set == frozenset({"alert:1", "alert:2"})
+        assert bulk.ids_set is bulk.ids_set
+        assert bulk.model_dump() == {"alert_ids": ("alert:1", "alert:2", "alert:1")}
+        with pytest.raises(ValidationError):
+            AlertBulkAcknowledge(alert_ids=[])
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestAlertsOverview:
+    """Test cases for AlertService.get_alerts_overview."""
+    
+    @pytest.mark.asyncio
+    async def test_overview_in_one_query(self):
+        """Test the overview is read from the single RETURN statement result."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[
+            {"status": "OK", "result": None},
+            {"status": "OK", "result": {
+                "total": [{"count": 4}],
+                "by_severity_type": [
+                    {"severity": "high", "type": "medication", "count": 2},
+                    {"severity": "high", "type": "vitals", "count": 1},
+                    {"severity": "low", "type": "medication", "count": 1}
+                ],
+                "recent": [{
+                    "id": "alert:1",
+                    "patient_id": "patient:123",
+                    "type": "medication",
+                    "severity": "high",
+                    "title": "Missed dose",
+                    "description": "Patient missed a dose",
+                    "triggered_by": "system",
+                    "status": "active",
+                    "created_at": "2024-01-15T10:00:00Z",
+                    "updated_at": "2024-01-15T10:00:00Z"
+                }]
+            }}
+        ])
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            overview = await AlertService().get_alerts_overview()
+        
+        db.execute.assert_awaited_once()
+        assert overview["total_active"] == 4
+        assert overview["by_severity"] == {"critical": 0, "high": 3, "medium": 0, "low": 1}
+        assert overview["by_type"] == {"medication": 3, "vitals": 1}
+        assert overview["recent_alerts"][0].severity is AlertSeverity.HIGH
+    
+    @pytest.mark.asyncio
+    async def test_overview_without_alerts(self):
+        """Test an empty result gives zero counts."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[{"status": "OK", "result": {
+            "total": [], "by_severity_type": [], "recent": []
+        }}])
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            overview = await AlertService().get_alerts_overview()
+        
+        assert overview["total_active"] == 0
+        assert list(overview["by_severity"].items()) == [
+            ("critical", 0), ("high", 0), ("medium", 0), ("low", 0)
+        ]
+        assert overview["by_type"] == {}
+        assert overview["recent_alerts"] == []
+    
+    @pytest.mark.asyncio
+    async def test_overview_cached_until_write(self):
+        """Test the overview is reused until an alert write invalidates it."""
+        overview_result = [{"status": "OK", "result": {
+            "total": [{"count": 1}], "by_severity_type": [], "recent": []
+        }}]
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[overview_result, [{"id": "alert:1"}], overview_result])
+        service = AlertService()
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            first = await service.get_alerts_overview()
+            first["total_active"] = 99
+            second = await service.get_alerts_overview()
+            assert db.execute.await_count == 1
+            assert second["total_active"] == 1
+            
+            await service.auto_resolve_old_alerts()
+            await service.get_alerts_overview()
+        
+        # One overview query, one auto-resolve update, one fresh overview
+        assert db.execute.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_stream_closed_early_cancels_pending_query(self):
+        """Test a disconnecting client does not leave the other query running."""
+        recent_cancelled = asyncio.Event()
+        
+        async def execute(query, params=None):
+            if "GROUP" in query:
+                return [{"status": "OK", "result": {"total": [{"count": 1}], "by_severity_type": []}}]
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                recent_cancelled.set()
+                raise
+        
+        db = Mock()
+        db.execute = AsyncMock(side_effect=execute)
+        service = AlertService()
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            stream = service.stream_overview()
+            assert await stream.__anext__() == ("total_active", 1)
+            await stream.aclose()
+        
+        await asyncio.wait_for(recent_cancelled.wait(), timeout=1)
+        assert service._overview is None
+    
+    @pytest.mark.asyncio
+    async def test_stream_sends_counts_before_recent(self):
+        """Test counts are yielded as soon as they are ready and the result is cached."""
+        async def execute(query, params=None):
+            if "GROUP" in query:
+                return [{"status": "OK", "result": {
+                    "total": [{"count": 2}],
+                    "by_severity_type": [{"severity": "critical", "type": "vitals", "count": 2}]
+                }}]
+            await asyncio.sleep(0.01)
+            return []
+        
+        db = Mock()
+        db.execute = AsyncMock(side_effect=execute)
+        service = AlertService()
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            sections = [section async for section in service.stream_overview()]
+            overview = await service.get_alerts_overview()
+        
+        assert [key for key, _ in sections] == ["total_active", "by_severity", "by_type", "recent_alerts"]
+        assert dict(sections)["by_severity"]["critical"] == 2
+        assert db.execute.await_count == 2
+        assert overview == dict(sections)
+
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestPatientAlertsQuery:
+    """Test cases for the prebuilt patient alert queries."""
+    
+    @pytest.mark.parametrize("status,severity", [
+        (None, None),
+        (None, AlertSeverity.HIGH),
+        (AlertStatus.ACTIVE, None),
+        (AlertStatus.ACTIVE, AlertSeverity.HIGH)
+    ])
+    def test_filters_match_parameters(self, status, severity):
+        """Test each filter combination gets its clause and only its parameters."""
+        query, params = AlertService._patient_alerts_query("patient:1", status, severity, 20)
+        
+        assert ("status = $status" in query) == (status is not None)
+        assert ("severity = $severity" in query) == (severity is not None)
+        assert query.endswith("ORDER BY created_at DESC LIMIT $limit")
+        expected = {"patient_id": "patient:1", "limit": 20}
+        if status is not None:
+            expected["status"] = "active"
+        if severity is not None:
+            expected["severity"] = "high"
+        assert params == expected
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestAlertCounts:
+    """Test cases for dashboard counts read from the alert_counts view."""
+    
+    @pytest.mark.asyncio
+    async def test_counts_read_view(self):
+        """Test unscoped counts sum the view instead of scanning alerts."""
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[
+            [{"count": 7}],
+            [{"severity": "critical", "count": 2}, {"severity": "low", "count": 5}]
+        ])
+        service = AlertService()
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            total = await service.get_active_alerts_count()
+            by_severity = await service.get_alerts_by_severity()
+        
+        assert total == 7
+        assert by_severity == {"critical": 2, "high": 0, "medium": 0, "low": 5}
+        for call in db.execute.await_args_list:
+            assert "FROM alert_counts" in call.args[0]
+    
+    @pytest.mark.asyncio
+    async def test_counts_fall_back_without_view_rows(self):
+        """Test an empty or missing view falls back to scanning active alerts."""
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[
+            [],
+            [{"count": 4}],
+            [],
+            [{"severity": "high", "count": 4}]
+        ])
+        service = AlertService()
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            total = await service.get_active_alerts_count()
+            by_severity = await service.get_alerts_by_severity()
+        
+        assert total == 4
+        assert by_severity["high"] == 4
+        queries = [call.args[0] for call in db.execute.await_args_list]
+        assert "FROM alert_counts" in queries[0] and "FROM alert_counts" in queries[2]
+        assert "FROM alert_counts" not in queries[1] and "FROM alert_counts" not in queries[3]
+    
+    @pytest.mark.asyncio
+    async def test_initialize_defines_view_once(self):
+        """Test startup defines the view only where it does not exist yet."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[])
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            await AlertService().initialize()
+        
+        query = db.execute.await_args.args[0]
+        assert "DEFINE TABLE IF NOT EXISTS alert_counts AS" in query
+        assert "GROUP BY severity, type, status" in query
+    
+    @pytest.mark.asyncio
+    async def test_user_count_reads_alerts(self):
+        """Test per-user counts still filter the alert table."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[{"count": 3}])
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            assert await AlertService().get_active_alerts_count(user_id="user:1") == 3
+        
+        query, params = db.execute.await_args.args
+        assert "FROM alert " in query
+        assert params == {"user_id": "user:1"}
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestAutoResolveBatches:
+    """Test cases for batched auto-resolution of old alerts."""
+    
+    @pytest.mark.asyncio
+    async def test_resolves_until_short_batch(self):
+        """Test batches repeat while full and stop after a short one."""
+        db = Mock()
+        db.execute = AsyncMock(side_effect=[
+            [{"id": f"alert:{i}"} for i in range(2)],
+            [{"id": f"alert:{i}"} for i in range(2, 4)],
+            [{"id": "alert:4"}]
+        ])
+        service = AlertService()
+        service.AUTO_RESOLVE_BATCH_SIZE = 2
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            result = await service.auto_resolve_old_alerts(days_old=30)
+        
+        assert result == {"resolved_count": 5}
+        assert db.execute.await_count == 3
+        assert db.execute.await_args.args[1]["batch_size"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_nothing_to_resolve(self):
+        """Test an empty first batch resolves nothing."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[])
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            result = await AlertService().auto_resolve_old_alerts()
+        
+        assert result == {"resolved_count": 0}
+        db.execute.assert_awaited_once()
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestAlertTransitions:
+    """Test cases for single-query alert state transitions."""
+    
+    @pytest.mark.asyncio
+    async def test_acknowledge_in_one_query(self):
+        """Test acknowledging updates and returns the alert in one round-trip."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[{
+            "id": "alert:1",
+            "patient_id": "patient:123",
+            "type": "medication",
+            "severity": "high",
+            "title": "Missed dose",
+            "description": "Patient missed a dose",
+            "triggered_by": "system",
+            "status": "acknowledged",
+            "created_at": "2024-01-15T10:00:00Z",
+            "updated_at": "2024-01-15T10:05:00Z"
+        }])
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            alert = await AlertService().acknowledge_alert("alert:1", "user:1")
+        
+        db.execute.assert_awaited_once()
+        assert "status != 'resolved'" in db.execute.await_args.args[0]
+        assert alert.status is AlertStatus.ACKNOWLEDGED
+    
+    @pytest.mark.asyncio
+    async def test_unknown_or_resolved_alert(self):
+        """Test an empty update result is reported as not found."""
+        db = Mock()
+        db.execute = AsyncMock(return_value=[])
+        service = AlertService()
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            assert await service.resolve_alert("alert:1", "user:1") is None
+            assert await service.snooze_alert("alert:1", "user:1", datetime(2030, 1, 1)) is None
+        
+        assert db.execute.await_count == 2
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestAlertDispatch:
+    """Test cases for alert notification and escalation dispatch."""
+    
+    @pytest.mark.asyncio
+    async def test_critical_alert_notifies_and_escalates_concurrently(self):
+        """Test both side effects start before either finishes."""
+        started = []
+        release = asyncio.Event()
+        
+        async def side_effect(name):
+            started.append(name)
+            await release.wait()
+        
+        service = AlertService()
+        service.notification_service = Mock()
+        service.notification_service.send_alert_notification = lambda alert: side_effect("notify")
+        service.escalation_service = Mock()
+        service.escalation_service.escalate_critical_alert = lambda alert: side_effect("escalate")
+        
+        task = asyncio.create_task(service._dispatch_alert(Mock(severity=AlertSeverity.CRITICAL)))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        
+        assert sorted(started) == ["escalate", "notify"]
+        release.set()
+        await task
+    
+    @pytest.mark.asyncio
+    async def test_low_alert_has_no_side_effects(self):
+        """Test low severity alerts are neither notified nor escalated."""
+        service = AlertService()
+        service.notification_service = Mock(send_alert_notification=AsyncMock())
+        service.escalation_service = Mock(escalate_critical_alert=AsyncMock())
+        
+        await service._dispatch_alert(Mock(severity=AlertSeverity.LOW))
+        
+        service.notification_service.send_alert_notification.assert_not_called()
+        service.escalation_service.escalate_critical_alert.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.alerts
+class TestCreateAlerts:
+    """Test cases for bulk alert creation."""
+    
+    @staticmethod
+    def _alert(severity):
+        return AlertCreate.construct_checked(
+            patient_id="patient:123",
+            type=AlertType.SYSTEM,
+            severity=severity,
+            title="Rule alert",
+            description="Automated alert",
+            triggered_by="system"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_inserts_in_batches(self):
+        """Test alerts are inserted in capped batches and dispatched."""
+        async def insert(query, params):
+            return [
+                {**row, "id": f"alert:{i}"}
+                for i, row in enumerate(params["alerts"])
+            ]
+        
+        db = Mock()
+        db.execute = AsyncMock(side_effect=insert)
+        service = AlertService()
+        service.CREATE_BATCH_SIZE = 2
+        service.escalation_service = Mock(escalate_critical_alert=AsyncMock())
+        
+        with patch("app.services.alert_service.get_database", AsyncMock(return_value=db)):
+            created = await service.create_alerts([
+                self._alert("low"), self._alert("critical"), self._alert("medium")
+            ])
+        
+        assert db.execute.await_count == 2
+        assert db.execute.await_args_list[0].args[0] == "INSERT INTO alert $alerts"
+        assert [alert.severity for alert in created] == [
+            AlertSeverity.LOW, AlertSeverity.CRITICAL, AlertSeverity.MEDIUM
+        ]
+        assert all(alert.status is AlertStatus.ACTIVE for alert in created)
+        service.escalation_service.escalate_critical_alert.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_no_alerts(self):
+        """Test an empty list creates nothing."""
+        with patch("app.services.alert_service.get_database", AsyncMock()) as get_db:
+            assert await AlertService().create_alerts([]) == []
+        get_db.assert_not_called()
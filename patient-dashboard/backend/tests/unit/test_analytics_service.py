@@ -362,4 +362,47 @@ class TestAnalyticsService:
         assert "filename" in result
         assert "data" in result
         assert result["filename"].endswith(".csv")
-        assert len(result["data"]) > 0
\ No newline at end of file
+        assert len(result["data"]) > 0
+
+@pytest.mark.unit
+@pytest.mark.analytics
+class TestMetricTrendForecast:
+    """Test cases for the MetricTrend forecast buffer."""
+    
+    def test_forecast_stored_as_float_array(self):
+        """Test forecasts are packed into a float64 array and dump as a list."""
+        from array import array
+        
+        trend = MetricTrend(
+            direction="up",
+            percentage_change=12.5,
+            trend_strength=0.8,
+            forecast=[1, 2.5, 3]
+        )
+        
+        assert isinstance(trend.forecast, array)
+        assert trend.forecast.typecode == "d"
+        assert sum(trend.forecast) == 6.5
+        assert trend.model_dump(mode="json")["forecast"] == [1.0, 2.5, 3.0]
+        assert MetricTrend.model_json_schema()["properties"]["forecast"]["anyOf"][0]["type"] == "array"
+    
+    def test_forecast_coerces_numeric_strings(self):
+        """Test forecasts accept anything a List[float] would."""
+        trend = MetricTrend(direction="up", percentage_change=1, trend_strength=1, forecast=["1.5", 2])
+        
+        assert trend.forecast.tolist() == [1.5, 2.0]
+    
+    @pytest.mark.parametrize("forecast", [["a"], 5, "x"])
+    def test_forecast_invalid_input(self, forecast):
+        """Test bad forecasts raise a ValidationError rather than a raw TypeError."""
+        from pydantic import ValidationError
+        
+        with pytest.raises(ValidationError):
+            MetricTrend(direction="up", percentage_change=1, trend_strength=1, forecast=forecast)
+    
+    def test_forecast_optional(self):
+        """Test forecasts remain optional."""
+        trend = MetricTrend(direction="stable", percentage_change=0, trend_strength=0)
+        
+        assert trend.forecast is None
+        assert trend.model_dump()["forecast"] is None
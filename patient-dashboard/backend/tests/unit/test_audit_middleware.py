@@ -0,0 +1,94 @@
+"""
+Unit tests for AuditMiddleware route matching and AuditedRoute user lookup
+"""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.v1.auth import get_current_user
+from app.middleware.audit_middleware import AuditMiddleware, AuditedRoute
+from app.services.audit_service import AuditAction, AuditResource
+
+
+@pytest.mark.unit
+class TestAuditRouteMatching:
+    """Test cases for AuditMiddleware._get_audit_info."""
+
+    @pytest.fixture
+    def middleware(self):
+        """Create middleware without a downstream app."""
+        return AuditMiddleware(app=None)
+
+    def test_static_route(self, middleware):
+        """Test exact paths resolve without a resource ID."""
+        assert middleware._get_audit_info("GET", "/api/v1/patients") == (
+            AuditAction.LIST, AuditResource.PATIENT, None
+        )
+
+    def test_static_route_takes_priority_over_pattern(self, middleware):
+        """Test /patients/search is not treated as a patient ID."""
+        assert middleware._get_audit_info("GET", "/api/v1/patients/search") == (
+            AuditAction.SEARCH, AuditResource.PATIENT, None
+        )
+
+    def test_pattern_route_captures_id(self, middleware):
+        """Test parameterized paths return the captured resource ID."""
+        assert middleware._get_audit_info("DELETE", "/api/v1/patients/patient:123") == (
+            AuditAction.DELETE, AuditResource.PATIENT, "patient:123"
+        )
+
+    def test_unmapped_route(self, middleware):
+        """Test unknown or nested paths are not audited."""
+        assert middleware._get_audit_info("GET", "/api/v1/patients/123/notes") is None
+        assert middleware._get_audit_info("PATCH", "/api/v1/alerts/123") is None
+
+
+def _request(token: str = "token") -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+
+@pytest.mark.unit
+class TestAuditedRouteUser:
+    """Test cases for the user lookup shared by AuditedRoute and get_current_user."""
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_uses_cached_user(self):
+        """Test a second get_current_user call in the same request skips verification."""
+        user = Mock(id="user:1")
+        request = _request()
+
+        with patch("app.api.v1.auth.clerk_auth_service") as clerk:
+            clerk.verify_clerk_token = AsyncMock(return_value=Mock(sid="sess", org_id=None, sub="clerk_1"))
+            clerk.get_or_create_user_from_clerk = AsyncMock(return_value=user)
+
+            first = await get_current_user(request, None)
+            second = await get_current_user(request, None)
+
+        assert first is user and second is user
+        clerk.verify_clerk_token.assert_awaited_once_with("token")
+        clerk.get_or_create_user_from_clerk.assert_awaited_once()
+
+    def test_verification_errors_do_not_fail_request(self):
+        """Test a JWKS or network failure during the audit lookup leaves the request anonymous."""
+        router = APIRouter(route_class=AuditedRoute)
+
+        @router.get("/public")
+        async def public(request: Request):
+            return {"user": getattr(request.state, "user", None)}
+
+        app = FastAPI()
+        app.include_router(router)
+
+        with patch("app.api.v1.auth.clerk_auth_service") as clerk:
+            clerk.verify_clerk_token = AsyncMock(side_effect=ConnectionError("JWKS unreachable"))
+            response = TestClient(app).get("/public", headers={"Authorization": "Bearer token"})
+
+        assert response.status_code == 200
+        assert response.json() == {"user": None}
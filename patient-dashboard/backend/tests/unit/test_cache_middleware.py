@@ -0,0 +1,242 @@
+"""
+Unit tests for response cache middleware
+"""
+import asyncio
+import base64
+import time
+import zlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from app.cache.surreal_cache_manager import surreal_cache_manager
+from app.middleware.cache_middleware import CacheControl, CacheMiddleware, LocalResponseCache, settings
+
+
+async def _stop_writer(middleware):
+    middleware._writer_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await middleware._writer_task
+
+
+@pytest.mark.unit
+class TestCacheMiddleware:
+    """Test cases for CacheMiddleware."""
+
+    @pytest.fixture
+    def middleware(self):
+        """Create middleware around an empty app."""
+        return CacheMiddleware(FastAPI())
+
+    def test_exact_path_config(self, middleware):
+        """Test exact paths resolve to their configuration."""
+        config = middleware._get_cache_config("/api/v1/dashboard/metrics")
+
+        assert config["ttl"] == 60
+
+    def test_query_string_is_ignored(self, middleware):
+        """Test the query string does not affect the lookup."""
+        config = middleware._get_cache_config("/api/v1/patients?skip=10")
+
+        assert config["vary_params"] == ("limit", "search", "skip", "status")
+
+    def test_unknown_path_is_not_cached(self, middleware):
+        """Test paths outside the configuration are not cached."""
+        assert middleware._get_cache_config("/api/v1/patients/123") is None
+
+    def test_parameterized_prefix(self, middleware, monkeypatch):
+        """Test parameterized patterns match by their static prefix."""
+        monkeypatch.setattr(
+            CacheMiddleware,
+            "CACHE_CONFIG",
+            {
+                "/api/v1/reports": {"ttl": 600, "vary_by": []},
+                "/api/v1/reports/{report_id}": {"ttl": 60, "vary_by": []},
+            },
+        )
+        middleware = CacheMiddleware(FastAPI())
+
+        assert middleware._get_cache_config("/api/v1/reports")["ttl"] == 600
+        assert middleware._get_cache_config("/api/v1/reports/abc")["ttl"] == 60
+
+    def test_cache_key_varies_by_configured_params(self, middleware):
+        """Test the key depends only on the configured query params, in any order."""
+        config = middleware._get_cache_config("/api/v1/patients")
+
+        def key_for(query: str) -> str:
+            request = Request({
+                "type": "http",
+                "method": "GET",
+                "path": "/api/v1/patients",
+                "query_string": query.encode(),
+                "headers": [],
+            })
+            return asyncio.run(middleware._generate_cache_key(request, config))
+
+        assert key_for("skip=0&limit=10") == key_for("limit=10&skip=0&unrelated=1")
+        assert key_for("skip=0&limit=10") != key_for("skip=10&limit=10")
+
+    @pytest.mark.asyncio
+    async def test_response_streams_and_persists_in_background(self, middleware):
+        """Test chunks pass through unchanged and the full body is cached afterwards."""
+        middleware.cache_client = AsyncMock()
+
+        async def chunks():
+            yield b'{"a": '
+            yield b'1}'
+
+        response = StreamingResponse(chunks(), media_type="application/json")
+        middleware._cache_response("response_cache:test", response, 30)
+
+        received = [chunk async for chunk in response.body_iterator]
+        await middleware._write_queue.join()
+        await _stop_writer(middleware)
+
+        assert received == [b'{"a": ', b'1}']
+        [record] = middleware.cache_client.query.await_args.args[1]["recs"]
+        assert record["id"] == "response_cache:test"
+        assert record["data"]["encoding"] == "zlib"
+        assert zlib.decompress(base64.b64decode(record["data"]["body"])) == b'{"a": 1}'
+
+    @pytest.mark.asyncio
+    async def test_pending_writes_are_coalesced(self, middleware):
+        """Test writes queued together are stored with a single INSERT."""
+        middleware.cache_client = AsyncMock()
+
+        for index in range(3):
+            middleware._enqueue_write(f"response_cache:{index}", b"[]", 200, {}, 30)
+        middleware._enqueue_write("response_cache:0", b"[1]", 200, {}, 30)
+        await middleware._write_queue.join()
+        await _stop_writer(middleware)
+
+        middleware.cache_client.query.assert_awaited_once()
+        records = middleware.cache_client.query.await_args.args[1]["recs"]
+        assert [record["id"] for record in records] == [
+            "response_cache:0", "response_cache:1", "response_cache:2"
+        ]
+        assert zlib.decompress(base64.b64decode(records[0]["data"]["body"])) == b"[1]"
+
+    @pytest.mark.asyncio
+    async def test_local_cache_serves_repeat_lookups(self, middleware):
+        """Test entries written by the middleware are served without SurrealDB."""
+        middleware.cache_client = AsyncMock()
+
+        async def chunks():
+            yield b"[]"
+
+        response = StreamingResponse(chunks(), media_type="application/json")
+        middleware._cache_response("response_cache:l1", response, 30)
+        [chunk async for chunk in response.body_iterator]
+        await middleware._write_queue.join()
+        await _stop_writer(middleware)
+        middleware.cache_client.query.reset_mock()
+
+        cached = await middleware._get_cached_response("response_cache:l1")
+
+        assert middleware._build_cached_response(cached).body == b"[]"
+        middleware.cache_client.query.assert_not_awaited()
+
+
+@pytest.mark.unit
+class TestLocalResponseCache:
+    """Test cases for LocalResponseCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted on overflow."""
+        cache = LocalResponseCache(maxsize=2)
+        cache.set("a", {"v": 1}, 60)
+        cache.set("b", {"v": 2}, 60)
+        cache.get("a")
+        cache.set("c", {"v": 3}, 60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert len(cache) == 2
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries are not returned after their TTL."""
+        cache = LocalResponseCache()
+        cache.set("a", {"v": 1}, 0.0001)
+        cache.set("b", {"v": 2}, 0)
+
+        time.sleep(0.001)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+
+
+@pytest.mark.unit
+class TestCacheControl:
+    """Test cases for the CacheControl decorators."""
+
+    @pytest.mark.asyncio
+    async def test_cache_headers(self):
+        """Test Cache-Control, Vary and ETag are set from the decorator arguments."""
+        @CacheControl.cache(ttl=30, vary_by=["user_id", "limit"], private=True)
+        async def endpoint():
+            return Response(content=b"[]", media_type="application/json")
+
+        response = await endpoint()
+
+        assert response.headers["Cache-Control"] == "private, max-age=30"
+        assert response.headers["Vary"] == "Authorization, Accept"
+        assert response.headers["ETag"].startswith('W/"')
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_without_vary(self):
+        """Test a zero TTL forces revalidation and no Vary header is added."""
+        @CacheControl.cache(ttl=0)
+        async def endpoint():
+            return Response(content=b"[]")
+
+        response = await endpoint()
+
+        assert response.headers["Cache-Control"] == "public, max-age=0, no-cache, must-revalidate"
+        assert "Vary" not in response.headers
+
+
+@pytest.mark.unit
+class TestCacheMiddlewareLifespan:
+    """Test cases for acquiring the cache client during app lifespan."""
+
+    def _build_app(self):
+        app = FastAPI()
+        app.add_middleware(CacheMiddleware)
+        return app
+
+    @staticmethod
+    def _middleware(app):
+        layer = app.middleware_stack
+        while not isinstance(layer, CacheMiddleware):
+            layer = layer.app
+        return layer
+
+    def test_startup_enables_cache(self, monkeypatch):
+        """Test the client is acquired once at startup and released at shutdown."""
+        monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+        client = AsyncMock()
+        app = self._build_app()
+
+        with patch.object(surreal_cache_manager, "get_client", return_value=client) as get_client:
+            with TestClient(app):
+                middleware = self._middleware(app)
+                assert middleware.cache_enabled is True
+                assert middleware.cache_client is client
+                assert middleware._writer_task is not None
+
+        get_client.assert_called_once()
+        assert middleware.cache_enabled is False
+        assert middleware._writer_task is None
+
+    def test_startup_without_client_disables_cache(self, monkeypatch):
+        """Test caching stays off when the SurrealDB cache is not initialized."""
+        monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+        app = self._build_app()
+
+        with patch.object(surreal_cache_manager, "get_client", side_effect=RuntimeError("not initialized")):
+            with TestClient(app) as test_client:
+                assert self._middleware(app).cache_enabled is False
+                assert test_client.get("/api/v1/patients").status_code == 404
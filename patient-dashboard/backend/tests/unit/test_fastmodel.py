@@ -0,0 +1,96 @@
+"""
+Unit tests for generated checked model constructors
+"""
+from datetime import datetime
+
+import pytest
+
+from app.models.alert import AlertCreate, AlertPriority, AlertSeverity, AlertType
+from app.models.audit import AuditAction, AuditLogCreate, ResourceType
+
+
+@pytest.mark.unit
+class TestConstructChecked:
+    """Test cases for fast_model's construct_checked."""
+
+    def test_builds_model_with_defaults(self):
+        """Test omitted fields fall back to the model defaults."""
+        alert = AlertCreate.construct_checked(
+            type=AlertType.SYSTEM,
+            title="Emergency contact missing",
+            description="Automated alert",
+            triggered_by="system"
+        )
+
+        assert alert.severity is AlertSeverity.MEDIUM
+        assert alert.priority is AlertPriority.MEDIUM
+        assert alert.metadata == {}
+        assert alert.model_fields_set == {"type", "title", "description", "triggered_by"}
+
+    def test_coerces_enum_values(self):
+        """Test raw enum values are converted to members."""
+        alert = AlertCreate.construct_checked(
+            type="system",
+            severity="low",
+            title="t",
+            description="d",
+            triggered_by="system"
+        )
+
+        assert alert.type is AlertType.SYSTEM
+        assert alert.severity is AlertSeverity.LOW
+        with pytest.raises(ValueError):
+            AlertCreate.construct_checked(
+                type="not-a-type", title="t", description="d", triggered_by="system"
+            )
+
+    def test_rejects_wrong_types(self):
+        """Test mismatched argument types raise TypeError."""
+        with pytest.raises(TypeError, match="user_id: expected str, got int"):
+            AuditLogCreate.construct_checked(
+                action=AuditAction.READ,
+                resource_type=ResourceType.PATIENT,
+                user_id=42,
+                user_email="a@example.com",
+                user_role="admin"
+            )
+
+    def test_optional_fields_accept_none(self):
+        """Test Optional fields accept None without a type error."""
+        log = AuditLogCreate.construct_checked(
+            action=AuditAction.READ,
+            resource_type=ResourceType.PATIENT,
+            user_id="user:1",
+            user_email="a@example.com",
+            user_role="admin",
+            resource_id=None,
+            changes={"field": "value"}
+        )
+
+        assert log.resource_id is None
+        assert log.success is True
+        assert log.model_dump(mode="json")["action"] == "READ"
+
+    def test_missing_required_field(self):
+        """Test required fields stay required."""
+        with pytest.raises(TypeError):
+            AlertCreate.construct_checked(type=AlertType.SYSTEM, title="t", description="d")
+
+    def test_datetime_fields_are_checked(self):
+        """Test datetime fields reject strings rather than parsing them."""
+        with pytest.raises(TypeError, match="expires_at"):
+            AlertCreate.construct_checked(
+                type=AlertType.SYSTEM,
+                title="t",
+                description="d",
+                triggered_by="system",
+                expires_at="2024-01-01"
+            )
+        alert = AlertCreate.construct_checked(
+            type=AlertType.SYSTEM,
+            title="t",
+            description="d",
+            triggered_by="system",
+            expires_at=datetime(2024, 1, 1)
+        )
+        assert alert.expires_at.year == 2024
@@ -0,0 +1,126 @@
+"""
+Unit tests for metrics middleware
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from app.middleware.metrics_middleware import MetricsMiddleware, drain_metrics
+
+
+def _request(method: str, path: str) -> Request:
+    return Request({"type": "http", "method": method, "path": path, "headers": [], "query_string": b""})
+
+
+async def _stop_flush(middleware):
+    middleware._flush_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await middleware._flush_task
+
+
+@pytest.mark.unit
+class TestMetricsMiddleware:
+    """Test cases for MetricsMiddleware batching."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_flushed_as_one_batch(self):
+        """Test buffered requests are emitted together."""
+        middleware = MetricsMiddleware(FastAPI())
+
+        with patch("app.middleware.metrics_middleware.metrics_service") as service:
+            middleware._record_request("GET", "/api/v1/patients", 200, 12.5, "user-1", "provider")
+            middleware._record_request("GET", "/api/v1/alerts", 500, 3.0, None, None)
+            middleware.flush()
+            await _stop_flush(middleware)
+
+        service.track_api_requests.assert_called_once()
+        batch = service.track_api_requests.call_args.args[0]
+        assert [entry[1] for entry in batch] == ["/api/v1/patients", "/api/v1/alerts"]
+        assert not middleware._pending
+
+    @pytest.mark.asyncio
+    async def test_full_batch_triggers_early_flush(self):
+        """Test reaching the batch size flushes without waiting for the interval."""
+        middleware = MetricsMiddleware(FastAPI())
+        middleware.FLUSH_INTERVAL = 60
+
+        with patch("app.middleware.metrics_middleware.metrics_service") as service:
+            for _ in range(middleware.FLUSH_BATCH_SIZE):
+                middleware._record_request("GET", "/api/v1/patients", 200, 1.0, None, None)
+            await asyncio.sleep(0.05)
+            await _stop_flush(middleware)
+
+        assert len(service.track_api_requests.call_args.args[0]) == middleware.FLUSH_BATCH_SIZE
+
+    @pytest.mark.asyncio
+    async def test_drain_flushes_and_stops_loop(self):
+        """Test shutdown emits buffered metrics and cancels the flush loop."""
+        middleware = MetricsMiddleware(FastAPI())
+        middleware.FLUSH_INTERVAL = 60
+
+        with patch("app.middleware.metrics_middleware.metrics_service") as service:
+            middleware._record_request("GET", "/api/v1/patients", 200, 1.0, None, None)
+            task = middleware._flush_task
+            await drain_metrics()
+
+        assert task.cancelled()
+        assert middleware._flush_task is None
+        assert [entry[1] for entry in service.track_api_requests.call_args.args[0]] == ["/api/v1/patients"]
+
+    @pytest.mark.asyncio
+    async def test_flush_error_keeps_loop_running(self):
+        """Test a failing batch is dropped without stopping later flushes."""
+        middleware = MetricsMiddleware(FastAPI())
+        middleware.FLUSH_INTERVAL = 60
+        middleware.FLUSH_BATCH_SIZE = 1
+
+        with patch("app.middleware.metrics_middleware.metrics_service") as service:
+            service.track_api_requests.side_effect = [RuntimeError("logfire down"), None]
+            middleware._record_request("GET", "/api/v1/patients", 200, 1.0, None, None)
+            await asyncio.sleep(0.01)
+            task = middleware._flush_task
+            middleware._record_request("GET", "/api/v1/alerts", 200, 1.0, None, None)
+            await asyncio.sleep(0.01)
+            await _stop_flush(middleware)
+
+        assert middleware._flush_task is task
+        assert service.track_api_requests.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_endpoint_metrics_use_resolved_user(self):
+        """Test endpoint metrics read the user set on request state downstream."""
+        middleware = MetricsMiddleware(FastAPI())
+
+        async def call_next(request):
+            request.state.user = SimpleNamespace(id="user-1", role="provider")
+            return Response(content=b"{}")
+
+        with patch("app.middleware.metrics_middleware.metrics_service") as service:
+            await middleware.dispatch(_request("GET", "/api/v1/dashboard/metrics"), call_next)
+            await _stop_flush(middleware)
+
+        service.track_dashboard_load.assert_called_once()
+        assert service.track_dashboard_load.call_args.kwargs["user_id"] == "user-1"
+
+    @pytest.mark.asyncio
+    async def test_patient_created_reads_resource_id_header(self):
+        """Test the created patient ID comes from X-Resource-Id, not the body."""
+        middleware = MetricsMiddleware(FastAPI())
+
+        async def create_patient(request):
+            return Response(content=b'{"id": "patient-1"}', headers={"X-Resource-Id": "patient-1"})
+
+        async def add_note(request):
+            return Response(content=b'{"id": "note-1"}')
+
+        with patch("app.middleware.metrics_middleware.metrics_service") as service:
+            await middleware.dispatch(_request("POST", "/api/v1/patients/"), create_patient)
+            await middleware.dispatch(_request("POST", "/api/v1/patients/patient-1/notes"), add_note)
+            await _stop_flush(middleware)
+
+        service.track_patient_created.assert_called_once_with(
+            patient_id="patient-1", created_by="unknown"
+        )
@@ -0,0 +1,207 @@
+"""
+Unit tests for core ASGI middleware
+"""
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.config.logging import request_id_var
+from app.core.middleware import StreamingGZipMiddleware
+from app.core.middleware_composite import CompositeEdgeMiddleware
+
+
+def _build_edge_app(**kwargs) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/echo")
+    async def echo(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.post("/items")
+    async def create_item(request: Request):
+        return {"ok": True}
+
+    app.add_middleware(CompositeEdgeMiddleware, **kwargs)
+    return app
+
+
+@pytest.mark.unit
+class TestCompositeEdgeMiddleware:
+    """Test cases for CompositeEdgeMiddleware."""
+
+    def test_security_headers_and_request_id(self):
+        """Test security headers and request ID are added to responses."""
+        client = TestClient(_build_edge_app())
+
+        response = client.get("/echo")
+
+        assert response.status_code == 200
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-hipaa-compliance"] == "enabled"
+        assert "content-security-policy" in response.headers
+        assert response.json()["request_id"] == response.headers["x-request-id"]
+
+    def test_rejects_unsupported_media_type(self):
+        """Test request bodies must use an accepted content type."""
+        client = TestClient(_build_edge_app())
+
+        response = client.post("/items", content=b"name=x", headers={"content-type": "text/plain"})
+
+        assert response.status_code == 415
+        assert response.json()["error_code"] == "UNSUPPORTED_MEDIA_TYPE"
+        assert response.headers["x-frame-options"] == "DENY"
+
+    def test_allows_bodyless_post(self):
+        """Test POST requests without a body skip the content type check."""
+        client = TestClient(_build_edge_app())
+
+        response = client.post("/items")
+
+        assert response.status_code == 200
+
+    def test_rejects_large_payload(self):
+        """Test oversized bodies are rejected from Content-Length alone."""
+        client = TestClient(_build_edge_app(max_body_size=8))
+
+        response = client.post("/items", json={"name": "too large for the limit"})
+
+        assert response.status_code == 413
+        assert response.json()["error_code"] == "PAYLOAD_TOO_LARGE"
+
+    def test_rate_limit(self):
+        """Test clients are limited per window."""
+        client = TestClient(_build_edge_app(rate_limit_requests=2, rate_limit_window=60))
+
+        assert client.get("/echo").status_code == 200
+        assert client.get("/echo").status_code == 200
+        response = client.get("/echo")
+
+        assert response.status_code == 429
+        assert response.json()["error_code"] == "RATE_LIMIT_EXCEEDED"
+        assert int(response.headers["retry-after"]) > 0
+
+    def test_request_id_context_var(self):
+        """Test the request ID is visible through request_id_var during the request."""
+        app = FastAPI()
+
+        @app.get("/ctx")
+        async def ctx():
+            return {"request_id": request_id_var.get()}
+
+        app.add_middleware(CompositeEdgeMiddleware)
+        client = TestClient(app)
+
+        response = client.get("/ctx")
+
+        assert response.json()["request_id"] == response.headers["x-request-id"]
+        assert request_id_var.get() == ""
+
+
+async def _first_body_chunk(app, path: str, headers: list) -> tuple:
+    """Drive a GET through an ASGI app and return its start message and first non-empty body."""
+    messages: asyncio.Queue = asyncio.Queue()
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        # Deliver the request once, then stay connected until cancelled
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, messages.put))
+
+    start = await asyncio.wait_for(messages.get(), timeout=2)
+    while True:
+        body = await asyncio.wait_for(messages.get(), timeout=2)
+        if body.get("body"):
+            return start, body, task
+
+
+@pytest.mark.unit
+class TestStreamingGZipMiddleware:
+    """Test cases for StreamingGZipMiddleware."""
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/report")
+        async def report():
+            return {"rows": ["x" * 100] * 50}
+
+        @app.get("/events")
+        async def events():
+            async def stream():
+                yield b"event: ping\ndata: 1\n\n"
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        app.add_middleware(StreamingGZipMiddleware, minimum_size=1024, stream_paths=("/events",))
+        return app
+
+    def test_compresses_regular_responses(self):
+        """Test ordinary large responses are still gzipped."""
+        client = TestClient(self._build_app())
+
+        response = client.get("/report", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+
+    @pytest.mark.parametrize("path,accept", [("/events", "*/*"), ("/report", "text/event-stream")])
+    def test_streams_pass_through(self, path, accept):
+        """Test stream paths and event-stream requests are not compressed."""
+        client = TestClient(self._build_app())
+
+        response = client.get(path, headers={"Accept-Encoding": "gzip", "Accept": accept})
+
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_overview_stream_flushes_each_event(self):
+        """Test the alerts overview stream sends its first event before the stream ends."""
+        from app.api.v1.auth import get_current_user
+        from app.main import app
+
+        release = asyncio.Event()
+
+        async def stream_overview():
+            yield "total_active", 3
+            await release.wait()
+            yield "recent_alerts", []
+
+        app.dependency_overrides[get_current_user] = lambda: Mock(id="user:1")
+        try:
+            with patch("app.api.v1.alerts.alert_service.stream_overview", stream_overview):
+                start, first, task = await _first_body_chunk(
+                    app,
+                    "/api/v1/alerts/overview/stream",
+                    [(b"accept-encoding", b"gzip"), (b"host", b"testserver")],
+                )
+                assert not task.done()
+                release.set()
+                await asyncio.wait_for(task, timeout=2)
+        finally:
+            app.dependency_overrides.pop(get_current_user, None)
+
+        headers = dict(start["headers"])
+        assert start["status"] == 200
+        assert b"content-encoding" not in headers
+        assert headers[b"content-type"].startswith(b"text/event-stream")
+        assert first["body"] == b"event: total_active\ndata: 3\n\n"
@@ -0,0 +1,239 @@
+"""
+Unit tests for patient models
+"""
+import warnings
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.patient import (
+    Address,
+    PatientCreate,
+    PatientInDB,
+    PatientListResponse,
+    PatientResponse,
+    PatientStatus,
+    PatientUpdate,
+    RiskLevel,
+)
+
+
+def _patient_data(**overrides):
+    data = {
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "date_of_birth": "1980-05-17",
+        "email": "jane.doe@example.com",
+        "phone": "(555) 123-4567",
+        "ssn": "123-45-6789",
+        "address": {"street": "1 Main St", "city": "Austin", "state": "TX", "zip": "78701"},
+        "insurance": {
+            "member_id": "M1",
+            "company": "Acme",
+            "plan_type": "PPO",
+            "group_number": "G1",
+            "effective_date": "2024-01-01",
+        },
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.mark.unit
+class TestPatientValidators:
+    """Test cases for patient field validators."""
+
+    def test_valid_patient(self):
+        """Test formatted phone and SSN values are accepted as given."""
+        patient = PatientCreate(**_patient_data())
+
+        assert patient.phone == "(555) 123-4567"
+        assert patient.ssn == "123-45-6789"
+
+    @pytest.mark.parametrize("phone", ["555-1234", "1 (555) 123-45678"])
+    def test_invalid_phone(self, phone):
+        """Test phone numbers must contain exactly 10 digits."""
+        with pytest.raises(ValidationError, match="Phone number must be 10 digits"):
+            PatientCreate(**_patient_data(phone=phone))
+
+    def test_invalid_ssn(self):
+        """Test SSNs must contain exactly 9 digits."""
+        with pytest.raises(ValidationError, match="SSN must be 9 digits"):
+            PatientCreate(**_patient_data(ssn="123-45-678"))
+
+    @pytest.mark.parametrize("zip_code", ["78701", "78701-1234"])
+    def test_valid_zip(self, zip_code):
+        """Test 5 digit and ZIP+4 codes are accepted."""
+        assert Address(street="1 Main St", city="Austin", state="TX", zip=zip_code).zip == zip_code
+
+    @pytest.mark.parametrize("zip_code", ["7870", "78701-12", "ABCDE"])
+    def test_invalid_zip(self, zip_code):
+        """Test malformed postal codes are rejected."""
+        with pytest.raises(ValidationError, match="Invalid postal code format"):
+            Address(street="1 Main St", city="Austin", state="TX", zip=zip_code)
+
+    def test_update_allows_missing_phone(self):
+        """Test partial updates skip validation of omitted fields."""
+        assert PatientUpdate(first_name="Janet").phone is None
+
+    @pytest.mark.parametrize("dob", ["1980-05-17", "1980-5-17", "2000-02-29"])
+    def test_valid_date_of_birth(self, dob):
+        """Test canonical and single-digit month dates are accepted."""
+        assert PatientCreate(**_patient_data(date_of_birth=dob)).date_of_birth == dob
+
+    @pytest.mark.parametrize("dob", ["17/05/1980", "+980-05-17", "1980-05-1x", ""])
+    def test_malformed_date_of_birth(self, dob):
+        """Test non YYYY-MM-DD values are rejected with the format message."""
+        with pytest.raises(ValidationError, match="YYYY-MM-DD format"):
+            PatientCreate(**_patient_data(date_of_birth=dob))
+
+    def test_impossible_date_of_birth(self):
+        """Test dates that do not exist are rejected."""
+        with pytest.raises(ValidationError, match="day is out of range"):
+            PatientCreate(**_patient_data(date_of_birth="2001-02-29"))
+
+    @pytest.mark.parametrize("dob", ["2020-13-01", "2020-00-10", "2020-01-32"])
+    def test_out_of_range_date_of_birth(self, dob):
+        """Test months and days outside their ranges get the format message."""
+        with pytest.raises(ValidationError, match="YYYY-MM-DD format"):
+            PatientCreate(**_patient_data(date_of_birth=dob))
+
+    def test_invalid_email(self):
+        """Test client input still goes through email validation."""
+        with pytest.raises(ValidationError, match="email"):
+            PatientCreate(**_patient_data(email="not-an-email"))
+
+    def test_in_db_skips_input_validation(self):
+        """Test DB rows are loaded without re-running the input validators."""
+        patient = PatientInDB(**_patient_data(
+            id="patients:abc",
+            email="legacy-address",
+            phone="555",
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:30:00Z",
+        ))
+
+        assert patient.email == "legacy-address"
+        assert patient.phone == "555"
+
+    def test_future_date_of_birth(self):
+        """Test future dates are rejected on create and update."""
+        with pytest.raises(ValidationError, match="cannot be in the future"):
+            PatientCreate(**_patient_data(date_of_birth="2999-01-01"))
+        with pytest.raises(ValidationError, match="cannot be in the future"):
+            PatientUpdate(date_of_birth="2999-01-01")
+
+
+@pytest.mark.unit
+class TestPatientResponseFromDB:
+    """Test cases for PatientResponse.from_db."""
+
+    def _row(self, **overrides):
+        row = _patient_data(
+            id="patients:abc",
+            status="active",
+            risk_level="High",
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:30:00Z",
+        )
+        row.update(overrides)
+        return row
+
+    def test_builds_response(self):
+        """Test stored rows map to typed fields with the SSN masked."""
+        patient = PatientResponse.from_db(self._row())
+
+        assert patient.id == "patients:abc"
+        assert patient.status is PatientStatus.ACTIVE
+        assert patient.risk_level is RiskLevel.HIGH
+        assert isinstance(patient.created_at, datetime)
+        assert patient.address.city == "Austin"
+        assert patient.insurance.member_id == "M1"
+        assert patient.ssn_last_four == "6789"
+
+    def test_serializes_without_warnings(self):
+        """Test constructed responses dump cleanly."""
+        patient = PatientResponse.from_db(self._row(ssn=None))
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            data = patient.model_dump(mode="json")
+
+        assert data["status"] == "active"
+        assert data["address"]["zip"] == "78701"
+        assert data["ssn_last_four"] is None
+
+    def test_enum_fields_format_as_values(self):
+        """Test enum members format as their stored values."""
+        patient = PatientResponse.from_db(self._row())
+
+        assert f"{patient.status}" == "active"
+        assert str(patient.risk_level) == "High"
+        assert patient.status == "active"
+
+    def test_response_is_frozen(self):
+        """Test responses cannot be mutated after construction."""
+        patient = PatientResponse.from_db(self._row())
+
+        with pytest.raises(ValidationError, match="frozen"):
+            patient.first_name = "John"
+
+    def test_response_rejects_unknown_fields(self):
+        """Test validated responses reject fields outside the schema."""
+        data = PatientResponse.from_db(self._row()).model_dump()
+
+        with pytest.raises(ValidationError, match="Extra inputs"):
+            PatientResponse(**data, ssn="123-45-6789")
+
+
+@pytest.mark.unit
+class TestLazyModelExports:
+    """Test cases for the lazy app.models re-exports."""
+
+    def test_exports_resolve_to_submodule_classes(self):
+        """Test names in __all__ resolve to the submodule objects."""
+        import app.models as models
+        from app.models import patient
+
+        assert models.PatientResponse is patient.PatientResponse
+        assert all(hasattr(models, name) for name in models.__all__)
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Test unknown names still raise AttributeError."""
+        import app.models as models
+
+        with pytest.raises(AttributeError):
+            models.NotAModel
+
+
+@pytest.mark.unit
+class TestPatientListResponseJSON:
+    """Test cases for PatientListResponse.to_json."""
+
+    def test_matches_model_dump(self):
+        """Test the JSON bytes match the regular JSON dump."""
+        import json
+
+        row = _patient_data(
+            id="patients:abc",
+            status="active",
+            risk_level="High",
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:30:00Z",
+        )
+        listing = PatientListResponse(
+            patients=[PatientResponse.from_db(row)],
+            total=1,
+            page=1,
+            limit=10,
+            total_pages=1,
+            has_next=False,
+            has_prev=False,
+        )
+
+        body = listing.to_json()
+
+        assert isinstance(body, bytes)
+        assert json.loads(body) == listing.model_dump(mode="json")
+        assert json.loads(body)["patients"][0]["created_at"] == "2024-01-15T10:00:00Z"
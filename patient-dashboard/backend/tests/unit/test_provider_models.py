@@ -0,0 +1,140 @@
+"""
+Unit tests for provider models
+"""
+import pytest
+from pydantic import ValidationError
+
+from app.models.provider import ProviderCreate, ProviderRole, ProviderStatus, ProviderUpdate
+
+
+def _provider_data(**overrides):
+    data = {
+        "first_name": "Alex",
+        "last_name": "Smith",
+        "email": "alex.smith@example.com",
+        "phone": "(555) 234-5678",
+        "role": "doctor",
+        "license_number": "LIC-1",
+        "hire_date": "2015-03-02",
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.mark.unit
+class TestProviderValidators:
+    """Test cases for provider field validators."""
+
+    def test_valid_provider(self):
+        """Test a well-formed provider validates."""
+        provider = ProviderCreate(**_provider_data())
+
+        assert provider.phone == "(555) 234-5678"
+
+    @pytest.mark.parametrize("phone", ["5552345678", "555-234-5678", "512.555.0101"])
+    def test_valid_phone(self, phone):
+        """Test clean and formatted 10-digit numbers are accepted."""
+        assert ProviderCreate(**_provider_data(phone=phone)).phone == phone
+
+    @pytest.mark.parametrize("phone", ["555234567", "55523456789", "phone"])
+    def test_invalid_phone(self, phone):
+        """Test numbers without exactly 10 digits are rejected."""
+        with pytest.raises(ValidationError, match="10 digits"):
+            ProviderCreate(**_provider_data(phone=phone))
+
+    @pytest.mark.parametrize("phone", ["1552345678", "(055) 234-5678", "555-134-5678", "555-034-5678"])
+    def test_invalid_nanp_phone(self, phone):
+        """Test area codes and exchanges starting with 0 or 1 are rejected."""
+        with pytest.raises(ValidationError, match="area code and exchange"):
+            ProviderCreate(**_provider_data(phone=phone))
+
+    def test_update_phone(self):
+        """Test updates validate the phone only when present."""
+        assert ProviderUpdate().phone is None
+        with pytest.raises(ValidationError, match="10 digits"):
+            ProviderUpdate(phone="123")
+
+    def test_shared_phone_type(self):
+        """Test the shared PhoneStr type validates outside the provider models."""
+        from pydantic import TypeAdapter
+        from app.models._validators import PhoneStr
+
+        adapter = TypeAdapter(PhoneStr)
+        assert adapter.validate_python("512.555.0101") == "512.555.0101"
+        with pytest.raises(ValidationError, match="area code and exchange"):
+            adapter.validate_python("0125550101")
+
+    def test_valid_hire_date_is_cached(self):
+        """Test repeated hire dates are parsed once."""
+        from app.models.provider import _parse_hire_date
+
+        _parse_hire_date.cache_clear()
+        ProviderCreate(**_provider_data())
+        ProviderCreate(**_provider_data())
+
+        assert _parse_hire_date.cache_info().hits >= 1
+
+    @pytest.mark.parametrize("hire_date", ["2015-03-02", "2015-3-2"])
+    def test_valid_hire_date(self, hire_date):
+        """Test canonical and strptime-compatible dates are accepted."""
+        assert ProviderCreate(**_provider_data(hire_date=hire_date)).hire_date == hire_date
+
+    @pytest.mark.parametrize("hire_date", ["03/02/2015", "2015-3-2x", "2015-03-0a", "yesterday"])
+    def test_malformed_hire_date(self, hire_date):
+        """Test non YYYY-MM-DD values are rejected with the format message."""
+        with pytest.raises(ValidationError, match="YYYY-MM-DD format"):
+            ProviderCreate(**_provider_data(hire_date=hire_date))
+
+    @pytest.mark.parametrize("hire_date", ["2015-02-29", "2015-13-01", "2015-00-10", "2015-01-32", "2015-2-30"])
+    def test_impossible_hire_date(self, hire_date):
+        """Test dates that do not exist are rejected with the format message."""
+        with pytest.raises(ValidationError, match="YYYY-MM-DD format"):
+            ProviderCreate(**_provider_data(hire_date=hire_date))
+
+    def test_future_hire_date(self):
+        """Test future dates are rejected on create and update."""
+        with pytest.raises(ValidationError, match="cannot be in the future"):
+            ProviderCreate(**_provider_data(hire_date="2999-01-01"))
+        with pytest.raises(ValidationError, match="cannot be in the future"):
+            ProviderUpdate(hire_date="2999-01-01")
+
+
+@pytest.mark.unit
+class TestProviderResponseFromDB:
+    """Test cases for ProviderResponse.from_db."""
+
+    def test_parses_timestamps(self):
+        """Test Z-suffixed and offset timestamps parse to the same instant."""
+        from app.models.provider import ProviderResponse
+
+        row = _provider_data(
+            id="providers:1",
+            status="active",
+            assigned_patients=[],
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:00:00+00:00",
+        )
+
+        provider = ProviderResponse.from_db(row)
+
+        assert provider.id == "providers:1"
+        assert provider.created_at == provider.updated_at
+        assert provider.created_at.tzinfo is not None
+
+    def test_coerces_enums_without_validation(self):
+        """Test trusted rows skip validation but still get enum members."""
+        from app.models.provider import ProviderResponse
+
+        row = _provider_data(
+            id="providers:1",
+            status="on_leave",
+            created_at="2024-01-15T10:00:00Z",
+            updated_at="2024-01-15T10:00:00Z",
+        )
+
+        provider = ProviderResponse.from_db(row)
+
+        assert provider.role is ProviderRole.DOCTOR
+        assert provider.status is ProviderStatus.ON_LEAVE
+        assert provider.assigned_patients == []
+        assert provider.model_dump(mode="json")["created_at"].startswith("2024-01-15T10:00:00")
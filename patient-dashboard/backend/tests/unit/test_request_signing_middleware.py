@@ -0,0 +1,168 @@
+"""
+Unit tests for request signing middleware
+"""
+import json
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware.request_signing_middleware import (
+    RequestSigningMiddleware,
+    generate_request_signature,
+)
+
+SIGNING_KEY = "test-signing-key"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Create a client for an app with a protected endpoint."""
+    monkeypatch.setenv("PFINNI_REQUEST_SIGNING_KEY", SIGNING_KEY)
+    app = FastAPI()
+
+    @app.post("/api/patients")
+    async def create_patient():
+        return {"ok": True}
+
+    @app.get("/api/patients")
+    async def list_patients():
+        return []
+
+    app.add_middleware(RequestSigningMiddleware)
+    return TestClient(app)
+
+
+def _signed_post(client, body, headers=None, algorithm="hmac-sha256"):
+    signature_headers = generate_request_signature("POST", "/api/patients", body, SIGNING_KEY, algorithm)
+    signature_headers.update(headers or {})
+    return client.post(
+        "/api/patients",
+        content=json.dumps(body),
+        headers={"content-type": "application/json", **signature_headers},
+    )
+
+
+@pytest.mark.unit
+class TestRequestSigningMiddleware:
+    """Test cases for RequestSigningMiddleware."""
+
+    def test_valid_signature(self, client):
+        """Test a correctly signed request is accepted."""
+        response = _signed_post(client, {"first_name": "Zoë"})
+
+        assert response.status_code == 200
+
+    def test_blake2b_signature(self, client):
+        """Test keyed BLAKE2b signatures are accepted when announced."""
+        response = _signed_post(client, {"a": 1}, algorithm="blake2b")
+
+        assert response.status_code == 200
+
+    def test_missing_alg_header_defaults_to_hmac(self, client):
+        """Test clients that do not send X-Signature-Alg are treated as HMAC-SHA256."""
+        signature_headers = generate_request_signature("POST", "/api/patients", {"a": 1}, SIGNING_KEY)
+        del signature_headers["X-Signature-Alg"]
+
+        response = client.post(
+            "/api/patients",
+            content=json.dumps({"a": 1}),
+            headers={"content-type": "application/json", **signature_headers},
+        )
+
+        assert response.status_code == 200
+
+    def test_unknown_algorithm(self, client):
+        """Test unsupported algorithms are rejected."""
+        response = _signed_post(client, {"a": 1}, {"X-Signature-Alg": "md5"})
+
+        assert response.status_code == 401
+
+    def test_algorithm_mismatch(self, client):
+        """Test a signature is only valid for the algorithm it was made with."""
+        response = _signed_post(client, {"a": 1}, {"X-Signature-Alg": "blake2b"})
+
+        assert response.status_code == 401
+
+    def test_tampered_signature(self, client):
+        """Test a signature for a different body is rejected."""
+        signature_headers = generate_request_signature("POST", "/api/patients", {"a": 1}, SIGNING_KEY)
+
+        response = client.post(
+            "/api/patients",
+            content=json.dumps({"a": 2}),
+            headers={"content-type": "application/json", **signature_headers},
+        )
+
+        assert response.status_code == 401
+
+    def test_non_hex_signature(self, client):
+        """Test a malformed signature is rejected rather than raising."""
+        response = _signed_post(client, {"a": 1}, {"X-Request-Signature": "not-hex"})
+
+        assert response.status_code == 401
+
+    def test_non_hex_signature_of_valid_length(self, client):
+        """Test a correctly sized but non-hex signature is rejected."""
+        response = _signed_post(client, {"a": 1}, {"X-Request-Signature": "z" * 64})
+
+        assert response.status_code == 401
+
+    def test_malformed_nonce(self, client):
+        """Test a nonce of the wrong length is rejected."""
+        response = _signed_post(client, {"a": 1}, {"X-Request-Nonce": "abc"})
+
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize("offset", [-301, 301])
+    def test_timestamp_outside_window(self, client, offset):
+        """Test timestamps too far in the past or future are rejected."""
+        body = {"a": 1}
+        signature_headers = generate_request_signature("POST", "/api/patients", body, SIGNING_KEY)
+        signature_headers["X-Request-Timestamp"] = str(int(time.time()) + offset)
+
+        response = client.post(
+            "/api/patients",
+            content=json.dumps(body),
+            headers={"content-type": "application/json", **signature_headers},
+        )
+
+        assert response.status_code == 401
+
+    def test_missing_headers(self, client):
+        """Test unsigned writes to protected endpoints are rejected."""
+        response = client.post("/api/patients", json={"a": 1})
+
+        assert response.status_code == 401
+
+    def test_reads_are_not_signed(self, client):
+        """Test safe methods skip signature validation."""
+        assert client.get("/api/patients").status_code == 200
+
+
+@pytest.mark.unit
+class TestRequiresSigning:
+    """Test cases for protected endpoint matching."""
+
+    @pytest.fixture
+    def middleware(self):
+        """Create middleware around an empty app."""
+        return RequestSigningMiddleware(FastAPI())
+
+    @pytest.mark.parametrize(
+        "method,path,expected",
+        [
+            ("POST", "/api/patients", True),
+            ("DELETE", "/api/patients/123", True),
+            ("PUT", "/api/audit/logs", True),
+            ("GET", "/api/patients", False),
+            ("POST", "/api/patients-export", False),
+            ("POST", "/api/v1/patients", False),
+        ],
+    )
+    def test_requires_signing(self, middleware, method, path, expected):
+        """Test only writes to protected endpoints and their children need signing."""
+        request = Request({"type": "http", "method": method, "path": path, "headers": []})
+
+        assert middleware._requires_signing(request) is expected
@@ -0,0 +1,52 @@
+"""
+Unit tests for user models
+"""
+import pytest
+from pydantic import ValidationError
+
+from app.models.user import UserCreate, UserPasswordChange, UserPasswordResetConfirm
+
+
+def _user_data(**overrides):
+    data = {
+        "email": "alex@example.com",
+        "first_name": "Alex",
+        "last_name": "Smith",
+        "role": "PROVIDER",
+        "password": "Str0ng!Pass",
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.mark.unit
+class TestPasswordStrength:
+    """Test cases for password strength validation."""
+
+    def test_strong_password(self):
+        """Test a password with every character class is accepted."""
+        assert UserCreate(**_user_data()).password == "Str0ng!Pass"
+
+    @pytest.mark.parametrize("password,message", [
+        ("Sh0rt!", "at least 8 characters"),
+        ("lower0!case", "uppercase letter"),
+        ("UPPER0!CASE", "lowercase letter"),
+        ("NoDigits!here", "digit"),
+        ("NoSpecial0here", "special character"),
+        ("alllowercase", "uppercase letter"),
+    ])
+    def test_weak_password(self, password, message):
+        """Test the first missing requirement is reported."""
+        with pytest.raises(ValidationError, match=message):
+            UserCreate(**_user_data(password=password))
+
+    def test_password_change_uses_same_rules(self):
+        """Test new passwords on change are held to the same rules."""
+        with pytest.raises(ValidationError, match="special character"):
+            UserPasswordChange(current_password="anything", new_password="NoSpecial0here")
+
+    def test_password_reset_uses_same_rules(self):
+        """Test new passwords on reset are held to the same rules."""
+        assert UserPasswordResetConfirm(token="t", new_password="Str0ng!Pass").new_password == "Str0ng!Pass"
+        with pytest.raises(ValidationError, match="digit"):
+            UserPasswordResetConfirm(token="t", new_password="NoDigits!here")